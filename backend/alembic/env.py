@@ -47,6 +47,19 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """
+    Skip models mapped onto views (info={"is_view": True}) and the monthly
+    metric_snapshots partitions; their DDL lives in migrations and services.
+    """
+    if type_ != "table":
+        return True
+    if reflected and compare_to is None and name.startswith("metric_snapshots_"):
+        return False
+    return not obj.info.get("is_view")
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -69,6 +82,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -92,7 +106,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
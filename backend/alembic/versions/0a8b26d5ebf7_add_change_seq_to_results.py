@@ -0,0 +1,43 @@
+"""add change_seq to results for delta listing
+
+Revision ID: 0a8b26d5ebf7
+Revises: f7ab15c4dae6
+Create Date: 2026-10-19 00:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a8b26d5ebf7'
+down_revision: Union[str, None] = 'f7ab15c4dae6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE IF NOT EXISTS results_change_seq")
+    op.add_column('results', sa.Column('change_seq', sa.BigInteger(), nullable=True))
+    # Existing rows get sequence values in id order so the first delta sync replays them in order.
+    op.execute(
+        "UPDATE results SET change_seq = s.seq "
+        "FROM (SELECT id, nextval('results_change_seq') AS seq FROM (SELECT id FROM results ORDER BY id) o) s "
+        "WHERE results.id = s.id"
+    )
+    op.alter_column(
+        'results',
+        'change_seq',
+        nullable=False,
+        server_default=sa.text("nextval('results_change_seq')"),
+    )
+    op.execute("ALTER SEQUENCE results_change_seq OWNED BY results.change_seq")
+    op.create_index('ix_results_job_id_change_seq', 'results', ['job_id', 'change_seq'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_results_job_id_change_seq', table_name='results')
+    op.drop_column('results', 'change_seq')
+    op.execute("DROP SEQUENCE IF EXISTS results_change_seq")
@@ -0,0 +1,48 @@
+"""add result filter and sort indexes
+
+Revision ID: 1b9c37e6f0a8
+Revises: 0a8b26d5ebf7
+Create Date: 2026-10-19 01:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b9c37e6f0a8'
+down_revision: Union[str, None] = '0a8b26d5ebf7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_results_job_failed_id', 'results', ['job_id', 'id'],
+        postgresql_where=sa.text("status = 'failed'"),
+    )
+    op.create_index('ix_results_job_platform_id', 'results', ['job_id', 'platform', 'id'])
+    op.create_index('ix_results_job_channel_id', 'results', ['job_id', 'channel', 'id'])
+    op.create_index(
+        'ix_results_job_views_desc', 'results',
+        ['job_id', sa.text('views DESC NULLS LAST'), sa.text('id DESC')],
+    )
+    op.create_index(
+        'ix_results_job_likes_desc', 'results',
+        ['job_id', sa.text('likes DESC NULLS LAST'), sa.text('id DESC')],
+    )
+    op.create_index(
+        'ix_results_job_published_at_desc', 'results',
+        ['job_id', sa.text('published_at DESC NULLS LAST'), sa.text('id DESC')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_results_job_published_at_desc', table_name='results')
+    op.drop_index('ix_results_job_likes_desc', table_name='results')
+    op.drop_index('ix_results_job_views_desc', table_name='results')
+    op.drop_index('ix_results_job_channel_id', table_name='results')
+    op.drop_index('ix_results_job_platform_id', table_name='results')
+    op.drop_index('ix_results_job_failed_id', table_name='results')
@@ -0,0 +1,49 @@
+"""add result search vector and trigram indexes
+
+Revision ID: 2c0d48f7a1b9
+Revises: 1b9c37e6f0a8
+Create Date: 2026-10-19 01:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c0d48f7a1b9'
+down_revision: Union[str, None] = '1b9c37e6f0a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Stored generated column: rewrites the table once, then stays in step with title/channel.
+    op.add_column(
+        'results',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(channel, ''))", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index('ix_results_search_vector', 'results', ['search_vector'], postgresql_using='gin')
+    op.create_index(
+        'ix_results_title_trgm', 'results', ['title'],
+        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_results_channel_trgm', 'results', ['channel'],
+        postgresql_using='gin', postgresql_ops={'channel': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_results_channel_trgm', table_name='results')
+    op.drop_index('ix_results_title_trgm', table_name='results')
+    op.drop_index('ix_results_search_vector', table_name='results')
+    op.drop_column('results', 'search_vector')
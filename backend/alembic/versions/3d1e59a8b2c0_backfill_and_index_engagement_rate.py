@@ -0,0 +1,53 @@
+"""backfill and index results.engagement_rate
+
+Revision ID: 3d1e59a8b2c0
+Revises: 2c0d48f7a1b9
+Create Date: 2026-10-19 15:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d1e59a8b2c0'
+down_revision: Union[str, None] = '2c0d48f7a1b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One set-based UPDATE for every historical row. Changed rows get a new
+    # change_seq (so ?since= clients pick them up) and their jobs a new
+    # updated_at (so ETags and pre-rendered exports are invalidated).
+    op.execute(
+        """
+        WITH filled AS (
+            UPDATE results
+            SET engagement_rate = (coalesce(likes, 0) + coalesce(comments, 0))::double precision / views,
+                change_seq = nextval('results_change_seq')
+            WHERE status = 'success'
+              AND views > 0
+              AND engagement_rate IS DISTINCT FROM (coalesce(likes, 0) + coalesce(comments, 0))::double precision / views
+            RETURNING job_id
+        )
+        UPDATE jobs SET updated_at = now()
+        WHERE id IN (SELECT DISTINCT job_id FROM filled)
+        """
+    )
+    op.create_index(
+        'ix_results_job_engagement_rate_desc', 'results',
+        ['job_id', sa.text('engagement_rate DESC NULLS LAST'), sa.text('id DESC')],
+    )
+    op.create_index(
+        'ix_results_engagement_rate_desc', 'results',
+        [sa.text('engagement_rate DESC'), sa.text('id DESC')],
+        postgresql_where=sa.text('engagement_rate IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_results_engagement_rate_desc', table_name='results')
+    op.drop_index('ix_results_job_engagement_rate_desc', table_name='results')
@@ -0,0 +1,57 @@
+"""create channel_stats materialised view
+
+Revision ID: 4e2f6a0b9c1d
+Revises: 3d1e59a8b2c0
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e2f6a0b9c1d'
+down_revision: Union[str, None] = '3d1e59a8b2c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One row per (platform, channel) over the latest successful fetch of each
+    # video, so a video tracked by several jobs is counted once.
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW channel_stats AS
+        WITH latest AS (
+            SELECT DISTINCT ON (platform, url)
+                   platform, channel, views, likes, comments, engagement_rate, published_at
+            FROM results
+            WHERE status = 'success' AND channel IS NOT NULL
+            ORDER BY platform, url, id DESC
+        )
+        SELECT platform,
+               channel,
+               count(*) AS video_count,
+               coalesce(sum(views), 0)::bigint AS total_views,
+               coalesce(sum(likes), 0)::bigint AS total_likes,
+               coalesce(sum(comments), 0)::bigint AS total_comments,
+               coalesce(percentile_cont(0.5) WITHIN GROUP (ORDER BY views), 0) AS median_views,
+               coalesce(avg(engagement_rate), 0) AS mean_engagement_rate,
+               max(published_at) AS latest_published_at
+        FROM latest
+        GROUP BY platform, channel
+        WITH DATA
+        """
+    )
+    op.create_index('ux_channel_stats_platform_channel', 'channel_stats', ['platform', 'channel'], unique=True)
+    for column in ('total_views', 'video_count', 'median_views', 'mean_engagement_rate'):
+        op.create_index(
+            f'ix_channel_stats_{column}', 'channel_stats',
+            [sa.text(f'{column} DESC'), sa.text('platform DESC'), sa.text('channel DESC')],
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS channel_stats")
@@ -0,0 +1,77 @@
+"""create metric_snapshots (partitioned) and metric_rollups
+
+Revision ID: 5f3a7b1c2d4e
+Revises: 4e2f6a0b9c1d
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f3a7b1c2d4e'
+down_revision: Union[str, None] = '4e2f6a0b9c1d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _month_start(year: int, month: int) -> datetime:
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'metric_snapshots',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('captured_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('video_id', sa.Text(), nullable=False),
+        sa.Column('views', sa.BigInteger(), nullable=True),
+        sa.Column('likes', sa.BigInteger(), nullable=True),
+        sa.Column('comments', sa.BigInteger(), nullable=True),
+        sa.Column('engagement_rate', sa.Float(), nullable=True),
+        sa.Column('job_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.PrimaryKeyConstraint('id', 'captured_at'),
+        postgresql_partition_by='RANGE (captured_at)',
+    )
+    op.create_index('ix_metric_snapshots_video_captured', 'metric_snapshots', ['video_id', 'captured_at'])
+    # Catches rows outside the monthly partitions; services.jobs.snapshots keeps
+    # creating months ahead so this normally stays empty.
+    op.execute("CREATE TABLE metric_snapshots_default PARTITION OF metric_snapshots DEFAULT")
+    now = datetime.now(timezone.utc)
+    for i in range(3): # this month and the next two
+        start, end = _month_start(now.year, now.month + i), _month_start(now.year, now.month + i + 1)
+        op.execute(
+            f"CREATE TABLE metric_snapshots_p{start:%Y%m} PARTITION OF metric_snapshots "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+
+    op.create_table(
+        'metric_rollups',
+        sa.Column('video_id', sa.Text(), nullable=False),
+        sa.Column('resolution', sa.String(length=8), nullable=False),
+        sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('views', sa.BigInteger(), nullable=True),
+        sa.Column('likes', sa.BigInteger(), nullable=True),
+        sa.Column('comments', sa.BigInteger(), nullable=True),
+        sa.Column('engagement_rate', sa.Float(), nullable=True),
+        sa.Column('samples', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('video_id', 'resolution', 'bucket'),
+    )
+    op.create_table(
+        'metric_rollup_state',
+        sa.Column('resolution', sa.String(length=8), nullable=False),
+        sa.Column('rolled_up_to', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('resolution'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('metric_rollup_state')
+    op.drop_table('metric_rollups')
+    op.drop_table('metric_snapshots') # drops its partitions too
@@ -0,0 +1,54 @@
+"""create tracked_sets and tracked_links
+
+Revision ID: 6a4b8c2d3e5f
+Revises: 5f3a7b1c2d4e
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a4b8c2d3e5f'
+down_revision: Union[str, None] = '5f3a7b1c2d4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'tracked_sets',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.Text(), nullable=False),
+        sa.Column('refresh_interval_seconds', sa.Integer(), nullable=False),
+        sa.Column('link_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'tracked_links',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('set_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('platform', sa.Text(), nullable=False),
+        sa.Column('url', sa.Text(), nullable=False),
+        sa.Column('video_id', sa.Text(), nullable=False),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_fetched_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('next_due_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['set_id'], ['tracked_sets.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ux_tracked_links_set_video', 'tracked_links', ['set_id', 'video_id'], unique=True)
+    op.create_index('ix_tracked_links_next_due_at', 'tracked_links', ['next_due_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tracked_links_next_due_at', table_name='tracked_links')
+    op.drop_index('ux_tracked_links_set_video', table_name='tracked_links')
+    op.drop_table('tracked_links')
+    op.drop_table('tracked_sets')
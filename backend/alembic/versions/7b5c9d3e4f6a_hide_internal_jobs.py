@@ -0,0 +1,85 @@
+"""jobs.internal for single-fetch jobs; results.fetched_at
+
+Revision ID: 7b5c9d3e4f6a
+Revises: 6a4b8c2d3e5f
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b5c9d3e4f6a'
+down_revision: Union[str, None] = '6a4b8c2d3e5f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_channel_stats(internal_filter: bool) -> None:
+    # As in 4e2f6a0b9c1d, optionally without rows of internal jobs.
+    join = "JOIN jobs j ON j.id = r.job_id AND NOT j.internal" if internal_filter else ""
+    op.execute(
+        f"""
+        CREATE MATERIALIZED VIEW channel_stats AS
+        WITH latest AS (
+            SELECT DISTINCT ON (r.platform, r.url)
+                   r.platform, r.channel, r.views, r.likes, r.comments, r.engagement_rate, r.published_at
+            FROM results r
+            {join}
+            WHERE r.status = 'success' AND r.channel IS NOT NULL
+            ORDER BY r.platform, r.url, r.id DESC
+        )
+        SELECT platform,
+               channel,
+               count(*) AS video_count,
+               coalesce(sum(views), 0)::bigint AS total_views,
+               coalesce(sum(likes), 0)::bigint AS total_likes,
+               coalesce(sum(comments), 0)::bigint AS total_comments,
+               coalesce(percentile_cont(0.5) WITHIN GROUP (ORDER BY views), 0) AS median_views,
+               coalesce(avg(engagement_rate), 0) AS mean_engagement_rate,
+               max(published_at) AS latest_published_at
+        FROM latest
+        GROUP BY platform, channel
+        WITH DATA
+        """
+    )
+    op.create_index('ux_channel_stats_platform_channel', 'channel_stats', ['platform', 'channel'], unique=True)
+    for column in ('total_views', 'video_count', 'median_views', 'mean_engagement_rate'):
+        op.create_index(
+            f'ix_channel_stats_{column}', 'channel_stats',
+            [sa.text(f'{column} DESC'), sa.text('platform DESC'), sa.text('channel DESC')],
+        )
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('internal', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+    op.execute("UPDATE jobs SET internal = true WHERE source_filename = 'single-fetch'")
+    op.create_index('ix_jobs_listed_created_at_id', 'jobs', ['created_at', 'id'],
+                    postgresql_where=sa.text('NOT internal'))
+
+    op.add_column('results', sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=True))
+    # Best available fetch time for existing rows: when their job last changed.
+    op.execute(
+        """
+        UPDATE results r SET fetched_at = j.updated_at
+        FROM jobs j
+        WHERE j.id = r.job_id AND r.status <> 'queued'
+        """
+    )
+    op.create_index('ix_results_url_fetched_at', 'results', ['url', sa.text('fetched_at DESC')],
+                    postgresql_where=sa.text("status = 'success'"))
+
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS channel_stats")
+    _create_channel_stats(internal_filter=True)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS channel_stats")
+    _create_channel_stats(internal_filter=False)
+    op.drop_index('ix_results_url_fetched_at', table_name='results')
+    op.drop_column('results', 'fetched_at')
+    op.drop_index('ix_jobs_listed_created_at_id', table_name='jobs')
+    op.drop_column('jobs', 'internal')
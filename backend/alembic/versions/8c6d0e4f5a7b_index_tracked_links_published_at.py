@@ -0,0 +1,25 @@
+"""index tracked_links.published_at for the scheduler's refresh rate
+
+Revision ID: 8c6d0e4f5a7b
+Revises: 7b5c9d3e4f6a
+Create Date: 2026-10-21 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c6d0e4f5a7b'
+down_revision: Union[str, None] = '7b5c9d3e4f6a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tracked_links_published_at', 'tracked_links', ['published_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tracked_links_published_at', table_name='tracked_links')
@@ -0,0 +1,26 @@
+"""drop ix_results_url (superseded by ix_results_url_fetched_at)
+
+Revision ID: 9d7e1f5a6b8c
+Revises: 8c6d0e4f5a7b
+Create Date: 2026-10-21 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d7e1f5a6b8c'
+down_revision: Union[str, None] = '8c6d0e4f5a7b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The GET /fetch lookup (its only user) now reads ix_results_url_fetched_at.
+    op.drop_index('ix_results_url', table_name='results')
+
+
+def downgrade() -> None:
+    op.create_index('ix_results_url', 'results', ['url'])
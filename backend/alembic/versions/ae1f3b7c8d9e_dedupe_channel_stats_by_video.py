@@ -0,0 +1,96 @@
+"""results.video_id; channel_stats counts each video once across URL shapes
+
+Revision ID: ae1f3b7c8d9e
+Revises: 9d7e1f5a6b8c
+Create Date: 2026-10-21 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.fetchers import canonical_video_id
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ae1f3b7c8d9e'
+down_revision: Union[str, None] = '9d7e1f5a6b8c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def _create_channel_stats(distinct_on: str) -> None:
+    # As in 7b5c9d3e4f6a, with the per-video key as a parameter.
+    op.execute(
+        f"""
+        CREATE MATERIALIZED VIEW channel_stats AS
+        WITH latest AS (
+            SELECT DISTINCT ON ({distinct_on})
+                   r.platform, r.channel, r.views, r.likes, r.comments, r.engagement_rate, r.published_at
+            FROM results r
+            JOIN jobs j ON j.id = r.job_id AND NOT j.internal
+            WHERE r.status = 'success' AND r.channel IS NOT NULL
+            ORDER BY {distinct_on}, r.id DESC
+        )
+        SELECT platform,
+               channel,
+               count(*) AS video_count,
+               coalesce(sum(views), 0)::bigint AS total_views,
+               coalesce(sum(likes), 0)::bigint AS total_likes,
+               coalesce(sum(comments), 0)::bigint AS total_comments,
+               coalesce(percentile_cont(0.5) WITHIN GROUP (ORDER BY views), 0) AS median_views,
+               coalesce(avg(engagement_rate), 0) AS mean_engagement_rate,
+               max(published_at) AS latest_published_at
+        FROM latest
+        GROUP BY platform, channel
+        WITH DATA
+        """
+    )
+    op.create_index('ux_channel_stats_platform_channel', 'channel_stats', ['platform', 'channel'], unique=True)
+    for column in ('total_views', 'video_count', 'median_views', 'mean_engagement_rate'):
+        op.create_index(
+            f'ix_channel_stats_{column}', 'channel_stats',
+            [sa.text(f'{column} DESC'), sa.text('platform DESC'), sa.text('channel DESC')],
+        )
+
+
+def _backfill_video_ids() -> None:
+    # canonical_video_id is Python (URL parsing per platform), so backfill in id-ordered batches.
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text("SELECT id, platform, url FROM results WHERE id > :last_id ORDER BY id LIMIT :n"),
+            {"last_id": last_id, "n": BACKFILL_BATCH_SIZE},
+        ).all()
+        if not rows:
+            return
+        bind.execute(
+            sa.text(
+                """
+                UPDATE results r SET video_id = m.video_id
+                FROM unnest(CAST(:ids AS bigint[]), CAST(:video_ids AS text[])) AS m(id, video_id)
+                WHERE r.id = m.id
+                """
+            ),
+            {"ids": [r.id for r in rows], "video_ids": [canonical_video_id(r.platform, r.url) for r in rows]},
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    op.add_column('results', sa.Column('video_id', sa.Text(), nullable=True))
+    _backfill_video_ids()
+    op.alter_column('results', 'video_id', nullable=False)
+
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS channel_stats")
+    _create_channel_stats("r.video_id")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS channel_stats")
+    _create_channel_stats("r.platform, r.url")
+    op.drop_column('results', 'video_id')
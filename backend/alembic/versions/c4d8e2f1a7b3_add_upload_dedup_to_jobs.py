@@ -0,0 +1,35 @@
+"""add upload de-duplication columns to jobs
+
+Revision ID: c4d8e2f1a7b3
+Revises: b3e7f1a2c9d0
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e2f1a7b3'
+down_revision: Union[str, None] = 'b3e7f1a2c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('jobs', sa.Column('idempotency_key', sa.Text(), nullable=True))
+    op.add_column('jobs', sa.Column('upload_summary', postgresql.JSONB(), nullable=True))
+    op.create_index('ix_jobs_content_hash', 'jobs', ['content_hash'])
+    op.create_unique_constraint('jobs_idempotency_key_key', 'jobs', ['idempotency_key'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('jobs_idempotency_key_key', 'jobs', type_='unique')
+    op.drop_index('ix_jobs_content_hash', table_name='jobs')
+    op.drop_column('jobs', 'upload_summary')
+    op.drop_column('jobs', 'idempotency_key')
+    op.drop_column('jobs', 'content_hash')
@@ -0,0 +1,27 @@
+"""add index on results.url
+
+Revision ID: d5e9f3a2b8c4
+Revises: c4d8e2f1a7b3
+Create Date: 2026-10-19 00:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e9f3a2b8c4'
+down_revision: Union[str, None] = 'c4d8e2f1a7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Backs the GET /fetch lookup of a recent stored result for a URL.
+    op.create_index('ix_results_url', 'results', ['url'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_results_url', table_name='results')
@@ -0,0 +1,28 @@
+"""add keyset pagination indexes for jobs and results
+
+Revision ID: e6fa04b3c9d5
+Revises: d5e9f3a2b8c4
+Create Date: 2026-10-19 00:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6fa04b3c9d5'
+down_revision: Union[str, None] = 'd5e9f3a2b8c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_jobs_created_at_id', 'jobs', ['created_at', 'id'])
+    op.create_index('ix_results_job_id_id', 'results', ['job_id', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_results_job_id_id', table_name='results')
+    op.drop_index('ix_jobs_created_at_id', table_name='jobs')
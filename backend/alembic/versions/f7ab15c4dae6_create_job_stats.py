@@ -0,0 +1,40 @@
+"""create job_stats rollup table
+
+Revision ID: f7ab15c4dae6
+Revises: e6fa04b3c9d5
+Create Date: 2026-10-19 00:30:00.000000
+
+Backfill existing jobs with `python -m app.commands.rebuild_job_stats`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7ab15c4dae6'
+down_revision: Union[str, None] = 'e6fa04b3c9d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_stats',
+        sa.Column('job_id', sa.UUID(), nullable=False),
+        sa.Column('success_rows', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('failed_rows', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('total_views', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('total_likes', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('total_comments', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('engagement_sum', sa.Float(), server_default='0', nullable=False),
+        sa.Column('engagement_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('job_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('job_stats')
@@ -0,0 +1,34 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.security import get_current_user_id
+from app.db.session import get_db
+from app.services.jobs.channels import list_channels
+from app.services.jobs.filters import InvalidSort
+from app.services.jobs.queries import InvalidCursor
+from app.services.upload.validators import normalise_platform
+
+router = APIRouter()
+
+
+@router.get("")
+def get_channels(
+    sort: Literal["total_views", "video_count", "median_views", "mean_engagement_rate"] = "total_views",
+    platform: Optional[str] = None,
+    min_videos: int = 1,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    _user_id: int = Depends(get_current_user_id),
+):
+    """Channel leaderboard across all jobs (one row per platform + channel), highest first."""
+    limit = max(1, min(limit, 200))
+    try:
+        return list_channels(
+            db, sort=sort, platform=normalise_platform(platform), min_videos=max(1, min_videos),
+            limit=limit, cursor=cursor,
+        )
+    except (InvalidCursor, InvalidSort) as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.security import get_current_user_id
+from app.db.session import get_db
+from app.services.jobs.bulk_export import export_jobs, select_export_jobs
+from app.services.jobs.filters import ResultFilters
+from app.services.upload.validators import normalise_platform
+
+router = APIRouter()
+
+
+# ---------------------------------------------------------------------------
+# Schemas
+# ---------------------------------------------------------------------------
+
+class ExportFilters(BaseModel):
+    """Row filters, as on GET /jobs/{job_id}/results."""
+    status: Optional[Literal["queued", "success", "failed"]] = None
+    platform: Optional[str] = None
+    channel: Optional[str] = None
+    min_views: Optional[int] = None
+    max_views: Optional[int] = None
+    min_engagement: Optional[float] = None
+    max_engagement: Optional[float] = None
+    published_after: Optional[datetime] = None
+    published_before: Optional[datetime] = None
+
+
+class ExportRequest(BaseModel):
+    job_ids: Optional[List[UUID]] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    filters: Optional[ExportFilters] = None
+    format: Literal["csv", "ndjson", "xlsx", "parquet"] = "csv"
+    archive: Literal["zip", "merged"] = "zip"
+    fields: Optional[str] = None
+
+
+# ---------------------------------------------------------------------------
+# Endpoints
+# ---------------------------------------------------------------------------
+
+@router.post("", response_class=StreamingResponse)
+def create_export(
+    body: ExportRequest,
+    db: Session = Depends(get_db),
+    _user_id: int = Depends(get_current_user_id),
+):
+    """
+    Export results of several completed jobs (by id, or every completed job
+    created in a time range) as a ZIP with one file per job or a single merged file.
+    """
+    try:
+        job_ids = select_export_jobs(
+            db, job_ids=body.job_ids, created_after=body.created_after, created_before=body.created_before,
+        )
+        row_filters = body.filters.model_dump() if body.filters else {}
+        if row_filters:
+            row_filters["platform"] = normalise_platform(row_filters["platform"])
+        filters = ResultFilters(**row_filters)
+        return export_jobs(job_ids, body.format, archive=body.archive, fields=body.fields, where=filters.clauses())
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
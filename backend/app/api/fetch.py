@@ -0,0 +1,33 @@
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.services.jobs.single import fetch_single_url, persist_fetch_result
+
+router = APIRouter()
+
+
+@router.api_route("", methods=["GET", "POST"])
+def fetch(
+    url: str,
+    background_tasks: BackgroundTasks,
+    platform: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Fetch metrics for a single URL synchronously.
+    Served from cache or a fresh stored result when possible; otherwise the
+    platform fetcher is called inline and the result is persisted afterwards.
+    """
+    try:
+        payload = fetch_single_url(db, url, platform=platform)
+    except HTTPException: # re-raise HTTP exceptions to be handled by FastAPI's exception handlers
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if payload["source"] == "live":
+        background_tasks.add_task(persist_fetch_result, {k: v for k, v in payload.items() if k != "source"})
+    return payload
@@ -1,22 +1,62 @@
 import os
+from datetime import datetime
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, Header, HTTPException, Depends, BackgroundTasks, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
 
+from app.core.fast_json import FastJSONResponse
+from app.core.http_cache import cache_control_for_status, etag_matches, make_etag
 from app.core.security import get_current_user_id
-from app.db.session import get_db
-from app.services.jobs.service import creat_job_from_upload, mark_job_running, run_job_in_background
-from app.services.jobs.queries import list_job_results, list_jobs, get_job_detail
+from app.db.session import SessionLocal, get_db
+from app.services.jobs.service import creat_job_from_upload, create_jobs_from_batch, mark_job_running, run_job_in_background
+from app.services.jobs.queries import RESULT_COLUMNS, InvalidCursor, InvalidFields, parse_fields, list_job_results, list_jobs, get_job_detail, get_job_summary, get_job_version
+from app.services.jobs.analytics import get_job_analytics
 from app.services.jobs.export import export_job_results_csv
+from app.services.jobs.export_cache import cached_export_response
+from app.services.jobs.export_formats import export_job_results
+from app.services.jobs.filters import InvalidSort, ResultFilters, ResultSort
+from app.services.jobs.events import stream_job_events
+from app.services.jobs.ingest import LinkJobWriter
+from app.services.jobs.snapshots import InvalidSeriesRange, get_job_series
+from app.services.upload.utils import looks_like_ndjson
+from app.services.upload.validators import normalise_platform
 
 router = APIRouter()
 
+
+def _not_modified(request: Request, response: Response, db: Session, job_id: UUID, *variant: object) -> Optional[Response]:
+    """
+    Conditional GET for job-derived resources. Returns a 304 response when the
+    client's If-None-Match still matches; otherwise sets ETag/Cache-Control on
+    `response` and returns None. Only the job row is read, never results.
+    """
+    version = get_job_version(db, job_id=job_id)
+    if not version:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    job_version, job_status = version
+    headers = {
+        "ETag": make_etag(job_version, request.url.path, *variant),
+        "Cache-Control": cache_control_for_status(job_status),
+    }
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
 @router.post("/upload")
-def upload(file: UploadFile = File(...), db: Session = Depends(get_db)):
+def upload(
+    file: UploadFile = File(...),
+    on_duplicate: Literal["reuse", "clone", "new"] = "reuse",
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
+    db: Session = Depends(get_db),
+):
     try:
-        return creat_job_from_upload(db, file)
+        return creat_job_from_upload(db, file, idempotency_key=idempotency_key, on_duplicate=on_duplicate)
     except HTTPException: # re-raise HTTP exceptions to be handled by FastAPI's exception handlers
         raise 
     except Exception as e:
@@ -24,6 +64,69 @@ def upload(file: UploadFile = File(...), db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e)) # return a 500 Internal
 
 
+@router.post("/upload/batch")
+def upload_batch(
+    files: List[UploadFile] = File(...),
+    merge: bool = False,
+    db: Session = Depends(get_db),
+):
+    try:
+        return create_jobs_from_batch(db, files, merge=merge)
+    except HTTPException: # re-raise HTTP exceptions to be handled by FastAPI's exception handlers
+        raise
+    except Exception as e:
+        db.rollback() # rollback the transaction in case of any exception to avoid partial commits
+        raise HTTPException(status_code=500, detail=str(e)) # return a 500 Internal
+
+
+@router.post("")
+async def create_job(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    filename: Optional[str] = None,
+    run: bool = False,
+    db: Session = Depends(get_db),
+):
+    """
+    Create a job from a JSON array (application/json) or a streamed NDJSON body
+    (application/x-ndjson) of {"platform": ..., "url": ...} items.
+    NDJSON is validated and inserted in batches while the body is still arriving.
+    Pass run=true to start processing immediately.
+    """
+    try:
+        writer = await run_in_threadpool(LinkJobWriter, db, source_filename=filename)
+        if looks_like_ndjson(request.headers.get("content-type")):
+            pending = b""
+            async for chunk in request.stream():
+                pending += chunk
+                *lines, pending = pending.split(b"\n")
+                if lines:
+                    decoded = [line.decode("utf-8-sig", errors="replace") for line in lines]
+                    await run_in_threadpool(writer.add_ndjson_lines, decoded)
+            if pending:
+                await run_in_threadpool(writer.add_ndjson_lines, [pending.decode("utf-8-sig", errors="replace")])
+        else:
+            try:
+                items = await request.json()
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON.")
+            if not isinstance(items, list):
+                raise HTTPException(status_code=400, detail="Body must be a JSON array of {platform, url} items.")
+            await run_in_threadpool(writer.add_items, items)
+
+        payload = await run_in_threadpool(writer.finish)
+        if run:
+            payload.update(await run_in_threadpool(mark_job_running, db, writer.job.id))
+            background_tasks.add_task(run_job_in_background, writer.job.id)
+        return payload
+    except HTTPException: # re-raise HTTP exceptions to be handled by FastAPI's exception handlers
+        await run_in_threadpool(db.rollback)
+        raise
+    except Exception as e:
+        await run_in_threadpool(db.rollback) # rollback the transaction in case of any exception to avoid partial commits
+        raise HTTPException(status_code=500, detail=str(e)) # return a 500 Internal
+
+
 @router.post("/{job_id}/run", status_code=202)
 def run(job_id: UUID, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     try:
@@ -42,48 +145,206 @@ def run(job_id: UUID, background_tasks: BackgroundTasks, db: Session = Depends(g
 def get_jobs(
     limit: int = 20,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    count: Literal["exact", "estimated", "none"] = "estimated",
     db: Session = Depends(get_db),
     _user_id: int = Depends(get_current_user_id),
 ):
     limit = max(1, min(limit, 100))
     offset = max(0, offset)
-    return list_jobs(db, limit=limit, offset=offset)
+    try:
+        return list_jobs(db, limit=limit, offset=offset, cursor=cursor, count=count)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{job_id}")
 def get_job(
     job_id: UUID,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     _user_id: int = Depends(get_current_user_id),
 ):
+    if (not_modified := _not_modified(request, response, db, job_id)) is not None:
+        return not_modified
     data = get_job_detail(db, job_id=job_id)
     if not data:
         raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
     return data
 
+@router.get("/{job_id}/summary")
+def get_summary(
+    job_id: UUID,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    _user_id: int = Depends(get_current_user_id),
+):
+    if (not_modified := _not_modified(request, response, db, job_id)) is not None:
+        return not_modified
+    data = get_job_summary(db, job_id=job_id)
+    if not data:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return data
+
+@router.get("/{job_id}/analytics")
+def get_analytics(
+    job_id: UUID,
+    request: Request,
+    response: Response,
+    bins: int = 20,
+    z: float = 3.0,
+    group_by: Literal["platform", "channel"] = "platform",
+    group_limit: int = 50,
+    db: Session = Depends(get_db),
+    _user_id: int = Depends(get_current_user_id),
+):
+    bins = max(1, min(bins, 200))
+    group_limit = max(1, min(group_limit, 500))
+    if (not_modified := _not_modified(request, response, db, job_id, sorted(request.query_params.multi_items()))) is not None:
+        return not_modified
+    data = get_job_analytics(db, job_id, bins=bins, z_threshold=z, group_by=group_by, group_limit=group_limit)
+    if not data:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return FastJSONResponse(data, headers={k: response.headers[k] for k in ("etag", "cache-control")})
+
+@router.get("/{job_id}/series")
+def get_series(
+    job_id: UUID,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: Optional[Literal["hour", "day"]] = None,
+    db: Session = Depends(get_db),
+    _user_id: int = Depends(get_current_user_id),
+):
+    """
+    Campaign time series for the job's videos: summed metrics per hour/day
+    bucket from their snapshot history (including fetches made by other jobs).
+    """
+    if not get_job_version(db, job_id=job_id):
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    try:
+        return FastJSONResponse(get_job_series(db, job_id, start=start, end=end, resolution=resolution))
+    except InvalidSeriesRange as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{job_id}/events", response_class=StreamingResponse)
+async def job_events(
+    job_id: UUID,
+    request: Request,
+    db: Session = Depends(get_db),
+    _user_id: int = Depends(get_current_user_id),
+):
+    """
+    Server-Sent Events stream of live progress: a "snapshot" event, then
+    "result" (one per processed row) and "status" events until the job ends.
+    """
+    if not await run_in_threadpool(get_job_detail, db, job_id=job_id):
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    def _snapshot():
+        # Own session: the request-scoped one may already be closed while the stream is open.
+        with SessionLocal() as snapshot_db:
+            return get_job_detail(snapshot_db, job_id=job_id)
+
+    async def load_snapshot():
+        return await run_in_threadpool(_snapshot)
+
+    return StreamingResponse(
+        stream_job_events(job_id, load_snapshot, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/{job_id}/results")
 def get_results(
     job_id: UUID,
+    request: Request,
+    response: Response,
     limit: int = 50,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+    fields: Optional[str] = None,
+    status: Optional[Literal["queued", "success", "failed"]] = None,
+    platform: Optional[str] = None,
+    channel: Optional[str] = None,
+    min_views: Optional[int] = None,
+    max_views: Optional[int] = None,
+    min_engagement: Optional[float] = None,
+    max_engagement: Optional[float] = None,
+    published_after: Optional[datetime] = None,
+    published_before: Optional[datetime] = None,
+    sort: Optional[str] = None,
     db: Session = Depends(get_db),
     _user_id: int = Depends(get_current_user_id),
 ):
     limit = max(1, min(limit, 200))
     offset = max(0, offset)
-    data = list_job_results(db, job_id=job_id, limit=limit, offset=offset)
+    if (not_modified := _not_modified(request, response, db, job_id, sorted(request.query_params.multi_items()))) is not None:
+        return not_modified
+    try:
+        data = list_job_results(
+            db, job_id=job_id, limit=limit, offset=offset, cursor=cursor, since=since,
+            fields=parse_fields(fields, RESULT_COLUMNS),
+            filters=ResultFilters(
+                status=status,
+                platform=normalise_platform(platform),
+                channel=channel,
+                min_views=min_views,
+                max_views=max_views,
+                min_engagement=min_engagement,
+                max_engagement=max_engagement,
+                published_after=published_after,
+                published_before=published_before,
+            ),
+            sort=ResultSort.parse(sort),
+        )
+    except (InvalidCursor, InvalidFields, InvalidSort) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not data:
         raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
-    return data
+    # Returned as a Response, so the cache headers set by _not_modified are copied over.
+    return FastJSONResponse(data, headers={k: response.headers[k] for k in ("etag", "cache-control")})
 
 
 @router.get("/{job_id}/export.csv", response_class=StreamingResponse)
 def export_csv(
     job_id: UUID,
+    request: Request,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+    _user_id: int = Depends(get_current_user_id),
+):
+    try:
+        if fields is None: # the default export of a completed job is served pre-rendered
+            cached = cached_export_response(
+                db, job_id,
+                accept_encoding=request.headers.get("accept-encoding", ""),
+                if_none_match=request.headers.get("if-none-match"),
+                range_header=request.headers.get("range"),
+                if_range=request.headers.get("if-range"),
+            )
+            if cached is not None:
+                return cached
+        return export_job_results_csv(db, job_id, fields=fields)
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{job_id}/export.{fmt}", response_class=StreamingResponse)
+def export_other_format(
+    job_id: UUID,
+    fmt: Literal["xlsx", "parquet", "ndjson"],
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     _user_id: int = Depends(get_current_user_id),
 ):
     try:
-        return export_job_results_csv(db, job_id)
+        return export_job_results(db, job_id, fmt, fields=fields)
     except HTTPException:
         raise
     except Exception as e:
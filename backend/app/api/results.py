@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.fast_json import FastJSONResponse
+from app.core.security import get_current_user_id
+from app.db.session import get_db
+from app.services.jobs.filters import ResultFilters
+from app.services.jobs.search import search_results
+from app.services.upload.validators import normalise_platform
+
+router = APIRouter()
+
+
+@router.get("/search")
+def search(
+    q: str,
+    job_id: Optional[UUID] = None,
+    platform: Optional[str] = None,
+    status: Optional[Literal["queued", "success", "failed"]] = None,
+    published_after: Optional[datetime] = None,
+    published_before: Optional[datetime] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    _user_id: int = Depends(get_current_user_id),
+):
+    """Full-text and substring search over result titles and channels across all jobs."""
+    limit = max(1, min(limit, 200))
+    filters = ResultFilters(
+        status=status,
+        platform=normalise_platform(platform),
+        published_after=published_after,
+        published_before=published_before,
+    )
+    try:
+        data = search_results(db, q=q, job_id=job_id, filters=filters, limit=limit, cursor=cursor)
+    except ValueError as e: # empty query or InvalidCursor
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(data)
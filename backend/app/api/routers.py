@@ -1,10 +1,22 @@
 from fastapi import APIRouter
 from app.api.auth import router as auth_router
+from app.api.channels import router as channels_router
+from app.api.exports import router as exports_router
+from app.api.fetch import router as fetch_router
 from app.api.jobs import router as jobs_router
+from app.api.results import router as results_router
 from app.api.system import router as system_router
+from app.api.tracked_sets import router as tracked_sets_router
+from app.api.videos import router as videos_router
 
 router = APIRouter()
 
 router.include_router(auth_router, prefix="/auth", tags=["auth"])
 router.include_router(jobs_router, prefix="/jobs", tags=["jobs"])
+router.include_router(results_router, prefix="/results", tags=["results"])
+router.include_router(exports_router, prefix="/exports", tags=["exports"])
+router.include_router(channels_router, prefix="/channels", tags=["channels"])
+router.include_router(videos_router, prefix="/videos", tags=["videos"])
+router.include_router(tracked_sets_router, prefix="/tracked-sets", tags=["tracked-sets"])
+router.include_router(fetch_router, prefix="/fetch", tags=["fetch"])
 router.include_router(system_router, prefix="/system", tags=["system"])
\ No newline at end of file
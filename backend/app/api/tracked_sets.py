@@ -0,0 +1,118 @@
+from datetime import datetime
+from typing import Any, List, Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from app.core.fast_json import FastJSONResponse
+from app.core.security import get_current_user_id
+from app.db.models import TrackedSet
+from app.db.session import get_db
+from app.services.jobs.snapshots import InvalidSeriesRange
+from app.services.jobs.tracking import (
+    MIN_REFRESH_INTERVAL_SECONDS,
+    add_tracked_links,
+    create_tracked_set,
+    delete_tracked_set,
+    get_tracked_set,
+    get_tracked_set_series,
+    list_tracked_sets,
+)
+
+router = APIRouter()
+
+
+# ---------------------------------------------------------------------------
+# Schemas
+# ---------------------------------------------------------------------------
+
+class TrackedSetCreate(BaseModel):
+    name: str
+    # Staleness window for videos older than a week; newer ones are refreshed 2-4x as often.
+    refresh_interval_seconds: int = Field(default=86400, ge=MIN_REFRESH_INTERVAL_SECONDS)
+    links: List[Any] = []
+
+
+class TrackedLinksAdd(BaseModel):
+    links: List[Any]
+
+
+# ---------------------------------------------------------------------------
+# Endpoints
+# ---------------------------------------------------------------------------
+
+@router.post("")
+def create_set(
+    body: TrackedSetCreate,
+    db: Session = Depends(get_db),
+    _user_id: int = Depends(get_current_user_id),
+):
+    """
+    Track a set of {platform, url} links. The built-in scheduler refreshes each
+    link once it is older than its staleness window; no re-upload is needed.
+    """
+    try:
+        return create_tracked_set(db, name=body.name, refresh_interval_seconds=body.refresh_interval_seconds,
+                                  links=body.links)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("")
+def get_sets(db: Session = Depends(get_db), _user_id: int = Depends(get_current_user_id)):
+    return list_tracked_sets(db)
+
+
+@router.get("/{set_id}")
+def get_set(set_id: UUID, db: Session = Depends(get_db), _user_id: int = Depends(get_current_user_id)):
+    data = get_tracked_set(db, set_id)
+    if not data:
+        raise HTTPException(status_code=404, detail=f"Tracked set not found: {set_id}")
+    return data
+
+
+@router.post("/{set_id}/links")
+def add_links(
+    set_id: UUID,
+    body: TrackedLinksAdd,
+    db: Session = Depends(get_db),
+    _user_id: int = Depends(get_current_user_id),
+):
+    """Add links to a set; links it already tracks (same video) are skipped."""
+    tracked_set = db.get(TrackedSet, set_id)
+    if tracked_set is None:
+        raise HTTPException(status_code=404, detail=f"Tracked set not found: {set_id}")
+    try:
+        return add_tracked_links(db, tracked_set, body.links)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/{set_id}", status_code=204)
+def delete_set(set_id: UUID, db: Session = Depends(get_db), _user_id: int = Depends(get_current_user_id)):
+    if not delete_tracked_set(db, set_id):
+        raise HTTPException(status_code=404, detail=f"Tracked set not found: {set_id}")
+    return Response(status_code=204)
+
+
+@router.get("/{set_id}/series")
+def get_set_series(
+    set_id: UUID,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: Optional[Literal["hour", "day"]] = None,
+    db: Session = Depends(get_db),
+    _user_id: int = Depends(get_current_user_id),
+):
+    """Campaign time series over the set's videos, as GET /jobs/{job_id}/series."""
+    try:
+        data = get_tracked_set_series(db, set_id, start=start, end=end, resolution=resolution)
+    except InvalidSeriesRange as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"Tracked set not found: {set_id}")
+    return FastJSONResponse(data)
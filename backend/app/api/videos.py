@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.fast_json import FastJSONResponse
+from app.core.security import get_current_user_id
+from app.db.session import get_db
+from app.services.fetchers import canonical_video_id, detect_platform
+from app.services.jobs.snapshots import InvalidSeriesRange, get_video_series
+from app.services.upload.validators import normalise_platform
+
+router = APIRouter()
+
+
+@router.get("/series")
+def get_series(
+    video_id: Optional[str] = None,
+    url: Optional[str] = None,
+    platform: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: Optional[Literal["hour", "day"]] = None,
+    db: Session = Depends(get_db),
+    _user_id: int = Depends(get_current_user_id),
+):
+    """
+    One video's metric history per hour/day bucket. The video is given by its
+    canonical id (e.g. "youtube:dQw4w9WgXcQ") or by any of its URLs.
+    """
+    if not video_id:
+        if not url:
+            raise HTTPException(status_code=400, detail="Give video_id or url")
+        platform = normalise_platform(platform) or detect_platform(url)
+        if not platform:
+            raise HTTPException(status_code=400, detail=f"Unsupported platform for url: {url}")
+        video_id = canonical_video_id(platform, url)
+    try:
+        return FastJSONResponse(get_video_series(db, video_id, start=start, end=end, resolution=resolution))
+    except InvalidSeriesRange as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1 @@
+# Package marker for maintenance commands (run with `python -m app.commands.<name>`).
@@ -0,0 +1,35 @@
+"""
+Rebuild the job_stats rollup from `results`.
+
+Usage:
+    python -m app.commands.rebuild_job_stats              # every job
+    python -m app.commands.rebuild_job_stats --job-id ID  # one job
+"""
+
+from __future__ import annotations
+
+import argparse
+import uuid
+
+from app.core.logging import setup_logging
+from app.db.session import SessionLocal
+from app.services.jobs.stats import rebuild_job_stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--job-id", type=uuid.UUID, default=None, help="Only rebuild this job.")
+    args = parser.parse_args()
+
+    setup_logging()
+    db = SessionLocal()
+    try:
+        written = rebuild_job_stats(db, args.job_id)
+        db.commit()
+        print(f"Rebuilt job_stats for {written} job(s).")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Refresh the channel_stats materialised view (GET /channels).
+
+Usage:
+    python -m app.commands.refresh_channel_stats
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from app.core.logging import setup_logging
+from app.db.session import SessionLocal
+from app.services.jobs.channels import refresh_channel_stats
+
+
+def main() -> None:
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+
+    setup_logging()
+    db = SessionLocal()
+    try:
+        refresh_channel_stats(db)
+        db.commit()
+        print("Refreshed channel_stats.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Run one tracked-link refresh tick now: claim the links that have gone stale
+(up to the tick's share of the budget) and fetch them. For deployments that
+run it from cron with REFRESH_SCHEDULER_TICK_SECONDS=0; skips the tick while
+another process holds the scheduler lock.
+
+Usage:
+    python -m app.commands.refresh_tracked_links [--elapsed-seconds N]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from app.core.config import get_refresh_scheduler_tick_seconds
+from app.core.logging import setup_logging
+from app.services.jobs.tracking import release_scheduler_lock, run_refresh_tick, try_scheduler_lock
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--elapsed-seconds", type=float, default=None,
+                        help="Time this tick covers (default: the cron interval, REFRESH_SCHEDULER_TICK_SECONDS or 60).")
+    args = parser.parse_args()
+
+    setup_logging()
+    elapsed = args.elapsed_seconds or get_refresh_scheduler_tick_seconds() or 60.0
+    lock = try_scheduler_lock()
+    if lock is None:
+        print("Another process holds the scheduler lock; skipped.")
+        return
+    try:
+        claimed = run_refresh_tick(elapsed)
+    finally:
+        release_scheduler_lock(lock)
+    print(f"Refreshed {claimed} tracked links." if claimed else "No tracked links are due.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Fold new metric snapshots into the hourly/daily rollups and create upcoming
+monthly snapshot partitions. Safe to run from cron; concurrent runs skip.
+
+Usage:
+    python -m app.commands.rollup_metric_snapshots
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from app.core.logging import setup_logging
+from app.db.session import SessionLocal
+from app.services.jobs.snapshots import rollup_metric_snapshots
+
+
+def main() -> None:
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+
+    setup_logging()
+    db = SessionLocal()
+    try:
+        mark = rollup_metric_snapshots(db)
+        db.commit()
+        if mark is None:
+            print("Another rollup is running; skipped.")
+        else:
+            print(f"Rolled up metric snapshots to {mark.isoformat()}.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
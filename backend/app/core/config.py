@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 DEFAULT_CORS_ORIGINS = ["http://localhost:3000"]
 
@@ -9,3 +10,71 @@ def get_cors_origins() -> list[str]:
         return DEFAULT_CORS_ORIGINS
     origins = [origin.strip() for origin in raw.split(",") if origin.strip()]
     return origins or DEFAULT_CORS_ORIGINS
+
+
+DEFAULT_UPLOAD_DEDUP_WINDOW_SECONDS = 3600
+DEFAULT_FETCH_CACHE_TTL_SECONDS = 900
+DEFAULT_FETCH_TIMEOUT_SECONDS = 10.0
+DEFAULT_CHANNEL_STATS_REFRESH_DELAY_SECONDS = 60.0
+DEFAULT_REFRESH_SCHEDULER_TICK_SECONDS = 60.0
+DEFAULT_EXPORT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def _get_non_negative_env(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return default
+
+
+def get_upload_dedup_window_seconds() -> int:
+    """Seconds within which an identical upload re-uses the earlier job (0 disables)."""
+    return int(_get_non_negative_env("UPLOAD_DEDUP_WINDOW_SECONDS", DEFAULT_UPLOAD_DEDUP_WINDOW_SECONDS))
+
+
+def get_fetch_cache_ttl_seconds() -> int:
+    """How long a successful single-URL fetch is served from cache/storage (0 disables)."""
+    return int(_get_non_negative_env("FETCH_CACHE_TTL_SECONDS", DEFAULT_FETCH_CACHE_TTL_SECONDS))
+
+
+def get_fetch_timeout_seconds() -> float:
+    """Upper bound on an inline fetcher call made by GET/POST /fetch."""
+    return _get_non_negative_env("FETCH_TIMEOUT_SECONDS", DEFAULT_FETCH_TIMEOUT_SECONDS)
+
+
+def get_channel_stats_refresh_delay_seconds() -> float:
+    """
+    How long after a job completes the channel leaderboard is refreshed; completions
+    within the delay share one refresh. 0 refreshes immediately.
+    """
+    return _get_non_negative_env("CHANNEL_STATS_REFRESH_DELAY_SECONDS", DEFAULT_CHANNEL_STATS_REFRESH_DELAY_SECONDS)
+
+
+def get_refresh_scheduler_tick_seconds() -> float:
+    """
+    How often the tracked-link scheduler refreshes stale links. Each tick takes an
+    even share of the period's work; 0 disables the scheduler.
+    """
+    return _get_non_negative_env("REFRESH_SCHEDULER_TICK_SECONDS", DEFAULT_REFRESH_SCHEDULER_TICK_SECONDS)
+
+
+def get_export_cache_dir() -> str | None:
+    """
+    Directory for pre-rendered CSV exports of completed jobs.
+    Defaults to a folder under the system temp dir; set EXPORT_CACHE_DIR="" to disable.
+    """
+    raw = os.getenv("EXPORT_CACHE_DIR")
+    if raw is None:
+        return os.path.join(tempfile.gettempdir(), "media-metrics-exports")
+    return raw.strip() or None
+
+
+def get_export_cache_max_bytes() -> int:
+    """
+    Total size the export cache may grow to; the least recently used files are
+    evicted past it. 0 leaves the cache unbounded.
+    """
+    return int(_get_non_negative_env("EXPORT_CACHE_MAX_BYTES", DEFAULT_EXPORT_CACHE_MAX_BYTES))
@@ -0,0 +1,32 @@
+"""ETag and Cache-Control helpers for conditional GETs."""
+from __future__ import annotations
+
+import hashlib
+from typing import Optional
+
+# Finished jobs rarely change, but can (backfills, re-used rows), so they are
+# reused only briefly and then revalidated against the ETag; never `immutable`.
+FINISHED_CACHE_CONTROL = "private, max-age=60"
+# In-progress jobs: caches may store but must revalidate (cheap 304 via ETag).
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """Strong ETag from an ordered list of version components."""
+    digest = hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 If-None-Match check (weak comparison, supports lists and '*')."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    bare = etag.removeprefix("W/")
+    return any(c.removeprefix("W/") == bare for c in candidates)
+
+
+def cache_control_for_status(status: str) -> str:
+    return FINISHED_CACHE_CONTROL if status in {"completed", "failed"} else REVALIDATE_CACHE_CONTROL
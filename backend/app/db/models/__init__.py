@@ -1,5 +1,9 @@
 # Package marker for db.models.
 
+from app.db.models.channel_stats import ChannelStats
 from app.db.models.job import Job
+from app.db.models.job_stats import JobStats
+from app.db.models.metric_snapshot import MetricRollup, MetricRollupState, MetricSnapshot
 from app.db.models.result import Result
+from app.db.models.tracked_link import TrackedLink, TrackedSet
 from app.db.models.user import User
\ No newline at end of file
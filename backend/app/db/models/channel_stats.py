@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, Float, Index, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ChannelStats(Base):
+    """
+    Cross-job channel aggregates: a materialised view over the latest
+    successful fetch of each video (platform, url) that has a channel.
+    Refreshed concurrently by services.jobs.channels; never written directly.
+    """
+    __tablename__ = "channel_stats"
+    __table_args__ = (
+        # Required by REFRESH MATERIALIZED VIEW CONCURRENTLY.
+        Index("ux_channel_stats_platform_channel", "platform", "channel", unique=True),
+        # Leaderboard keyset pagination: rank value, then (platform, channel) as tiebreak.
+        Index("ix_channel_stats_total_views", text("total_views DESC"), text("platform DESC"), text("channel DESC")),
+        Index("ix_channel_stats_video_count", text("video_count DESC"), text("platform DESC"), text("channel DESC")),
+        Index("ix_channel_stats_median_views", text("median_views DESC"), text("platform DESC"), text("channel DESC")),
+        Index("ix_channel_stats_mean_engagement_rate", text("mean_engagement_rate DESC"), text("platform DESC"),
+              text("channel DESC")),
+        {"info": {"is_view": True}}, # created by migration; alembic autogenerate skips it
+    )
+
+    platform: Mapped[str] = mapped_column(Text, primary_key=True)
+    channel: Mapped[str] = mapped_column(Text, primary_key=True)
+    video_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    total_views: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    total_likes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    total_comments: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    median_views: Mapped[float] = mapped_column(Float, nullable=False)
+    # Mean of the videos' stored engagement_rate; 0 when none has views.
+    mean_engagement_rate: Mapped[float] = mapped_column(Float, nullable=False)
+    latest_published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -3,12 +3,18 @@ from __future__ import annotations
 from app.db.base import Base
 import uuid
 from datetime import datetime
-from sqlalchemy import Integer, String, DateTime, Text, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, Index, Integer, String, DateTime, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Keyset pagination for GET /jobs (newest first).
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        # The same for listed (non-internal) jobs; its reltuples is the listing's count estimate.
+        Index("ix_jobs_listed_created_at_id", "created_at", "id", postgresql_where=text("NOT internal")),
+    )
     
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")
@@ -21,4 +27,14 @@ class Job(Base):
     total_rows: Mapped[int | None] = mapped_column(Integer, nullable=False, default=0)
     processed_rows: Mapped[int | None] = mapped_column(Integer, nullable=False, default=0)
 
+    # Upload de-duplication: SHA-256 of the raw upload bytes, optional client key,
+    # and the summary returned to the original uploader so duplicates can echo it.
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    idempotency_key: Mapped[str | None] = mapped_column(Text, nullable=True, unique=True)
+    upload_summary: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+
+    # Created by the server rather than a user (single /fetch lookups): kept for
+    # lookups and history, but left out of job listings, bulk exports and /channels.
+    internal: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=text("false"))
+
     # Define your columns and relationships here    
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, Float, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class JobStats(Base):
+    """Per-job rollup maintained incrementally by process_job (one row per job)."""
+    __tablename__ = "job_stats"
+
+    job_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True
+    )
+    success_rows: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    failed_rows: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    total_views: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    total_likes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    total_comments: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    # Mean engagement = engagement_sum / engagement_count over rows with views > 0.
+    engagement_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    engagement_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
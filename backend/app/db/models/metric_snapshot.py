@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, Float, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class MetricSnapshot(Base):
+    """
+    Append-only history: one row per successful fetch of a video.
+
+    Range-partitioned by month on captured_at (partitions metric_snapshots_pYYYYMM,
+    plus metric_snapshots_default), so time-bounded reads touch only the months
+    they cover and old months can be detached or dropped whole.
+    """
+    __tablename__ = "metric_snapshots"
+    __table_args__ = (
+        # A video's series within a time range (per partition).
+        Index("ix_metric_snapshots_video_captured", "video_id", "captured_at"),
+        {"postgresql_partition_by": "RANGE (captured_at)"},
+    )
+
+    # The partition key has to be part of the primary key.
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    captured_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    # services.fetchers.canonical_video_id, e.g. "youtube:dQw4w9WgXcQ".
+    video_id: Mapped[str] = mapped_column(Text, nullable=False)
+    views: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    likes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    comments: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    engagement_rate: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # The job whose fetch produced the point (no FK: history outlives jobs).
+    job_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+
+
+class MetricRollup(Base):
+    """
+    Downsampled snapshots: the last value of each video per hour or day
+    (UTC buckets), maintained incrementally by services.jobs.snapshots.
+    """
+    __tablename__ = "metric_rollups"
+
+    video_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    resolution: Mapped[str] = mapped_column(String(8), primary_key=True) # "hour" | "day"
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    views: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    likes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    comments: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    engagement_rate: Mapped[float | None] = mapped_column(Float, nullable=True)
+    samples: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class MetricRollupState(Base):
+    """High-water mark per resolution: snapshots before it are reflected in metric_rollups."""
+    __tablename__ = "metric_rollup_state"
+
+    resolution: Mapped[str] = mapped_column(String(8), primary_key=True)
+    rolled_up_to: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
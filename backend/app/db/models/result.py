@@ -3,12 +3,39 @@ from app.db.base import Base
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, Float, Text, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, Column, Computed, String, Integer, DateTime, Float, Text, ForeignKey, Index, Sequence, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
+# Global, monotonically increasing change counter: every insert and update of a
+# result row takes the next value, which lets clients ask for "rows changed since N".
+RESULTS_CHANGE_SEQ = Sequence("results_change_seq")
+
 class Result(Base):
     __tablename__ = "results"
+    __table_args__ = (
+        # Per-job listing/keyset pagination; also serves the results.job_id FK lookups.
+        Index("ix_results_job_id_id", "job_id", "id"),
+        Index("ix_results_job_id_change_seq", "job_id", "change_seq"),
+        # Freshest successful fetch of a URL (GET /fetch serving a stored result).
+        Index("ix_results_url_fetched_at", "url", text("fetched_at DESC"), postgresql_where=text("status = 'success'")),
+        # Server-side filters: failed rows are the usual "what went wrong" view.
+        Index("ix_results_job_failed_id", "job_id", "id", postgresql_where=text("status = 'failed'")),
+        Index("ix_results_job_platform_id", "job_id", "platform", "id"),
+        Index("ix_results_job_channel_id", "job_id", "channel", "id"),
+        # "Top N" sorts (descending, NULLs last, id tiebreak) and range filters on the same columns.
+        Index("ix_results_job_views_desc", "job_id", text("views DESC NULLS LAST"), text("id DESC")),
+        Index("ix_results_job_likes_desc", "job_id", text("likes DESC NULLS LAST"), text("id DESC")),
+        Index("ix_results_job_published_at_desc", "job_id", text("published_at DESC NULLS LAST"), text("id DESC")),
+        Index("ix_results_job_engagement_rate_desc", "job_id", text("engagement_rate DESC NULLS LAST"), text("id DESC")),
+        # Cross-job "top engaging videos".
+        Index("ix_results_engagement_rate_desc", text("engagement_rate DESC"), text("id DESC"),
+              postgresql_where=text("engagement_rate IS NOT NULL")),
+        # Cross-job search (/results/search): word matches and trigram substring matches.
+        Index("ix_results_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_results_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_results_channel_trgm", "channel", postgresql_using="gin", postgresql_ops={"channel": "gin_trgm_ops"}),
+    )
     
     id: Mapped[int]= mapped_column(primary_key=True, autoincrement=True)
     job_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True),
@@ -16,12 +43,27 @@ class Result(Base):
                                               nullable=False)
     platform: Mapped[str] = mapped_column(Text, nullable=False)
     url: Mapped[str] = mapped_column(Text, nullable=False)
+    # services.fetchers.canonical_video_id, so channel_stats counts a video once whatever its URL shape.
+    video_id: Mapped[str] = mapped_column(Text, nullable=False)
     title: Mapped[str | None] = mapped_column(Text, nullable=True)
     views: Mapped[int | None] = mapped_column(Integer, nullable=True)
     likes: Mapped[int | None] = mapped_column(Integer, nullable=True)
     comments: Mapped[int | None] = mapped_column(Integer, nullable=True)
     published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # When the fetcher ran for this row (success or failure); NULL while queued.
+    fetched_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # (likes + comments) / views, stored when the row is fetched (see stats.engagement_rate).
     engagement_rate: Mapped[float | None] = mapped_column(Float, nullable=True)
     channel: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[str] = mapped_column(String(20), nullable=False, default = "queued")
-    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
\ No newline at end of file
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    change_seq: Mapped[int] = mapped_column(BigInteger, RESULTS_CHANGE_SEQ, nullable=False,
+                                            server_default=RESULTS_CHANGE_SEQ.next_value(),
+                                            onupdate=RESULTS_CHANGE_SEQ.next_value())
+    # Maintained by Postgres; deferred so ordinary loads never read it.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(channel, ''))", persisted=True),
+        nullable=True,
+        deferred=True,
+    )
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class TrackedSet(Base):
+    """A named set of links that the refresh scheduler keeps fresh."""
+    __tablename__ = "tracked_sets"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name: Mapped[str] = mapped_column(Text, nullable=False)
+    # Staleness window for older videos; recently published ones use a fraction of it.
+    refresh_interval_seconds: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Kept in step with tracked_links so the scheduler's rate needs no count(*).
+    link_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now(),
+        onupdate=func.now(),)
+
+
+class TrackedLink(Base):
+    __tablename__ = "tracked_links"
+    __table_args__ = (
+        # One row per video per set, whatever URL shape it was added with.
+        Index("ux_tracked_links_set_video", "set_id", "video_id", unique=True),
+        # The scheduler only ever reads the due end of this index.
+        Index("ix_tracked_links_next_due_at", "next_due_at"),
+        # The scheduler's refresh rate reads only recently published links.
+        Index("ix_tracked_links_published_at", "published_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    set_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("tracked_sets.id", ondelete="CASCADE"),
+                                              nullable=False)
+    platform: Mapped[str] = mapped_column(Text, nullable=False)
+    url: Mapped[str] = mapped_column(Text, nullable=False)
+    # services.fetchers.canonical_video_id
+    video_id: Mapped[str] = mapped_column(Text, nullable=False)
+    published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_fetched_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    next_due_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -3,8 +3,12 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routers import router as api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import get_cors_origins
 from app.core.logging import setup_logging
+from app.services.jobs.events import broadcaster
+from app.services.jobs.tracking import refresh_scheduler
+from app.services.upload.batch import shutdown_parse_pool
 
 setup_logging()
 
@@ -18,7 +22,11 @@ async def lifespan(app: FastAPI):
         cwd=os.path.join(os.path.dirname(__file__), ".."),
         check=True,
     )
+    refresh_scheduler.start() # tracked-link refreshes; REFRESH_SCHEDULER_TICK_SECONDS=0 disables
     yield
+    refresh_scheduler.stop()
+    await broadcaster.stop()
+    shutdown_parse_pool()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -31,4 +39,6 @@ app.add_middleware(
     allow_headers=["*"],   # Allow all headers
 )
 
+app.add_middleware(CompressionMiddleware) # gzip/brotli per Accept-Encoding
+
 app.include_router(api_router) # Include API routes
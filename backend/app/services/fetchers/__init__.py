@@ -1,6 +1,7 @@
 """"Public exports for fetchers module."""
 
-from .factory import get_fetcher
+from .factory import canonical_video_id, detect_platform, get_fetcher
+from .cache import FetchCache, fetch_cache
 from .base import PlatformFetcher
 from .types import FetchResult
 
@@ -8,4 +9,8 @@ __all__ = [
     "PlatformFetcher",
     "FetchResult",
     "get_fetcher",
+    "detect_platform",
+    "canonical_video_id",
+    "FetchCache",
+    "fetch_cache",
 ]
\ No newline at end of file
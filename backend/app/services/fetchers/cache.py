@@ -0,0 +1,57 @@
+"""
+In-process TTL cache for successful fetch results.
+"""
+
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.config import get_fetch_cache_ttl_seconds
+from .types import FetchResult
+
+MAX_CACHE_ENTRIES = 10_000
+
+class FetchCache:
+    """
+    Thread-safe LRU cache keyed by (platform, url), with per-entry expiry.
+
+    Only successful results should be stored; failures are worth retrying.
+    """
+
+    def __init__(self, maxsize: int = MAX_CACHE_ENTRIES) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[str, str], Tuple[float, FetchResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, platform: str, url: str) -> Optional[FetchResult]:
+        key = (platform, url.strip())
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, result: FetchResult, ttl: Optional[float] = None) -> None:
+        ttl = get_fetch_cache_ttl_seconds() if ttl is None else ttl
+        if ttl <= 0 or not result.get("ok"):
+            return
+        key = (result["platform"], result["url"].strip())
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, result)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+fetch_cache = FetchCache()
@@ -1,10 +1,13 @@
 from __future__ import annotations
+import re
+from typing import Optional
+from urllib.parse import urlparse
 from fastapi import HTTPException
 
 from .base import PlatformFetcher
 from .instagram_stub import InstagramFetcherStub
 from .tiktok_stub import TikTokFetcherStub      
-from .youtube_stub import YouTubeFetcherStub
+from .youtube_stub import YouTubeFetcherStub, _extract_video_id
 
 def get_fetcher(platform:str) -> PlatformFetcher:
     
@@ -17,4 +20,50 @@ def get_fetcher(platform:str) -> PlatformFetcher:
     if normalized == "tiktok":
         return TikTokFetcherStub()
     
-    raise HTTPException(status_code=400, detail=f"Unsupported platform: {platform}")
\ No newline at end of file
+    raise HTTPException(status_code=400, detail=f"Unsupported platform: {platform}")
+
+# Registrable domains per platform; subdomains (www., m., vm., ...) match too.
+_PLATFORM_DOMAINS = {
+    "youtube": ("youtube.com", "youtu.be", "youtube-nocookie.com"),
+    "tiktok": ("tiktok.com",),
+    "instagram": ("instagram.com", "instagr.am"),
+}
+
+def detect_platform(url: str) -> Optional[str]:
+    """Best-effort platform detection from a URL's host. Returns None when unknown."""
+    raw = (url or "").strip()
+    if "://" not in raw:
+        raw = "https://" + raw # tolerate scheme-less input like 'youtu.be/abc'
+    host = (urlparse(raw).hostname or "").lower()
+    for platform, domains in _PLATFORM_DOMAINS.items():
+        if any(host == d or host.endswith("." + d) for d in domains):
+            return platform
+    return None
+
+
+_TIKTOK_VIDEO_RE = re.compile(r"/video/(\d+)")
+_INSTAGRAM_MEDIA_RE = re.compile(r"/(?:p|reels?|tv)/([A-Za-z0-9_-]+)")
+
+
+def canonical_video_id(platform: str, url: str) -> str:
+    """
+    Stable key for a video, "<platform>:<id>", so the same video reached via
+    different URL shapes (watch/shorts/youtu.be, tracking params, ...) shares
+    one metric history. Falls back to host + path when no id can be parsed.
+    """
+    raw = (url or "").strip()
+    if "://" not in raw:
+        raw = "https://" + raw
+    parsed = urlparse(raw)
+    video_id: Optional[str] = None
+    if platform == "youtube":
+        video_id = _extract_video_id(raw)
+    elif platform == "tiktok":
+        m = _TIKTOK_VIDEO_RE.search(parsed.path)
+        video_id = m.group(1) if m else None
+    elif platform == "instagram":
+        m = _INSTAGRAM_MEDIA_RE.search(parsed.path)
+        video_id = m.group(1) if m else None
+    if not video_id:
+        video_id = f"{(parsed.hostname or '').lower()}{parsed.path.rstrip('/')}"
+    return f"{platform}:{video_id}"
@@ -0,0 +1,326 @@
+"""
+Per-job distribution analytics: quantiles, histograms, z-score outliers and
+per-platform/channel aggregates over a job's successful results.
+
+The numeric columns are read in one binary COPY and parsed straight into
+NumPy arrays (no per-row Python objects): every value is a fixed-width field
+(NULL counts become -1, a NULL rate NaN, platform/channel become 64-bit hash
+keys), so the COPY payload is one flat record array and the job's rows are
+scanned once. Everything after that is vectorised: groups are factorised from
+the keys in NumPy, and only the listed groups' labels are read back, by the
+primary key of one row each. Results for completed jobs are kept in an
+in-process LRU.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import Result
+from app.services.jobs.queries import get_job_version
+
+try:
+    import numpy as np
+except ImportError: # numpy is optional; analytics are rejected without it
+    np = None
+
+METRICS = ("views", "likes", "comments", "engagement_rate")
+# Counts are heavy-tailed: they get log-spaced histogram bins and z-scores on log1p.
+COUNT_METRICS = ("views", "likes", "comments")
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+# Outlier rows listed in the response (all of them are counted).
+MAX_OUTLIER_ITEMS = 100
+MAX_CACHED_ANALYTICS = 128
+
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_COPY_SQL = """
+COPY (
+    SELECT r.id::int8,
+           coalesce(r.views, -1)::int8,
+           coalesce(r.likes, -1)::int8,
+           coalesce(r.comments, -1)::int8,
+           coalesce(r.engagement_rate, 'NaN')::float8,
+           hashtextextended(r.platform, 0),
+           coalesce(hashtextextended(r.channel, 0), 0) -- no channel: key 0
+    FROM results r
+    WHERE r.job_id = %s AND r.status = 'success'
+) TO STDOUT (FORMAT binary)
+"""
+_COPY_FIELDS = (
+    ("id", ">i8"), ("views", ">i8"), ("likes", ">i8"), ("comments", ">i8"),
+    ("engagement_rate", ">f8"), ("platform_key", ">i8"), ("channel_key", ">i8"),
+)
+
+
+def _copy_dtype():
+    # Each binary COPY tuple: int16 field count, then (int32 length, value) per field.
+    fields: List[Tuple[str, str]] = [("_nfields", ">i2")]
+    for name, kind in _COPY_FIELDS:
+        fields += [(f"_{name}_len", ">i4"), (name, kind)]
+    return np.dtype(fields)
+
+
+def parse_copy_binary(buf: bytes) -> Any:
+    """Fixed-width binary COPY payload (as produced by _COPY_SQL) -> NumPy record array."""
+    if not buf.startswith(_COPY_SIGNATURE):
+        raise ValueError("Not a binary COPY payload")
+    ext_len = int.from_bytes(buf[15:19], "big")
+    offset = 19 + ext_len
+    dtype = _copy_dtype()
+    count = (len(buf) - offset - 2) // dtype.itemsize # 2-byte trailer
+    rows = np.frombuffer(buf, dtype=dtype, count=count, offset=offset)
+    if count and (rows["_nfields"] != len(_COPY_FIELDS)).any():
+        raise ValueError("Unexpected COPY row layout")
+    return rows
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise HTTPException(status_code=501, detail="Analytics are not supported on this server.")
+
+
+# (group_by column, representative row ids) -> {row id: label}
+LabelLookup = Callable[[str, Sequence[int]], Dict[int, Optional[str]]]
+
+
+def _load_columns(db: Session, job_id: UUID) -> Any:
+    """The job's successful rows as a record array, in one pass over its results."""
+    raw = db.connection().connection.driver_connection # psycopg connection, same transaction
+    with raw.cursor() as cur, cur.copy(_COPY_SQL, (job_id,)) as copy:
+        buf = b"".join(bytes(block) for block in copy)
+    return parse_copy_binary(buf)
+
+
+def _label_lookup(db: Session) -> LabelLookup:
+    """Group labels by primary key: one row per listed group, never a scan of the job."""
+    def lookup(column: str, ids: Sequence[int]) -> Dict[int, Optional[str]]:
+        if not ids:
+            return {}
+        return dict(db.execute(select(Result.id, getattr(Result, column)).where(Result.id.in_(ids))).all())
+    return lookup
+
+
+def _num(x: Any) -> Optional[float]:
+    x = float(x)
+    return None if x != x else x # NaN -> null
+
+
+def _metric_values(rows: Any) -> Dict[str, Tuple[Any, Any]]:
+    """metric -> (mask of rows that have it, values of those rows as float64)."""
+    out = {}
+    for m in METRICS:
+        col = rows[m]
+        mask = ~np.isnan(col) if m == "engagement_rate" else col >= 0
+        out[m] = mask, col[mask].astype(np.float64)
+    return out
+
+
+def _distribution(values: Any, *, bins: int, log_bins: bool) -> Dict[str, Any]:
+    if values.size == 0:
+        return {"count": 0, "mean": None, "std": None, "min": None, "max": None,
+                "quantiles": {}, "histogram": {"edges": [], "counts": []}}
+    qs = np.quantile(values, QUANTILES)
+    top = values.max()
+    if log_bins and top > 0 and values.min() >= 0:
+        edges = np.expm1(np.linspace(0.0, np.log1p(top), bins + 1))
+        # expm1(log1p(top)) can round to just below top, which would drop the max from the last bin.
+        edges[0], edges[-1] = 0.0, top
+    else:
+        edges = np.histogram_bin_edges(values, bins=bins)
+    counts, edges = np.histogram(values, bins=edges)
+    return {
+        "count": int(values.size),
+        "mean": _num(values.mean()),
+        "std": _num(values.std()),
+        "min": _num(values.min()),
+        "max": _num(top),
+        "quantiles": {f"p{round(q * 100)}": _num(v) for q, v in zip(QUANTILES, qs)},
+        "histogram": {"edges": [_num(e) for e in edges], "counts": counts.tolist()},
+    }
+
+
+def _outliers(rows: Any, values: Dict[str, Tuple[Any, Any]], z_threshold: float) -> Dict[str, Any]:
+    counts: Dict[str, int] = {}
+    ids, metric_idx, raw, scores = [], [], [], []
+    for i, m in enumerate(METRICS):
+        mask, v = values[m]
+        x = np.log1p(v) if m in COUNT_METRICS else v
+        std = x.std() if x.size else 0.0
+        if not std:
+            counts[m] = 0
+            continue
+        z = (x - x.mean()) / std
+        hit = np.abs(z) > z_threshold
+        counts[m] = int(hit.sum())
+        ids.append(rows["id"][mask][hit])
+        metric_idx.append(np.full(counts[m], i))
+        raw.append(v[hit])
+        scores.append(z[hit])
+    items: List[Dict[str, Any]] = []
+    if ids:
+        ids_a, metric_a, raw_a, z_a = (np.concatenate(a) for a in (ids, metric_idx, raw, scores))
+        top = np.argsort(-np.abs(z_a), kind="stable")[:MAX_OUTLIER_ITEMS]
+        items = [
+            {"id": int(ids_a[k]), "metric": METRICS[metric_a[k]], "value": _num(raw_a[k]), "z": _num(z_a[k])}
+            for k in top
+        ]
+    return {"z_threshold": z_threshold, "counts": counts, "items": items}
+
+
+def _group_medians(codes: Any, values: Any, n_groups: int) -> Any:
+    """
+    Median of `values` per group code, NaN for empty groups. Sorts by value,
+    then stably by group code (a radix sort when codes fit in 16 bits), which is
+    several times faster than np.lexsort on large jobs.
+    """
+    order = np.argsort(values)
+    group_codes = codes[order].astype(np.uint16) if n_groups <= 1 << 16 else codes[order]
+    order = order[np.argsort(group_codes, kind="stable")]
+    sorted_values = values[order]
+    sizes = np.bincount(codes, minlength=n_groups)
+    starts = np.cumsum(sizes) - sizes
+    medians = np.full(n_groups, np.nan)
+    has = sizes > 0
+    lo = starts[has] + (sizes[has] - 1) // 2
+    hi = starts[has] + sizes[has] // 2
+    medians[has] = (sorted_values[lo] + sorted_values[hi]) / 2
+    return medians
+
+
+def _factorise(keys: Any) -> Tuple[Any, Any]:
+    """
+    Dense group codes for hash keys, plus one row index per group. One unstable
+    argsort; np.unique(return_index=True) needs a stable one and is ~1.7x slower.
+    """
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    starts = np.empty(keys.size, dtype=bool)
+    starts[:1] = True
+    np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=starts[1:])
+    codes = np.empty(keys.size, dtype=np.intp)
+    codes[order] = np.cumsum(starts) - 1
+    return order[starts], codes
+
+
+def _groups(rows: Any, values: Dict[str, Tuple[Any, Any]], group_by: str, limit: int,
+            label_lookup: LabelLookup) -> Dict[str, Any]:
+    first, codes = _factorise(rows[f"{group_by}_key"])
+    n = first.size
+    count = np.bincount(codes, minlength=n)
+    agg: Dict[str, Any] = {"count": count}
+    for m in COUNT_METRICS:
+        mask, v = values[m]
+        agg[f"total_{m}"] = np.bincount(codes[mask], weights=v, minlength=n)
+    views_mask, views = values["views"]
+    agg["median_views"] = _group_medians(codes[views_mask], views, n)
+    rate_mask, rates = values["engagement_rate"]
+    rate_n = np.bincount(codes[rate_mask], minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        agg["mean_engagement_rate"] = np.bincount(codes[rate_mask], weights=rates, minlength=n) / rate_n
+    agg["median_engagement_rate"] = _group_medians(codes[rate_mask], rates, n)
+
+    present = np.flatnonzero(count)
+    ranked = present[np.argsort(-count[present], kind="stable")][:limit]
+    row_ids = [int(rows["id"][first[g]]) for g in ranked]
+    labels = label_lookup(group_by, row_ids)
+    items = [
+        {
+            "key": labels.get(row_id),
+            "count": int(count[g]),
+            **{f"total_{m}": int(agg[f"total_{m}"][g]) for m in COUNT_METRICS},
+            "median_views": _num(agg["median_views"][g]),
+            "mean_engagement_rate": _num(agg["mean_engagement_rate"][g]),
+            "median_engagement_rate": _num(agg["median_engagement_rate"][g]),
+        }
+        for g, row_id in zip(ranked, row_ids)
+    ]
+    return {"total_groups": int(present.size), "items": items}
+
+
+def analyse_rows(rows: Any, label_lookup: LabelLookup, *,
+                 bins: int = 20, z_threshold: float = 3.0, group_by: str = "platform",
+                 group_limit: int = 50) -> Dict[str, Any]:
+    """
+    All analytics for one job's record array (see parse_copy_binary).
+    label_lookup names the listed groups from one row id each.
+    """
+    values = _metric_values(rows)
+    return {
+        "rows": int(rows.size),
+        "metrics": {
+            m: _distribution(values[m][1], bins=bins, log_bins=m in COUNT_METRICS) for m in METRICS
+        },
+        "outliers": _outliers(rows, values, z_threshold),
+        "groups": {"by": group_by, **_groups(rows, values, group_by, group_limit, label_lookup)},
+    }
+
+
+class _AnalyticsCache:
+    """Thread-safe LRU of analytics keyed by (job version, parameters)."""
+
+    def __init__(self, maxsize: int = MAX_CACHED_ANALYTICS) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Tuple[Any, ...], value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+analytics_cache = _AnalyticsCache()
+
+
+def get_job_analytics(
+    db: Session,
+    job_id: UUID,
+    *,
+    bins: int = 20,
+    z_threshold: float = 3.0,
+    group_by: str = "platform",
+    group_limit: int = 50,
+) -> Optional[Dict[str, Any]]:
+    """
+    Distribution analytics for a job's successful results, or None if the job
+    does not exist. Completed jobs are computed once per parameter set; the
+    cache key includes the job version, so a changed job is never served stale.
+    """
+    require_numpy()
+    version = get_job_version(db, job_id=job_id)
+    if not version:
+        return None
+    job_version, status = version
+    key = (job_version, bins, z_threshold, group_by, group_limit)
+    if status == "completed" and (cached := analytics_cache.get(key)) is not None:
+        return cached
+
+    rows = _load_columns(db, job_id)
+    data = {
+        "job_id": str(job_id),
+        "status": status,
+        **analyse_rows(rows, _label_lookup(db), bins=bins, z_threshold=z_threshold,
+                       group_by=group_by, group_limit=group_limit),
+    }
+    if status == "completed":
+        analytics_cache.put(key, data)
+    return data
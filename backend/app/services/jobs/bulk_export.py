@@ -0,0 +1,141 @@
+"""
+Multi-job exports: one merged file, or a ZIP archive with one entry per job.
+
+Jobs are read one after another, each from its own server-side cursor
+(_iter_result_batches), and the output is produced as it is read. The ZIP is
+written by zipfile into a non-seekable _ChunkSink, so entries use data
+descriptors and the archive is never held in memory or written to disk;
+only the central directory (a few hundred bytes per job) is kept until the end.
+"""
+from __future__ import annotations
+
+import zipfile
+from datetime import datetime
+from itertools import chain
+from typing import Any, Iterator, List, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import Job
+from app.services.jobs.export import (
+    EXPORT_COLUMNS,
+    _export_source_names,
+    _iter_csv,
+    _iter_result_batches,
+)
+from app.services.jobs.export_formats import EXPORT_FORMATS, _ChunkSink, require_format
+from app.services.jobs.queries import InvalidFields, parse_fields
+
+# Upper bound on jobs per export request.
+MAX_EXPORT_JOBS = 500
+# Compressed ZIP bytes are sent once at least this much is buffered.
+ZIP_CHUNK_SIZE = 64 * 1024
+
+_WRITERS = {"csv": (_iter_csv, "text/csv; charset=utf-8"), **EXPORT_FORMATS}
+# Formats that are already compressed are stored, not deflated again.
+_STORED_FORMATS = {"xlsx", "parquet"}
+
+
+def select_export_jobs(
+    db: Session,
+    *,
+    job_ids: Optional[Sequence[UUID]] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> List[UUID]:
+    """
+    Resolve the jobs to export. Explicit `job_ids` must all exist and be
+    completed (404/409 like the single-job export) and keep their order;
+    otherwise every completed, listed job created in the time range is used, oldest first.
+    """
+    if job_ids:
+        job_ids = list(dict.fromkeys(job_ids))
+        if len(job_ids) > MAX_EXPORT_JOBS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_EXPORT_JOBS} jobs per export")
+        statuses = dict(db.execute(select(Job.id, Job.status).where(Job.id.in_(job_ids))).all())
+        for job_id in job_ids:
+            if job_id not in statuses:
+                raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+            if statuses[job_id] != "completed":
+                raise HTTPException(status_code=409, detail=f"Job not completed: {job_id} status={statuses[job_id]}")
+        return job_ids
+
+    if created_after is None and created_before is None:
+        raise HTTPException(status_code=400, detail="Give job_ids or a created_after/created_before range")
+    stmt = select(Job.id).where(Job.status == "completed", Job.internal.is_(False))
+    if created_after is not None:
+        stmt = stmt.where(Job.created_at >= created_after)
+    if created_before is not None:
+        stmt = stmt.where(Job.created_at <= created_before)
+    found = list(db.scalars(stmt.order_by(Job.created_at.asc(), Job.id.asc()).limit(MAX_EXPORT_JOBS + 1)))
+    if len(found) > MAX_EXPORT_JOBS:
+        raise HTTPException(status_code=400, detail=f"More than {MAX_EXPORT_JOBS} jobs match; narrow the range")
+    if not found:
+        raise HTTPException(status_code=404, detail="No completed jobs match")
+    return found
+
+
+def _iter_merged(job_ids: Sequence[UUID], fmt: str, source_names: Sequence[str],
+                 columns: Sequence[str], where: Sequence[Any]) -> Iterator[bytes]:
+    """One file for all jobs: the per-job cursors are chained into a single writer."""
+    writer, _media_type = _WRITERS[fmt]
+    batches = chain.from_iterable(_iter_result_batches(j, source_names, where) for j in job_ids)
+    return writer(batches, source_names, columns)
+
+
+def _iter_zip(job_ids: Sequence[UUID], fmt: str, source_names: Sequence[str],
+              columns: Sequence[str], where: Sequence[Any]) -> Iterator[bytes]:
+    """ZIP with one `job_<id>_results.<fmt>` entry per job, yielded as it is compressed."""
+    writer, _media_type = _WRITERS[fmt]
+    compression = zipfile.ZIP_STORED if fmt in _STORED_FORMATS else zipfile.ZIP_DEFLATED
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=compression) as zf:
+        for job_id in job_ids:
+            # Size is unknown up front, so allow ZIP64 for large entries.
+            with zf.open(f"job_{job_id}_results.{fmt}", mode="w", force_zip64=True) as entry:
+                for chunk in writer(_iter_result_batches(job_id, source_names, where), source_names, columns):
+                    entry.write(chunk)
+                    if sink.buffered() >= ZIP_CHUNK_SIZE:
+                        yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()
+
+
+def export_jobs(
+    job_ids: Sequence[UUID],
+    fmt: str,
+    *,
+    archive: str = "zip",
+    fields: Optional[str] = None,
+    where: Sequence[Any] = (),
+) -> StreamingResponse:
+    """
+    Stream results of several completed jobs as one merged file (`archive="merged"`,
+    with a leading job_id column) or a ZIP of per-job files. `fields` selects
+    EXPORT_COLUMNS as in the single-job export; `where` filters rows.
+    """
+    try:
+        columns = parse_fields(fields, EXPORT_COLUMNS) or EXPORT_COLUMNS
+    except InvalidFields as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    require_format(fmt)
+
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if archive == "merged":
+        columns = ["job_id", *columns]
+        source_names = _export_source_names(columns)
+        body = _iter_merged(job_ids, fmt, source_names, columns, where)
+        media_type, filename = _WRITERS[fmt][1], f"results_{stamp}.{fmt}"
+    else:
+        source_names = _export_source_names(columns)
+        body = _iter_zip(job_ids, fmt, source_names, columns, where)
+        media_type, filename = "application/zip", f"results_{stamp}.zip"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,137 @@
+"""
+Cross-job channel leaderboard backed by the channel_stats materialised view.
+
+Reads never touch `results`: GET /channels is a keyset scan over one of the
+view's rank indexes. The view is refreshed CONCURRENTLY (readers keep seeing
+the previous contents) shortly after jobs complete; completions that land
+within CHANNEL_STATS_REFRESH_DELAY_SECONDS of each other share one refresh.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import get_channel_stats_refresh_delay_seconds
+from app.db.models import ChannelStats
+from app.db.session import SessionLocal
+from app.services.jobs.filters import InvalidSort
+from app.services.jobs.queries import InvalidCursor, _decode_cursor, _encode_cursor
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_SORT_KEYS = ("total_views", "video_count", "median_views", "mean_engagement_rate")
+
+
+def refresh_channel_stats(db: Session) -> None:
+    """Recompute channel_stats without blocking readers. Does not commit."""
+    db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY channel_stats"))
+
+
+def _refresh_now() -> None:
+    db = SessionLocal()
+    try:
+        refresh_channel_stats(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.warning("Refreshing channel_stats failed", exc_info=True)
+    finally:
+        db.close()
+
+
+_pending_lock = threading.Lock()
+_pending: Optional[threading.Timer] = None
+
+
+def _run_pending_refresh() -> None:
+    global _pending
+    with _pending_lock:
+        _pending = None # completions from here on schedule a new refresh
+    _refresh_now()
+
+
+def schedule_channel_stats_refresh() -> None:
+    """
+    Refresh channel_stats after the configured delay, unless a refresh is
+    already scheduled (which will include this job's rows). A delay of 0
+    refreshes inline.
+    """
+    global _pending
+    delay = get_channel_stats_refresh_delay_seconds()
+    if delay <= 0:
+        _refresh_now()
+        return
+    with _pending_lock:
+        if _pending is not None:
+            return
+        _pending = threading.Timer(delay, _run_pending_refresh)
+        _pending.daemon = True
+        _pending.start()
+
+
+def _channel_to_dict(row: ChannelStats) -> Dict[str, Any]:
+    return {
+        "platform": row.platform,
+        "channel": row.channel,
+        "video_count": row.video_count,
+        "total_views": row.total_views,
+        "total_likes": row.total_likes,
+        "total_comments": row.total_comments,
+        "median_views": row.median_views,
+        "mean_engagement_rate": row.mean_engagement_rate,
+        "latest_published_at": row.latest_published_at.isoformat() if row.latest_published_at else None,
+    }
+
+
+def list_channels(
+    db: Session,
+    *,
+    sort: str = "total_views",
+    platform: Optional[str] = None,
+    min_videos: int = 1,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Channels ranked by `sort` (descending), keyset-paged on
+    (sort value, platform, channel) via the matching ix_channel_stats_* index.
+    """
+    if sort not in CHANNEL_SORT_KEYS:
+        raise InvalidSort(f"Unsupported sort: {sort}. Allowed: {', '.join(CHANNEL_SORT_KEYS)}")
+    col = getattr(ChannelStats, sort)
+    key = tuple_(col, ChannelStats.platform, ChannelStats.channel)
+
+    stmt = select(ChannelStats).where(ChannelStats.video_count >= min_videos)
+    if platform is not None:
+        stmt = stmt.where(ChannelStats.platform == platform)
+    if cursor:
+        c = _decode_cursor(cursor)
+        try:
+            if c["sort"] != sort:
+                raise ValueError("cursor belongs to a different sort")
+            value = float(c["v"]) if sort in ("median_views", "mean_engagement_rate") else int(c["v"])
+            after = (value, str(c["p"]), str(c["c"]))
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+        stmt = stmt.where(key < after)
+
+    rows: List[ChannelStats] = db.scalars(
+        stmt.order_by(col.desc(), ChannelStats.platform.desc(), ChannelStats.channel.desc()).limit(limit + 1)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = _encode_cursor({"sort": sort, "v": getattr(last, sort), "p": last.platform, "c": last.channel})
+    return {
+        "limit": limit,
+        "sort": sort,
+        "items": [_channel_to_dict(r) for r in rows],
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,211 @@
+"""
+Live job progress: Postgres NOTIFY on the write side, one LISTEN connection
+per API process fanned out to Server-Sent Events subscribers on the read side.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Set
+from uuid import UUID
+
+import psycopg
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.models import Result
+from app.db.session import engine
+from app.services.jobs.queries import _result_to_dict
+
+logger = logging.getLogger(__name__)
+
+JOB_EVENTS_CHANNEL = "job_events"
+TERMINAL_STATUSES = {"completed", "failed"}
+HEARTBEAT_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 1000
+# How long a new stream waits for the LISTEN connection before loading its snapshot.
+LISTEN_READY_TIMEOUT_SECONDS = 5
+# NOTIFY payloads must stay under 8000 bytes (encoded); long free-text fields are
+# clipped, and a row that still does not fit is sent as its id only.
+MAX_NOTIFY_BYTES = 7900
+MAX_TEXT_FIELD = 1000
+_TEXT_FIELDS = ("title", "error_message", "url", "channel")
+
+
+def _encode_event(event: Dict[str, Any]) -> str:
+    payload = json.dumps(event, default=str, separators=(",", ":"), ensure_ascii=False)
+    if len(payload.encode()) < MAX_NOTIFY_BYTES or "result" not in event:
+        return payload
+    # Too large even after clipping (multi-byte text): clients fetch the row by id.
+    slim = {**event, "result": {"id": event["result"].get("id")}, "truncated": True}
+    return json.dumps(slim, default=str, separators=(",", ":"))
+
+
+def notify_job_event(db: Session, event: Dict[str, Any]) -> None:
+    """
+    Queue a job event on the caller's transaction.
+
+    Postgres delivers NOTIFY only when the transaction commits, so listeners
+    never see progress for rows that were rolled back. The NOTIFY runs in a
+    savepoint: if it fails, the event is dropped and the caller's work is kept.
+    """
+    try:
+        with db.begin_nested():
+            db.execute(select(func.pg_notify(JOB_EVENTS_CHANNEL, _encode_event(event))))
+    except Exception:
+        logger.warning("Dropping job event for job %s", event.get("job_id"), exc_info=True)
+
+
+def result_event(job_id: UUID, row: Result, *, processed_rows: int, total_rows: int) -> Dict[str, Any]:
+    item = _result_to_dict(row)
+    for key in _TEXT_FIELDS:
+        if item.get(key) and len(item[key]) > MAX_TEXT_FIELD:
+            item[key] = item[key][:MAX_TEXT_FIELD]
+    return {
+        "type": "result",
+        "job_id": str(job_id),
+        "processed_rows": processed_rows,
+        "total_rows": total_rows,
+        "result": item,
+    }
+
+
+def status_event(job_id: UUID, status: str, *, processed_rows: int, total_rows: int) -> Dict[str, Any]:
+    return {
+        "type": "status",
+        "job_id": str(job_id),
+        "status": status,
+        "processed_rows": processed_rows,
+        "total_rows": total_rows,
+    }
+
+
+class JobEventBroadcaster:
+    """
+    Holds a single LISTEN connection and fans notifications out to in-process
+    subscriber queues keyed by job id. Started lazily on first subscribe and
+    reconnects with a short backoff; after a reconnect subscribers receive a
+    "resync" event because notifications sent while disconnected are lost.
+    wait_ready() lets a new subscriber wait until LISTEN is in effect.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+
+    def subscribe(self, job_id: UUID) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(str(job_id), set()).add(queue)
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._ready = asyncio.Event()
+            self._task = loop.create_task(self._listen(self._ready))
+        return queue
+
+    async def wait_ready(self, timeout: float = LISTEN_READY_TIMEOUT_SECONDS) -> bool:
+        """Wait until the LISTEN connection is registered; False on timeout (e.g. database down)."""
+        if self._ready is None:
+            return False
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def unsubscribe(self, job_id: UUID, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(str(job_id))
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[str(job_id)]
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _dispatch(self, event: Dict[str, Any], job_id: Optional[str] = None) -> None:
+        targets = (
+            self._subscribers.get(job_id, set()) if job_id is not None
+            else {q for queues in self._subscribers.values() for q in queues}
+        )
+        for queue in list(targets):
+            if queue.full(): # slow consumer: drop its oldest event rather than block everyone
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def _listen(self, ready: asyncio.Event) -> None:
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        connected_before = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as conn:
+                    await conn.execute(f"LISTEN {JOB_EVENTS_CHANNEL}")
+                    ready.set()
+                    if connected_before:
+                        self._dispatch({"type": "resync"})
+                    connected_before = True
+                    async for notification in conn.notifies():
+                        try:
+                            event = json.loads(notification.payload)
+                        except ValueError:
+                            continue
+                        self._dispatch(event, event.get("job_id"))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                ready.clear()
+                logger.warning("Job event listener disconnected; reconnecting", exc_info=True)
+                await asyncio.sleep(1)
+
+
+broadcaster = JobEventBroadcaster()
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str, separators=(',', ':'))}\n\n"
+
+
+async def stream_job_events(job_id: UUID, snapshot_loader, is_disconnected) -> AsyncIterator[str]:
+    """
+    SSE body for one viewer: a "snapshot" of the job, then live "result" and
+    "status" events until the job finishes or the client goes away.
+
+    Subscribes, and waits for LISTEN to be in effect, before loading the
+    snapshot so no event can fall in between. Should one be missed anyway (the
+    listener reconnecting), each heartbeat re-checks the job and the stream
+    ends with a "status" event once it is finished.
+    """
+    queue = broadcaster.subscribe(job_id)
+    try:
+        await broadcaster.wait_ready()
+        snapshot = await snapshot_loader()
+        yield _sse("snapshot", snapshot)
+        if snapshot.get("status") in TERMINAL_STATUSES:
+            return
+        while not await is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                current = await snapshot_loader()
+                if current and current.get("status") in TERMINAL_STATUSES:
+                    yield _sse("status", status_event(
+                        job_id, current["status"],
+                        processed_rows=current.get("processed_rows"), total_rows=current.get("total_rows"),
+                    ))
+                    return
+                yield ": ping\n\n" # comment line keeps proxies from closing an idle stream
+                continue
+            yield _sse(event.get("type", "message"), event)
+            if event.get("type") == "status" and event.get("status") in TERMINAL_STATUSES:
+                return
+    finally:
+        broadcaster.unsubscribe(job_id, queue)
@@ -0,0 +1,254 @@
+"""
+Pre-rendered CSV exports for completed jobs.
+
+A completed job's rows do not change, so its default CSV export is rendered
+once into a gzip file under EXPORT_CACHE_DIR and then served from disk:
+gzip-accepting clients get the file as-is (Content-Encoding: gzip, with
+Content-Length and HTTP Range/If-Range via FileResponse), others get it
+decompressed on the fly. File names carry the job version, so a job row that
+changes (e.g. a rerun) never serves a stale file; mark_job_running also
+deletes the job's files eagerly. File names also carry the decompressed size,
+so identity responses know their Content-Length (and serve byte ranges) without
+the gzip trailer, which only holds the size modulo 4 GiB. The cache is bounded
+by EXPORT_CACHE_MAX_BYTES: each render evicts the least recently served files
+past it.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.compression import accepts_encoding
+from app.core.config import get_export_cache_dir, get_export_cache_max_bytes
+from app.core.http_cache import cache_control_for_status, etag_matches, make_etag
+from app.db.session import SessionLocal
+from app.services.jobs.export import (
+    CSV_CHUNK_SIZE,
+    EXPORT_COLUMNS,
+    _export_source_names,
+    _iter_csv,
+    _iter_result_batches,
+    require_completed_job,
+)
+from app.services.jobs.queries import get_job_version
+
+logger = logging.getLogger(__name__)
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+GZIP_LEVEL = 6
+
+
+def _cache_dir() -> Optional[Path]:
+    raw = get_export_cache_dir()
+    return Path(raw) if raw else None
+
+
+def _export_prefix(job_id: UUID, version: str) -> str:
+    digest = hashlib.sha256(version.encode()).hexdigest()[:16]
+    return f"{job_id}-{digest}"
+
+
+def _find_export(cache_dir: Path, job_id: UUID, version: str) -> Optional[Tuple[Path, int]]:
+    """The rendered file for this job version and its decompressed size, if present."""
+    for path in cache_dir.glob(f"{_export_prefix(job_id, version)}-*.csv.gz"):
+        size = path.name.removesuffix(".csv.gz").rsplit("-", 1)[1]
+        if size.isdigit():
+            return path, int(size)
+    return None
+
+
+def invalidate_export_cache(job_id: UUID, *, keep: Optional[Path] = None) -> None:
+    """Delete a job's pre-rendered exports (all versions except `keep`)."""
+    cache_dir = _cache_dir()
+    if cache_dir is None or not cache_dir.is_dir():
+        return
+    for path in cache_dir.glob(f"{job_id}-*.csv.gz"):
+        if path != keep:
+            path.unlink(missing_ok=True)
+
+
+def evict_export_cache(cache_dir: Path, *, keep: Optional[Path] = None) -> None:
+    """
+    Delete the least recently used exports (by mtime, which serving bumps)
+    until the cache fits EXPORT_CACHE_MAX_BYTES. `keep` is never evicted.
+    """
+    max_bytes = get_export_cache_max_bytes()
+    if max_bytes <= 0:
+        return
+    entries = []
+    for path in cache_dir.glob("*.csv.gz"):
+        try:
+            st = path.stat()
+        except FileNotFoundError: # evicted or replaced concurrently
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def _touch(path: Path) -> None:
+    """Mark a served export as recently used (atime is unreliable under noatime mounts)."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def render_export_cache(job_id: UUID, version: str) -> Optional[Tuple[Path, int]]:
+    """
+    Render the job's default CSV export into the cache and return its path and
+    decompressed size (or None when caching is disabled). Already-rendered
+    versions are reused.
+
+    Writes to a temp file and renames it into place, so concurrent renders
+    and readers never see a partial file.
+    """
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return None
+    if cache_dir.is_dir() and (found := _find_export(cache_dir, job_id, version)) is not None:
+        _touch(found[0])
+        return found
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    source_names = _export_source_names(EXPORT_COLUMNS)
+    fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=f".{job_id}-", suffix=".tmp")
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=GZIP_LEVEL, mtime=0) as gz:
+            for chunk in _iter_csv(_iter_result_batches(job_id, source_names), source_names):
+                gz.write(chunk)
+                size += len(chunk)
+        path = cache_dir / f"{_export_prefix(job_id, version)}-{size}.csv.gz"
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    invalidate_export_cache(job_id, keep=path)
+    evict_export_cache(cache_dir, keep=path)
+    return path, size
+
+
+def prerender_export(job_id: UUID) -> None:
+    """Best-effort render right after a job completes; failures only cost a lazy render later."""
+    if _cache_dir() is None:
+        return
+    db = SessionLocal()
+    try:
+        version = get_job_version(db, job_id=job_id)
+        if version and version[1] == "completed":
+            render_export_cache(job_id, version[0])
+    except Exception:
+        logger.warning("Pre-rendering export for job %s failed", job_id, exc_info=True)
+    finally:
+        db.close()
+
+
+def _byte_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    The single `bytes=` range asked for, as inclusive (start, end), or None to
+    send the whole body (no Range, or a multi-range/malformed one, which RFC 9110
+    lets a server ignore). Raises 416 when the range holds no byte of the body.
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    first, sep, last = range_header[len("bytes="):].strip().partition("-")
+    if not sep or not (first or last) or (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+    if not first: # suffix range: the last N bytes
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _iter_gunzip(path: Path, start: int = 0, length: Optional[int] = None) -> Iterator[bytes]:
+    """Decompressed bytes from `start` (skipped by decompressing, gzip cannot seek), `length` of them."""
+    with gzip.open(path, "rb") as f:
+        if start:
+            f.seek(start)
+        remaining = length
+        while remaining is None or remaining > 0:
+            chunk = f.read(CSV_CHUNK_SIZE if remaining is None else min(CSV_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+def cached_export_response(
+    db: Session, job_id: UUID, *, accept_encoding: str, if_none_match: Optional[str],
+    range_header: Optional[str] = None, if_range: Optional[str] = None,
+) -> Optional[Response]:
+    """
+    Serve a completed job's default export from the cache, rendering it first
+    if needed. Returns None when caching is disabled. Raises HTTPException
+    like export_job_results_csv. Only the job row is read once the file exists,
+    and a matching If-None-Match is answered before any render.
+
+    Both representations resume: gzip via FileResponse, identity by
+    decompressing up to the requested range (honouring If-Range).
+    """
+    if _cache_dir() is None:
+        return None
+    require_completed_job(db, job_id)
+    version, _status = get_job_version(db, job_id=job_id)
+
+    gzipped = accepts_encoding(accept_encoding, "gzip")
+    headers = {
+        # The gzip file and the decoded body are different representations.
+        "ETag": make_etag(version, "export.csv", "gzip" if gzipped else "identity"),
+        "Cache-Control": cache_control_for_status("completed"),
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    rendered = render_export_cache(job_id, version)
+    if rendered is None:
+        return None
+    path, size = rendered
+
+    filename = f"job_{job_id}_results.csv"
+    if gzipped:
+        return FileResponse(
+            path,
+            media_type=CSV_MEDIA_TYPE,
+            filename=filename,
+            headers={**headers, "Content-Encoding": "gzip"},
+        )
+    headers.update({
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Accept-Ranges": "bytes",
+    })
+    # If-Range: resume only if the client's copy is this one; else send it all.
+    byte_range = _byte_range(range_header, size) if not if_range or if_range == headers["ETag"] else None
+    if byte_range is None:
+        return StreamingResponse(_iter_gunzip(path), media_type=CSV_MEDIA_TYPE,
+                                 headers={**headers, "Content-Length": str(size)})
+    start, end = byte_range
+    return StreamingResponse(
+        _iter_gunzip(path, start, end - start + 1),
+        status_code=206,
+        media_type=CSV_MEDIA_TYPE,
+        headers={**headers, "Content-Length": str(end - start + 1), "Content-Range": f"bytes {start}-{end}/{size}"},
+    )
@@ -0,0 +1,227 @@
+"""
+Non-CSV export formats: NDJSON, XLSX and Parquet.
+
+Every writer consumes the same cursor batches as the CSV export
+(_iter_result_batches) and yields bytes, so memory is bounded by one batch
+(NDJSON), one row group (Parquet) or openpyxl's write-only temp file (XLSX),
+never by the size of the job.
+"""
+from __future__ import annotations
+
+import io
+import tempfile
+from datetime import timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from openpyxl import Workbook
+from sqlalchemy.orm import Session
+
+from app.core.fast_json import dumps
+from app.services.jobs.export import (
+    CSV_CHUNK_SIZE,
+    EXPORT_COLUMNS,
+    _export_source_names,
+    _iter_result_batches,
+    require_completed_job,
+)
+from app.services.jobs.queries import InvalidFields, parse_fields
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception: # pyarrow is optional; Parquet exports are rejected without it
+    pa = None
+    pq = None
+
+# Rows buffered per Parquet row group.
+PARQUET_ROW_GROUP_SIZE = 64_000
+# Excel's sheet limit is 1,048,576 rows; one is the header.
+XLSX_MAX_ROWS_PER_SHEET = 1_048_575
+# XLSX is assembled in memory up to this size, then spills to a temp file.
+XLSX_SPOOL_SIZE = 8 * 1024 * 1024
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only, non-seekable file object that buffers written bytes until
+    drained. Lets writers that expect a file (ParquetWriter, zipfile) feed a
+    streaming response; tell() keeps counting across drains.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._size = 0
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = bytes(b)
+        self._chunks.append(data)
+        self._size += len(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def buffered(self) -> int:
+        return self._size
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        self._size = 0
+        return out
+
+
+# Typed (not CSV-formatted) values per export column for a whole batch.
+_TYPED_VALUES: Dict[str, Callable[[Dict[str, Sequence[Any]]], Sequence[Any]]] = {
+    "job_id": lambda b: [str(j) for j in b["job_id"]],
+}
+
+
+def _typed_columns(batch: Sequence[Any], source_names: Sequence[str], columns: Sequence[str]) -> List[Sequence[Any]]:
+    """Column-major typed values for one batch of cursor rows."""
+    by_name = dict(zip(source_names, zip(*batch)))
+    return [_TYPED_VALUES[c](by_name) if c in _TYPED_VALUES else by_name[c] for c in columns]
+
+
+def iter_ndjson(batches: Iterable[Sequence[Any]], source_names: Sequence[str],
+                columns: Sequence[str] = EXPORT_COLUMNS) -> Iterator[bytes]:
+    """One JSON object per row, newline-terminated, in ~CSV_CHUNK_SIZE chunks."""
+    buf = bytearray()
+    for batch in batches:
+        if not batch:
+            continue
+        for values in zip(*_typed_columns(batch, source_names, columns)):
+            buf += dumps(dict(zip(columns, values)))
+            buf += b"\n"
+        if len(buf) >= CSV_CHUNK_SIZE:
+            yield bytes(buf)
+            buf.clear()
+    if buf:
+        yield bytes(buf)
+
+
+_PARQUET_TYPES: Dict[str, Any] = {
+    "views": "int64",
+    "likes": "int64",
+    "comments": "int64",
+    "published_at": "timestamp",
+    "engagement_rate": "float64",
+}
+
+
+def _parquet_schema(columns: Sequence[str]):
+    def arrow_type(name: str):
+        kind = _PARQUET_TYPES.get(name, "string")
+        if kind == "timestamp":
+            return pa.timestamp("us", tz="UTC")
+        return getattr(pa, kind)()
+
+    return pa.schema([(c, arrow_type(c)) for c in columns])
+
+
+def iter_parquet(batches: Iterable[Sequence[Any]], source_names: Sequence[str],
+                 columns: Sequence[str] = EXPORT_COLUMNS) -> Iterator[bytes]:
+    """Parquet file written in row groups of PARQUET_ROW_GROUP_SIZE; each group is sent once written."""
+    schema = _parquet_schema(columns)
+    sink = _ChunkSink()
+    pending: List[List[Any]] = [[] for _ in columns]
+    pending_rows = 0
+    wrote_group = False
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for batch in batches:
+            if not batch:
+                continue
+            for target, values in zip(pending, _typed_columns(batch, source_names, columns)):
+                target.extend(values)
+            pending_rows += len(batch)
+            if pending_rows >= PARQUET_ROW_GROUP_SIZE:
+                writer.write_table(pa.table(pending, schema=schema), row_group_size=pending_rows)
+                pending = [[] for _ in columns]
+                pending_rows = 0
+                wrote_group = True
+                yield sink.drain()
+        if pending_rows or not wrote_group: # an empty job still gets a valid (empty) file
+            writer.write_table(pa.table(pending, schema=schema), row_group_size=max(pending_rows, 1))
+    yield sink.drain()
+
+
+def _xlsx_value(value: Any) -> Any:
+    # Excel has no time zones: write UTC wall-clock time.
+    if getattr(value, "tzinfo", None) is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def iter_xlsx(batches: Iterable[Sequence[Any]], source_names: Sequence[str],
+              columns: Sequence[str] = EXPORT_COLUMNS) -> Iterator[bytes]:
+    """
+    XLSX via openpyxl write-only mode: rows go straight to a temp file per
+    sheet, and a new sheet starts every XLSX_MAX_ROWS_PER_SHEET rows. The zip
+    container can only be assembled at the end, so bytes flow once the
+    cursor is exhausted.
+    """
+    wb = Workbook(write_only=True)
+    ws = None
+    sheet_rows = XLSX_MAX_ROWS_PER_SHEET
+    for batch in batches:
+        if not batch:
+            continue
+        for values in zip(*_typed_columns(batch, source_names, columns)):
+            if sheet_rows >= XLSX_MAX_ROWS_PER_SHEET:
+                ws = wb.create_sheet(f"results_{len(wb.worksheets) + 1}" if wb.worksheets else "results")
+                ws.append(list(columns))
+                sheet_rows = 0
+            ws.append([_xlsx_value(v) for v in values])
+            sheet_rows += 1
+    if ws is None:
+        wb.create_sheet("results").append(list(columns))
+
+    with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_SIZE) as spool:
+        wb.save(spool)
+        spool.seek(0)
+        while chunk := spool.read(CSV_CHUNK_SIZE):
+            yield chunk
+
+
+EXPORT_FORMATS = {
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+    "xlsx": (iter_xlsx, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "parquet": (iter_parquet, "application/vnd.apache.parquet"),
+}
+
+
+def require_format(fmt: str) -> None:
+    """Raise 501 when an export format's optional dependency is missing."""
+    if fmt == "parquet" and pq is None:
+        raise HTTPException(status_code=501, detail="Parquet exports are not supported on this server.")
+
+
+def export_job_results(db: Session, job_id: UUID, fmt: str, *, fields: Optional[str] = None) -> StreamingResponse:
+    """
+    Export results of a completed job as NDJSON, XLSX or Parquet, streamed from a
+    server-side cursor. Same columns, `fields` handling and errors as the CSV export.
+    """
+    try:
+        columns = parse_fields(fields, EXPORT_COLUMNS) or EXPORT_COLUMNS
+    except InvalidFields as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    require_format(fmt)
+    require_completed_job(db, job_id)
+
+    writer, media_type = EXPORT_FORMATS[fmt]
+    source_names = _export_source_names(columns)
+    filename = f"job_{job_id}_results.{fmt}"
+    return StreamingResponse(
+        writer(_iter_result_batches(job_id, source_names), source_names, columns),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
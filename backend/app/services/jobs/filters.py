@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import ColumnElement, and_, tuple_
+
+from app.db.models import Result
+
+
+class InvalidSort(ValueError):
+    """Raised when a `sort=` value names an unsupported column or cannot be used."""
+
+
+@dataclass(frozen=True)
+class ResultFilters:
+    """
+    Server-side filters for a job's results. Unset fields do not filter.
+    Ranges are inclusive; engagement uses the stored (likes + comments) / views.
+    """
+    status: Optional[str] = None
+    platform: Optional[str] = None
+    channel: Optional[str] = None
+    min_views: Optional[int] = None
+    max_views: Optional[int] = None
+    min_engagement: Optional[float] = None
+    max_engagement: Optional[float] = None
+    published_after: Optional[datetime] = None
+    published_before: Optional[datetime] = None
+
+    def clauses(self) -> List[ColumnElement[bool]]:
+        out: List[ColumnElement[bool]] = []
+        if self.status is not None:
+            out.append(Result.status == self.status)
+        if self.platform is not None:
+            out.append(Result.platform == self.platform)
+        if self.channel is not None:
+            out.append(Result.channel == self.channel)
+        if self.min_views is not None:
+            out.append(Result.views >= self.min_views)
+        if self.max_views is not None:
+            out.append(Result.views <= self.max_views)
+        if self.min_engagement is not None:
+            out.append(Result.engagement_rate >= self.min_engagement)
+        if self.max_engagement is not None:
+            out.append(Result.engagement_rate <= self.max_engagement)
+        if self.published_after is not None:
+            out.append(Result.published_at >= self.published_after)
+        if self.published_before is not None:
+            out.append(Result.published_at <= self.published_before)
+        return out
+
+    def is_empty(self) -> bool:
+        return all(getattr(self, f.name) is None for f in fields(self))
+
+
+SORT_KEYS = ("views", "likes", "engagement_rate", "published_at")
+
+
+@dataclass(frozen=True)
+class ResultSort:
+    """
+    Ordering for a results page: `key` ascending or descending, rows without a
+    value last, then id in the same direction so keyset cursors are stable.
+    Keyset pages (see segments) read ix_results_job_*_desc in either direction;
+    offset pages past the first sort the job's rows.
+    """
+    key: str
+    descending: bool
+
+    @classmethod
+    def parse(cls, sort: Optional[str]) -> Optional["ResultSort"]:
+        """`views` sorts ascending, `-views` descending; None means id order."""
+        if not sort:
+            return None
+        key = sort.lstrip("-")
+        if key not in SORT_KEYS:
+            raise InvalidSort(f"Unsupported sort: {sort}. Allowed: {', '.join(SORT_KEYS)} (prefix '-' for descending)")
+        return cls(key=key, descending=sort.startswith("-"))
+
+    @property
+    def column(self) -> ColumnElement[Any]:
+        return getattr(Result, self.key)
+
+    def order_by(self) -> List[ColumnElement[Any]]:
+        if self.descending:
+            return [self.column.desc().nulls_last(), Result.id.desc()]
+        return [self.column.asc().nulls_last(), Result.id.asc()]
+
+    def segments(self, after: Optional[Tuple[Any, int]] = None) -> List[Tuple[ColumnElement[bool], List[ColumnElement[Any]]]]:
+        """
+        The rows following `after` = (value, last_id) in this order (all rows when
+        None) as (where, order_by) index ranges to read in turn: rows with a value,
+        then the trailing NULL block. Each is one plain range of the key's
+        ix_results_job_*_desc index, scanned backwards when ascending; an OR of
+        the two would make Postgres filter the job's rows from the index start.
+        """
+        col = self.column
+        if self.descending:
+            order = [col.desc().nulls_last(), Result.id.desc()]
+        else:
+            # Within one segment NULL placement changes nothing, and NULLS FIRST is the index's backward order.
+            order = [col.asc().nulls_first(), Result.id.asc()]
+        nulls = (col.is_(None), order)
+        if after is None:
+            return [(col.is_not(None), order), nulls]
+        value, last_id = after
+        if value is None: # already inside the trailing NULL block
+            return [(and_(col.is_(None), Result.id < last_id if self.descending else Result.id > last_id), order)]
+        beyond = (
+            tuple_(col, Result.id) < tuple_(value, last_id) if self.descending
+            else tuple_(col, Result.id) > tuple_(value, last_id)
+        )
+        return [(beyond, order), nulls]
+
+    def cursor_payload(self, value: Any, last_id: int) -> Dict[str, Any]:
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        return {"sort": self.key, "desc": self.descending, "v": value, "id": last_id}
+
+    def decode_cursor_value(self, payload: Dict[str, Any]) -> Any:
+        """Cursor value in this sort's type; raises ValueError/KeyError/TypeError if it does not fit."""
+        if payload["sort"] != self.key or bool(payload["desc"]) != self.descending:
+            raise ValueError("cursor belongs to a different sort")
+        value = payload["v"]
+        if value is None:
+            return None
+        if self.key == "published_at":
+            return datetime.fromisoformat(value)
+        if self.key == "engagement_rate":
+            return float(value)
+        return int(value)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import Job, Result
+from app.services.fetchers import canonical_video_id
+from app.services.upload.readers.ndjson_reader import link_item_to_row, ndjson_item_to_row
+from app.services.upload.utils import normalise_cell
+from app.services.upload.validators import validate_row
+
+LINK_BATCH_SIZE = 1000
+INVALID_PREVIEW_LIMIT = 20
+
+
+class LinkJobWriter:
+    """
+    Build a job from programmatically submitted {platform, url} items.
+
+    Items are validated with the same rules as file uploads and inserted in
+    Core batches of LINK_BATCH_SIZE, so memory stays bounded however many
+    links the client streams. Nothing is visible to other sessions until
+    finish() commits.
+    """
+
+    def __init__(self, db: Session, *, source_filename: Optional[str] = None) -> None:
+        self.db = db
+        self.job = Job(status="queued", source_filename=source_filename, total_rows=0, processed_rows=0)
+        db.add(self.job)
+        db.flush() # to get the job.id assigned
+
+        self.total_rows = 0
+        self.valid_rows = 0
+        self.invalid_preview: List[Dict[str, Any]] = []
+        self._pending: List[Dict[str, Any]] = []
+
+    def add_items(self, items: Iterable[Any]) -> None:
+        """Validate decoded JSON values (normally dicts) and queue the valid ones for insert."""
+        for item in items:
+            self._add_row(link_item_to_row(item))
+
+    def add_ndjson_lines(self, lines: Iterable[str]) -> None:
+        """Like add_items, but for raw NDJSON lines; blank lines are ignored."""
+        for line in lines:
+            if line.strip():
+                self._add_row(ndjson_item_to_row(line))
+
+    def _add_row(self, row: Dict[str, Any]) -> None:
+        self.total_rows += 1
+        platform, url, errors = validate_row(normalise_cell(row["platform"]), normalise_cell(row["url"]))
+        if errors:
+            if len(self.invalid_preview) < INVALID_PREVIEW_LIMIT:
+                self.invalid_preview.append({"row_index": self.total_rows, "error_messages": errors})
+            return
+
+        self.valid_rows += 1
+        self._pending.append({"job_id": self.job.id, "platform": platform, "url": url,
+                              "video_id": canonical_video_id(platform, url), "status": "queued"})
+        if len(self._pending) >= LINK_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert queued rows with a single executemany."""
+        if self._pending:
+            self.db.execute(insert(Result), self._pending)
+            self._pending = []
+
+    def finish(self) -> Dict[str, Any]:
+        """Flush remaining rows, finalise job totals and commit. Returns the upload-style summary."""
+        self.flush()
+        summary = {
+            "total_rows": self.total_rows,
+            "valid_rows": self.valid_rows,
+            "invalid_rows": self.total_rows - self.valid_rows,
+            "invalid_preview": self.invalid_preview,
+        }
+        self.job.total_rows = self.valid_rows
+        self.job.upload_summary = summary
+        self.db.commit()
+        return {
+            "job_id": str(self.job.id),
+            "filename": self.job.source_filename,
+            **summary,
+        }
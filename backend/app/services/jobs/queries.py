@@ -1,12 +1,45 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, text, tuple_
 from sqlalchemy.orm import Session
 
-from app.db.models import Job, Result
+from app.db.models import Job, JobStats, Result
+from app.services.jobs.filters import InvalidSort, ResultFilters, ResultSort
+
+
+# Below this many rows an exact COUNT(*) is cheap enough to run even in "estimated" mode.
+EXACT_COUNT_THRESHOLD = 10_000
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+class InvalidFields(ValueError):
+    """Raised when a `fields=` sparse fieldset names unknown columns."""
+
+
+def _encode_cursor(payload: Dict[str, Any]) -> str:
+    """Opaque, URL-safe cursor. Clients must treat it as a token, not parse it."""
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+    if not isinstance(payload, dict):
+        raise InvalidCursor(f"Invalid cursor: {cursor}")
+    return payload
 
 def _job_to_dict(job: Job) -> Dict[str, Any]:
     return {
@@ -35,26 +68,141 @@ def _result_to_dict(r: Result) -> Dict[str, Any]:
         "published_at": r.published_at.isoformat() if r.published_at else None,
         "engagement_rate": r.engagement_rate,
     }
-    
-def list_jobs(db: Session, *, limit: int=20, offset: int=0) -> Dict[str, Any]:
-    total = db.scalar(select(func.count()).select_from(Job)) or 0
-    stmt = (
-        select(Job)
-        .order_by(Job.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-    )
-    jobs: List[Job] = db.scalars(stmt).all()
+
+
+# Key order matches _result_to_dict so both paths encode to the same JSON.
+RESULT_COLUMNS = {
+    "id": Result.id,
+    "job_id": Result.job_id,
+    "platform": Result.platform,
+    "url": Result.url,
+    "channel": Result.channel,
+    "status": Result.status,
+    "error_message": Result.error_message,
+    "title": Result.title,
+    "views": Result.views,
+    "likes": Result.likes,
+    "comments": Result.comments,
+    "published_at": Result.published_at,
+    "engagement_rate": Result.engagement_rate,
+}
+_RESULT_KEYS = tuple(RESULT_COLUMNS)
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated `fields=` value into column names, in request
+    order without duplicates. Returns None (meaning "all columns") when unset.
+    """
+    if fields is None:
+        return None
+    allowed = list(allowed)
+    names = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [n for n in names if n not in allowed]
+    if unknown or not names:
+        raise InvalidFields(
+            f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}" if unknown
+            else "fields must name at least one column."
+        )
+    return names
+
+
+def _result_rows_to_dicts(rows, keys: Sequence[str] = _RESULT_KEYS) -> List[Dict[str, Any]]:
+    """
+    Core result rows -> items, without per-field conversion. job_id and
+    published_at stay UUID/datetime; app.core.fast_json encodes them.
+    zip() stops at the known keys, so trailing helper columns are ignored.
+    """
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def _count_jobs(db: Session, mode: str) -> Tuple[Optional[int], bool]:
+    """
+    Return (total, is_estimate) for the listed (non-internal) jobs.
+
+    - "exact": COUNT(*), a full scan.
+    - "estimated": the planner's reltuples estimate of the partial index
+      ix_jobs_listed_created_at_id (kept current by autovacuum/ANALYZE) once it
+      is past EXACT_COUNT_THRESHOLD rows; exact below it, or if never analysed.
+    - "none": skip counting entirely; callers rely on has_more.
+    """
+    if mode == "none":
+        return None, False
+    if mode == "estimated":
+        estimate = db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:index)"),
+            {"index": "ix_jobs_listed_created_at_id"},
+        )
+        if estimate is not None and estimate >= EXACT_COUNT_THRESHOLD:
+            return int(estimate), True
+    return db.scalar(select(func.count()).select_from(Job).where(Job.internal.is_(False))) or 0, False
+
+
+def list_jobs(
+    db: Session,
+    *,
+    limit: int=20,
+    offset: int=0,
+    cursor: Optional[str]=None,
+    count: str="estimated",
+) -> Dict[str, Any]:
+    """
+    Newest-first page of listed jobs (internal ones, e.g. single fetches, are left out).
+
+    With `cursor` (the previous page's next_cursor) the page is found by keyset
+    on (created_at, id) via ix_jobs_created_at_id, so cost does not grow with depth.
+    `offset` is still honoured when no cursor is given.
+    `count` selects how `total` is computed (see _count_jobs); has_more never
+    depends on it because one extra row is fetched instead.
+    """
+    total, total_is_estimate = _count_jobs(db, count)
+    stmt = select(Job).where(Job.internal.is_(False)).order_by(Job.created_at.desc(), Job.id.desc())
+    if cursor:
+        c = _decode_cursor(cursor)
+        try:
+            after = (datetime.fromisoformat(c["created_at"]), UUID(c["id"]))
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+        stmt = stmt.where(tuple_(Job.created_at, Job.id) < after)
+        offset = 0
+    else:
+        stmt = stmt.offset(offset)
+
+    jobs: List[Job] = db.scalars(stmt.limit(limit + 1)).all()
+    has_more = len(jobs) > limit
+    jobs = jobs[:limit]
     items = [_job_to_dict(j) for j in jobs]
+    next_cursor = (
+        _encode_cursor({"created_at": jobs[-1].created_at.isoformat(), "id": str(jobs[-1].id)})
+        if has_more else None
+    )
     return {
         "limit": limit,
         "offset": offset,
         "total": total,
-        "has_more": offset + len(items) < total,
+        "total_is_estimate": total_is_estimate,
+        "has_more": has_more,
+        "next_cursor": next_cursor,
         "items": items,
     }
     
 
+def get_job_version(db: Session, *, job_id: UUID) -> Tuple[str, str] | None:
+    """
+    Return (version, status) for conditional GETs, or None if the job does not exist.
+
+    The version changes whenever the job row is written, which process_job does
+    in the same transaction as every result update. Loading via db.get also
+    primes the identity map, so a following get_job_detail/list_job_results
+    does not query jobs again.
+    """
+    job = db.get(Job, job_id)
+    if not job:
+        return None
+    updated = job.updated_at.isoformat() if job.updated_at else ""
+    return f"{job.id}:{updated}:{job.processed_rows}:{job.status}", job.status
+
+
 def get_job_detail(db: Session, *, job_id: UUID) -> Dict[str, Any] | None:
     job = db.get(Job, job_id)
     if not job:
@@ -67,23 +215,139 @@ def list_job_results(
     job_id: UUID,
     limit: int=50,
     offset: int=0,
+    cursor: Optional[str]=None,
+    since: Optional[str]=None,
+    fields: Optional[List[str]]=None,
+    filters: Optional[ResultFilters]=None,
+    sort: Optional[ResultSort]=None,
 ) -> Dict[str, Any] | None:
+    """
+    Page of a job's results in id order, or in `sort` order when given.
+
+    With `cursor` the page starts after the last seen row (keyset on id, or on
+    (sort value, id) when sorted); otherwise `offset` is used.
+
+    With `since` (delta mode) only rows inserted or updated after that change
+    cursor are returned, in change order, via ix_results_job_id_change_seq.
+    An empty `since` starts from the beginning. The response always carries
+    `next_since`, which the client passes back on its next sync; rows of one
+    job are written by a single worker, so change_seq commits in order.
+
+    `fields` (see parse_fields) limits both the SELECT list and the items to
+    those columns; the paging key is fetched as extra trailing columns.
+    `filters` narrows every mode; `sort` cannot be combined with `since`.
+    """
     job = db.get(Job, job_id)
     if not job:
         return None
-    
-    stmt= (
-        select(Result)
-        .where(Result.job_id == job_id)
-        .order_by(Result.id.asc())
-        .offset(offset)
-        .limit(limit)
-    )
-    rows: List[Result] = db.scalars(stmt).all()
+
+    keys = fields or _RESULT_KEYS
+    columns = [RESULT_COLUMNS[k] for k in keys]
+    where = [Result.job_id == job_id, *(filters.clauses() if filters else [])]
+    if since is not None:
+        if sort is not None:
+            raise InvalidSort("sort cannot be combined with since.")
+        return _list_changed_results(db, job=job, limit=limit, since=since, keys=keys, columns=columns, where=where)
+
+    if sort is not None:
+        stmt = select(*columns, sort.column, Result.id).where(*where)
+    else:
+        stmt = select(*columns, Result.id).where(*where).order_by(Result.id.asc())
+    after = None
+    if cursor:
+        payload = _decode_cursor(cursor)
+        try:
+            after_id = int(payload["id"])
+            after = (sort.decode_cursor_value(payload), after_id) if sort else after_id
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+        offset = 0
+
+    if sort is not None and not offset:
+        # Keyset (or first) page: the valued rows, then the NULL block, each an index range.
+        rows = []
+        for clause, order_by in sort.segments(after):
+            rows += db.execute(stmt.where(clause).order_by(*order_by).limit(limit + 1 - len(rows))).all()
+            if len(rows) > limit:
+                break
+    else:
+        if sort is not None:
+            stmt = stmt.order_by(*sort.order_by())
+        if after is not None:
+            stmt = stmt.where(Result.id > after)
+        else:
+            stmt = stmt.offset(offset)
+        rows = db.execute(stmt.limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = _encode_cursor(sort.cursor_payload(last[-2], last[-1]) if sort else {"id": last[-1]})
     
     return{
         "job": _job_to_dict(job),
         "limit": limit,
         "offset": offset,
-        "items": [_result_to_dict(r) for r in rows],
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+        "items": _result_rows_to_dicts(rows, keys),
+    }
+
+
+def _list_changed_results(
+    db: Session, *, job: Job, limit: int, since: str, keys: Sequence[str], columns: List[Any],
+    where: List[Any],
+) -> Dict[str, Any]:
+    after_seq = 0
+    if since:
+        try:
+            after_seq = int(_decode_cursor(since)["seq"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidCursor(f"Invalid cursor: {since}") from e
+
+    rows = db.execute(
+        select(*columns, Result.change_seq)
+        .where(*where, Result.change_seq > after_seq)
+        .order_by(Result.change_seq.asc())
+        .limit(limit + 1)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        "job": _job_to_dict(job),
+        "limit": limit,
+        "has_more": has_more,
+        "next_since": _encode_cursor({"seq": rows[-1][-1] if rows else after_seq}),
+        "items": _result_rows_to_dicts(rows, keys),
+    }
+
+
+def _stats_to_dict(job: Job, stats: Optional[JobStats]) -> Dict[str, Any]:
+    success_rows = stats.success_rows if stats else 0
+    failed_rows = stats.failed_rows if stats else 0
+    return {
+        "success_rows": success_rows,
+        "failed_rows": failed_rows,
+        "pending_rows": max(0, (job.total_rows or 0) - success_rows - failed_rows),
+        "total_views": stats.total_views if stats else 0,
+        "total_likes": stats.total_likes if stats else 0,
+        "total_comments": stats.total_comments if stats else 0,
+        "mean_engagement_rate": (
+            stats.engagement_sum / stats.engagement_count if stats and stats.engagement_count else None
+        ),
+    }
+
+
+def get_job_summary(db: Session, *, job_id: UUID) -> Dict[str, Any] | None:
+    """Job detail plus its rollup: two primary-key lookups, independent of row count."""
+    job = db.get(Job, job_id)
+    if not job:
+        return None
+    stats = db.get(JobStats, job_id)
+    return {
+        "job": _job_to_dict(job),
+        "stats": _stats_to_dict(job, stats),
     }
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.db.models import Result
+from app.services.jobs.filters import ResultFilters
+from app.services.jobs.queries import (
+    RESULT_COLUMNS,
+    InvalidCursor,
+    _decode_cursor,
+    _encode_cursor,
+    _result_rows_to_dicts,
+)
+
+# pg_trgm indexes can only serve patterns with at least one full trigram.
+MIN_TRIGRAM_QUERY = 3
+MAX_QUERY_LENGTH = 200
+
+
+def _like_pattern(q: str) -> str:
+    """Substring ILIKE pattern with the user's wildcards escaped."""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def search_results(
+    db: Session,
+    *,
+    q: str,
+    job_id: Optional[UUID] = None,
+    filters: Optional[ResultFilters] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Search stored results across all jobs by title and channel, newest first.
+
+    A row matches when its words match `q` (search_vector @@ websearch_to_tsquery,
+    GIN index) or, for queries of 3+ characters, when title or channel contains
+    `q` as a substring (ILIKE served by the gin_trgm_ops indexes). Postgres
+    combines the indexes with a BitmapOr, so no full scan is needed.
+
+    Pages with an id keyset cursor. Raises ValueError for an empty query and
+    InvalidCursor for an undecodable cursor.
+    """
+    q = (q or "").strip()[:MAX_QUERY_LENGTH]
+    if not q:
+        raise ValueError("q is required.")
+
+    matches = [Result.search_vector.op("@@")(func.websearch_to_tsquery("simple", q))]
+    if len(q) >= MIN_TRIGRAM_QUERY:
+        pattern = _like_pattern(q)
+        matches += [Result.title.ilike(pattern, escape="\\"), Result.channel.ilike(pattern, escape="\\")]
+
+    where: List[Any] = [or_(*matches), *(filters.clauses() if filters else [])]
+    if job_id is not None:
+        where.append(Result.job_id == job_id)
+    if cursor:
+        try:
+            where.append(Result.id < int(_decode_cursor(cursor)["id"]))
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+    rows = db.execute(
+        select(*RESULT_COLUMNS.values())
+        .where(*where)
+        .order_by(Result.id.desc())
+        .limit(limit + 1)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        "q": q,
+        "limit": limit,
+        "has_more": has_more,
+        "next_cursor": _encode_cursor({"id": rows[-1].id}) if has_more else None,
+        "items": _result_rows_to_dicts(rows),
+    }
@@ -1,70 +1,294 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import insert, literal, select
 
+from app.core.config import get_upload_dedup_window_seconds
 from app.db.models import Job, Result
 from app.db.session import SessionLocal
 from app.services.upload import parse_upload
-from app.services.fetchers import get_fetcher
+from app.services.upload.batch import expand_uploads, parse_blobs_parallel
+from app.services.upload.utils import hash_upload
+from app.services.fetchers import canonical_video_id, fetch_cache, get_fetcher
+from app.services.jobs.channels import schedule_channel_stats_refresh
+from app.services.jobs.events import notify_job_event, result_event, status_event
+from app.services.jobs.export_cache import invalidate_export_cache, prerender_export
+from app.services.jobs.snapshots import record_snapshot, rollup_in_background
+from app.services.jobs.stats import engagement_rate, rebuild_job_stats, record_result
 
 import uuid
 from fastapi import HTTPException
 import time
 
 
-def creat_job_from_upload(db: Session, file) -> Dict[str, Any]:
+def _find_keyed_job(db: Session, *, idempotency_key: str, content_hash: str) -> Optional[Job]:
+    """Return the job created under `idempotency_key`, rejecting reuse of the key for other content."""
+    job = db.scalar(select(Job).where(Job.idempotency_key == idempotency_key))
+    if job and job.content_hash != content_hash:
+        raise HTTPException(
+            status_code=409,
+            detail="Idempotency-Key was already used for a different file.",
+        )
+    return job
+
+
+def _find_recent_duplicate(db: Session, *, content_hash: str) -> Optional[Job]:
+    """Return the newest job with identical upload bytes inside the dedup window, if any."""
+    window = get_upload_dedup_window_seconds()
+    if window <= 0:
+        return None
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=window)
+    return db.scalar(
+        select(Job)
+        .where(
+            Job.content_hash == content_hash,
+            Job.created_at >= cutoff,
+            Job.upload_summary.is_not(None),
+        )
+        .order_by(Job.created_at.desc())
+        .limit(1)
+    )
+
+
+def _clone_job(db: Session, source: Job, *, idempotency_key: Optional[str]) -> Job:
+    """
+    Copy a job and its result rows with a single INSERT ... SELECT.
+
+    Completed jobs are cloned with their fetched metrics; anything else is
+    cloned as a fresh queued job with only platform/url carried over.
+    """
+    completed = source.status == "completed"
+    job = Job(
+        status="completed" if completed else "queued",
+        source_filename=source.source_filename,
+        total_rows=source.total_rows,
+        processed_rows=source.processed_rows if completed else 0,
+        content_hash=source.content_hash,
+        idempotency_key=idempotency_key,
+        upload_summary=source.upload_summary,
+    )
+    db.add(job)
+    db.flush()
+
+    if completed:
+        copied = [Result.platform, Result.url, Result.video_id, Result.title, Result.views, Result.likes,
+                  Result.comments, Result.published_at, Result.fetched_at, Result.engagement_rate,
+                  Result.channel, Result.status, Result.error_message]
+    else:
+        copied = [Result.platform, Result.url, Result.video_id]
+    columns = ["job_id"] + [c.key for c in copied]
+    if not completed:
+        columns.append("status")
+
+    select_cols = [literal(job.id, type_=Result.job_id.type)] + copied
+    if not completed:
+        select_cols.append(literal("queued"))
+
+    db.execute(
+        insert(Result).from_select(
+            columns,
+            select(*select_cols).where(Result.job_id == source.id).order_by(Result.id.asc()),
+        )
+    )
+    if completed:
+        rebuild_job_stats(db, job.id)
+    return job
+
+
+def _upload_response(job: Job, summary: Dict[str, Any], **extra: Any) -> Dict[str, Any]:
+    return {
+        "job_id": str(job.id),
+        "filename": job.source_filename,
+        **summary,
+        **extra,
+    }
+
+
+def creat_job_from_upload(
+    db: Session,
+    file,
+    *,
+    idempotency_key: Optional[str] = None,
+    on_duplicate: str = "reuse",
+) -> Dict[str, Any]:
+    """
+    Create a queued job from an upload, short-circuiting duplicate uploads.
+
+    The upload is hashed before parsing. A repeated Idempotency-Key always
+    returns the job created under it. Otherwise, if the same bytes were seen
+    within the dedup window, `on_duplicate` decides:
+    - "reuse": return the existing job as-is (no parsing, no inserts)
+    - "clone": create a new job by copying the existing job's rows server-side
+    - "new":   ignore the duplicate and process the upload normally
+    """
     source_filename = (file.filename or "").strip() or None
+    content_hash = hash_upload(file)
+
+    if idempotency_key:
+        keyed = _find_keyed_job(db, idempotency_key=idempotency_key, content_hash=content_hash)
+        if keyed:
+            return _upload_response(keyed, keyed.upload_summary or {}, duplicate_of=str(keyed.id))
+
+    if on_duplicate != "new":
+        existing = _find_recent_duplicate(db, content_hash=content_hash)
+        if existing and on_duplicate == "clone":
+            clone = _clone_job(db, existing, idempotency_key=idempotency_key)
+            db.commit()
+            return _upload_response(clone, clone.upload_summary, duplicate_of=str(existing.id))
+        if existing:
+            return _upload_response(existing, existing.upload_summary, duplicate_of=str(existing.id))
+
     parsed = parse_upload(file) # This should return a dict with keys 'total_rows' and 'data'
-    
+    summary, valid_rows = _summarise_parsed(parsed)
+
+    try:
+        job = _insert_job(
+            db,
+            source_filename=source_filename,
+            valid_rows=valid_rows,
+            summary=summary,
+            content_hash=content_hash,
+            idempotency_key=idempotency_key,
+        )
+        db.commit() # commit the transaction to persist Job and Result entries
+    except IntegrityError:
+        # A concurrent request with the same Idempotency-Key won the race; return its job.
+        db.rollback()
+        existing = db.scalar(select(Job).where(Job.idempotency_key == idempotency_key)) if idempotency_key else None
+        if not existing:
+            raise
+        return _upload_response(existing, existing.upload_summary or summary, duplicate_of=str(existing.id))
+
+    return _upload_response(job, summary)
+
+
+def _summarise_parsed(parsed: Dict[str, Any]) -> Tuple[Dict[str, Any], List[dict]]:
+    """Split parse_upload output into the client-facing summary and the valid rows to insert."""
     rows: List[dict] = parsed["rows"]
     valid_rows = [r for r in rows if not r.get("error_messages")] # Assuming error_messages is a list of strings if there are validation errors
     invalid_rows = [r for r in rows if r.get("error_messages")]
-    
+
+    summary = {
+        "total_rows": parsed["total_rows"],
+        "valid_rows": len(valid_rows),
+        "invalid_rows": len(invalid_rows),
+        "invalid_preview": [
+            {
+                "row_index": r["row_index"],
+                "error_messages": r.get("error_messages", []),
+            }
+            for r in invalid_rows[:20] # include a preview of the first 20 invalid rows with their error messages
+        ],
+    }
+    return summary, valid_rows
+
+
+def _insert_job(
+    db: Session,
+    *,
+    source_filename: Optional[str],
+    valid_rows: List[dict],
+    summary: Dict[str, Any],
+    content_hash: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
+) -> Job:
+    """Add a queued Job plus one queued Result per valid row. Flushes but does not commit."""
     job = Job(
         status="queued",
         source_filename=source_filename,
         total_rows=len(valid_rows),
         processed_rows=0,
+        content_hash=content_hash,
+        idempotency_key=idempotency_key,
+        upload_summary=summary,
     )
-    
+
     db.add(job)
     db.flush() # to get the job.id assigned
-    
+
     results = [
         Result(
             job_id = job.id,
             platform = r["platform"],
             url = r["url"],
+            video_id = canonical_video_id(r["platform"], r["url"]),
             status = "queued",
             error_message = None,
         )
         for r in valid_rows # only create Result entries for valid rows
     ]
-    
+
     if results:
         db.add_all(results) # add all results to the session at once
-        
-    db.commit() # commit the transaction to persist Job and Result entries
-    
-    
+    return job
+
+
+def create_jobs_from_batch(db: Session, files: List[Any], *, merge: bool = False) -> Dict[str, Any]:
+    """
+    Create jobs from several uploads (or ZIP archives) in one request.
+
+    Files are parsed in parallel across a process pool. With merge=False one
+    job is created per file; with merge=True all valid rows go into a single
+    job. Files that fail to parse are reported and skipped. All jobs are
+    committed together.
+    """
+    blobs = expand_uploads(files)
+    outcomes = parse_blobs_parallel(blobs)
+
+    file_summaries: List[Dict[str, Any]] = []
+    merged_rows: List[dict] = []
+    for outcome in outcomes:
+        if "error" in outcome:
+            file_summaries.append({
+                "filename": outcome["filename"],
+                "error": outcome["error"],
+                "status_code": outcome["status_code"],
+            })
+            continue
+
+        summary, valid_rows = _summarise_parsed(outcome["parsed"])
+        entry: Dict[str, Any] = {"filename": outcome["filename"], **summary}
+        if merge:
+            merged_rows.extend(valid_rows)
+        else:
+            job = _insert_job(
+                db,
+                source_filename=outcome["filename"],
+                valid_rows=valid_rows,
+                summary=summary,
+                content_hash=outcome["content_hash"],
+            )
+            entry["job_id"] = str(job.id)
+        file_summaries.append(entry)
+
+    parsed_files = [f for f in file_summaries if "error" not in f]
+    merged_job: Optional[Job] = None
+    if merge and parsed_files:
+        names = [f["filename"] for f in parsed_files]
+        source_filename = names[0] if len(names) == 1 else f"{names[0]} (+{len(names) - 1} more)"
+        merged_summary = {
+            "total_rows": sum(f["total_rows"] for f in parsed_files),
+            "valid_rows": sum(f["valid_rows"] for f in parsed_files),
+            "invalid_rows": sum(f["invalid_rows"] for f in parsed_files),
+            "invalid_preview": [],
+        }
+        merged_job = _insert_job(db, source_filename=source_filename, valid_rows=merged_rows, summary=merged_summary)
+
+    db.commit()
+
     return {
-        "job_id": str(job.id),
-        "filename": job.source_filename,
-        "total_rows": parsed["total_rows"],
-        "valid_rows": len(valid_rows),
-        "invalid_rows": len(invalid_rows),
-        "invalid_preview": [
-            {
-                "row_index": r["row_index"],
-                "error_messages": r.get("error_messages", []),
-            }
-            for r in invalid_rows[:20] # include a preview of the first 20 invalid rows with their error messages
-        ]
+        "merged": merge,
+        "job_id": str(merged_job.id) if merged_job else None,
+        "job_ids": [f["job_id"] for f in parsed_files if "job_id" in f],
+        "file_count": len(file_summaries),
+        "failed_files": len(file_summaries) - len(parsed_files),
+        "files": file_summaries,
     }
-    
-    
+
+
 def process_job(db: Session, job_id: uuid.UUID) -> Dict[str, int]:
     """Process rows one-by-one, committing after each so polling shows live progress."""
     results = db.scalars(
@@ -79,6 +303,7 @@ def process_job(db: Session, job_id: uuid.UUID) -> Dict[str, int]:
     failed_rows = 0
     for i, row in enumerate(results, start=1):
         fetch_result = get_fetcher(row.platform).fetch(row.url)
+        row.fetched_at = datetime.now(timezone.utc)
         if fetch_result["ok"]:
             row.title = fetch_result["title"]
             row.views = fetch_result["views"]
@@ -86,18 +311,25 @@ def process_job(db: Session, job_id: uuid.UUID) -> Dict[str, int]:
             row.comments = fetch_result["comments"]
             row.published_at = fetch_result["published_at"]
             row.channel = fetch_result.get("channel")
+            row.engagement_rate = engagement_rate(row.views, row.likes, row.comments)
             row.status = "success"
             row.error_message = None
             success_rows += 1
+            fetch_cache.put(fetch_result) # lets GET /fetch answer for this URL without refetching
+            record_snapshot(db, platform=row.platform, url=row.url, views=row.views, likes=row.likes,
+                            comments=row.comments, job_id=job_id)
         else:
             row.status = "failed"
             row.error_message = fetch_result["error_message"]
             row.channel = None
             failed_rows += 1
 
+        record_result(db, job_id, fetch_result) # keep the job_stats rollup in step with this row
+
         # Commit after each row so polling can see partial progress
         if job:
             job.processed_rows = i
+            notify_job_event(db, result_event(job_id, row, processed_rows=i, total_rows=job.total_rows))
         db.commit()
 
     return {
@@ -143,7 +375,9 @@ def mark_job_running(db: Session, job_id: uuid.UUID) -> Dict[str,Any]:
         raise HTTPException(status_code=409, detail=f"Job is already finished:{job_id}")
     
     job.status = "running"
+    notify_job_event(db, status_event(job.id, job.status, processed_rows=job.processed_rows, total_rows=job.total_rows))
     db.commit()
+    invalidate_export_cache(job.id) # any pre-rendered export is about to go stale
     
     return {
         "job_id": str(job.id),
@@ -162,12 +396,17 @@ def run_job_in_background(job_id: uuid.UUID) -> None:
         summary = process_job(db, job_id)
         job.processed_rows = summary["processed_rows"]
         job.status = "completed"
+        notify_job_event(db, status_event(job_id, job.status, processed_rows=job.processed_rows, total_rows=job.total_rows))
         db.commit()
+        prerender_export(job_id)
+        schedule_channel_stats_refresh()
+        rollup_in_background()
     except Exception:
         db.rollback()
         job = db.get(Job, job_id)
         if job:
             job.status = "failed"
+            notify_job_event(db, status_event(job_id, job.status, processed_rows=job.processed_rows, total_rows=job.total_rows))
             db.commit()
             
     finally:
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_fetch_cache_ttl_seconds, get_fetch_timeout_seconds
+from app.db.models import Job, Result
+from app.db.session import SessionLocal
+from app.services.fetchers import FetchResult, canonical_video_id, detect_platform, fetch_cache, get_fetcher
+from app.services.jobs.snapshots import record_snapshot
+from app.services.jobs.stats import engagement_rate, record_result
+from app.services.upload.validators import SUPPORTED_PLATFORMS, normalise_platform
+
+logger = logging.getLogger(__name__)
+
+SINGLE_FETCH_SOURCE = "single-fetch"
+
+# Inline fetches run here so the request can give up after the timeout;
+# a timed-out fetch keeps its thread until the fetcher itself returns.
+_fetch_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="single-fetch")
+
+
+def _stored_result(db: Session, *, platform: str, url: str, max_age_seconds: int) -> Optional[FetchResult]:
+    """Most recent successful stored fetch for this URL within max_age (uses ix_results_url_fetched_at)."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_age_seconds)
+    row = db.execute(
+        select(Result.platform, Result.url, Result.channel, Result.title, Result.views,
+               Result.likes, Result.comments, Result.published_at)
+        .where(
+            Result.url == url,
+            Result.platform == platform,
+            Result.status == "success",
+            Result.fetched_at >= cutoff,
+        )
+        .order_by(Result.fetched_at.desc())
+        .limit(1)
+    ).first()
+    if row is None:
+        return None
+    return FetchResult(ok=True, error_message=None, **row._asdict())
+
+
+def fetch_single_url(db: Session, url: str, *, platform: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Resolve one URL's metrics, cheapest source first:
+    in-process cache -> fresh stored result -> live fetcher call (bounded by FETCH_TIMEOUT_SECONDS).
+
+    Returns the FetchResult fields plus "source" ("cache" | "stored" | "live").
+    A live result still needs persisting; see persist_fetch_result.
+    """
+    url = (url or "").strip()
+    if not url:
+        raise HTTPException(status_code=400, detail="url is required.")
+
+    platform = normalise_platform(platform) or detect_platform(url)
+    if not platform:
+        raise HTTPException(status_code=400, detail=f"Could not detect platform for url: {url}")
+    if platform not in SUPPORTED_PLATFORMS:
+        raise HTTPException(status_code=400, detail=f"Unsupported platform: {platform}")
+
+    cached = fetch_cache.get(platform, url)
+    if cached is not None:
+        return {**cached, "source": "cache"}
+
+    ttl = get_fetch_cache_ttl_seconds()
+    if ttl > 0:
+        stored = _stored_result(db, platform=platform, url=url, max_age_seconds=ttl)
+        if stored is not None:
+            fetch_cache.put(stored)
+            return {**stored, "source": "stored"}
+
+    fetcher = get_fetcher(platform)
+    future = _fetch_executor.submit(fetcher.fetch, url)
+    try:
+        result: FetchResult = future.result(timeout=get_fetch_timeout_seconds())
+    except FutureTimeoutError:
+        raise HTTPException(status_code=504, detail=f"Timed out fetching {platform} metrics for url: {url}")
+
+    fetch_cache.put(result)
+    return {**result, "source": "live"}
+
+
+def persist_fetch_result(result: FetchResult) -> None:
+    """
+    Background task: store a live single fetch as a completed one-row internal
+    job, so later lookups and the metric history can use it; internal jobs stay
+    out of job listings, bulk exports and the channel leaderboard.
+    """
+    fetched_at = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        job = Job(status="completed", source_filename=SINGLE_FETCH_SOURCE, total_rows=1, processed_rows=1,
+                  internal=True)
+        db.add(job)
+        db.flush()
+        db.add(Result(
+            job_id=job.id,
+            platform=result["platform"],
+            url=result["url"],
+            video_id=canonical_video_id(result["platform"], result["url"]),
+            channel=result.get("channel"),
+            title=result.get("title"),
+            views=result.get("views"),
+            likes=result.get("likes"),
+            comments=result.get("comments"),
+            published_at=result.get("published_at"),
+            fetched_at=fetched_at,
+            engagement_rate=engagement_rate(result.get("views"), result.get("likes"), result.get("comments")) if result["ok"] else None,
+            status="success" if result["ok"] else "failed",
+            error_message=result.get("error_message"),
+        ))
+        record_result(db, job.id, result)
+        if result["ok"]:
+            record_snapshot(db, platform=result["platform"], url=result["url"], views=result.get("views"),
+                            likes=result.get("likes"), comments=result.get("comments"), job_id=job.id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.warning("Persisting single fetch of %s failed", result.get("url"), exc_info=True)
+    finally:
+        db.close()
@@ -0,0 +1,302 @@
+"""
+Metric history: append-only snapshots, hourly/daily rollups and chart series.
+
+Every successful fetch appends a MetricSnapshot keyed by canonical video id.
+rollup_metric_snapshots() folds new snapshots into metric_rollups (the last
+value per video per UTC hour, and per day from the hours) starting from a
+stored high-water mark, so each run only reads what arrived since the last
+one. Series reads use the rollups up to that mark and the raw snapshots
+after it, so charts are current without scanning history.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models import MetricRollup, MetricRollupState, MetricSnapshot, Result
+from app.db.session import SessionLocal
+from app.services.fetchers import canonical_video_id
+from app.services.jobs.stats import engagement_rate
+
+logger = logging.getLogger(__name__)
+
+RESOLUTIONS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+# Snapshots committed this long after their captured_at are still rolled up.
+ROLLUP_LAG = timedelta(minutes=5)
+# Monthly partitions are created this many months ahead of the current one.
+PARTITION_MONTHS_AHEAD = 2
+MAX_SERIES_POINTS = 5000
+# Serialises rollup runs across processes (pg_try_advisory_xact_lock key).
+_ROLLUP_LOCK_KEY = 0x6D6D6C01
+
+
+class InvalidSeriesRange(ValueError):
+    """Raised when a series request has an unknown resolution or too many points."""
+
+
+def record_snapshot(db: Session, *, platform: str, url: str, views: Optional[int], likes: Optional[int],
+                    comments: Optional[int], job_id: Optional[UUID] = None) -> None:
+    """Append one point for a successful fetch, in the caller's transaction."""
+    db.add(MetricSnapshot(
+        video_id=canonical_video_id(platform, url),
+        views=views,
+        likes=likes,
+        comments=comments,
+        engagement_rate=engagement_rate(views, likes, comments),
+        job_id=job_id,
+    ))
+
+
+def _month_start(year: int, month: int) -> datetime:
+    year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def ensure_snapshot_partitions(db: Session, *, now: Optional[datetime] = None,
+                               months_ahead: int = PARTITION_MONTHS_AHEAD) -> None:
+    """Create the monthly metric_snapshots partitions up to `months_ahead` months from now."""
+    now = now or datetime.now(timezone.utc)
+    for i in range(months_ahead + 1):
+        start, end = _month_start(now.year, now.month + i), _month_start(now.year, now.month + i + 1)
+        try:
+            with db.begin_nested():
+                db.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS metric_snapshots_p{start:%Y%m} PARTITION OF metric_snapshots "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                ))
+        except Exception:
+            # Usually rows for that month already sit in the default partition.
+            logger.warning("Creating partition metric_snapshots_p%s failed", f"{start:%Y%m}", exc_info=True)
+
+
+def _floor(ts: datetime, resolution: str) -> datetime:
+    ts = ts.astimezone(timezone.utc)
+    if resolution == "day":
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def _latest_per_bucket(resolution: str, *where: Any):
+    """Last snapshot per (video_id, UTC bucket), with the number of snapshots in the bucket."""
+    s = MetricSnapshot
+    inner = (
+        select(
+            s.video_id,
+            func.date_trunc(resolution, s.captured_at, "UTC").label("bucket"),
+            s.views, s.likes, s.comments, s.engagement_rate, s.captured_at, s.id,
+        )
+        .where(*where)
+        .subquery()
+    )
+    c = inner.c
+    return (
+        select(
+            c.video_id, c.bucket, c.views, c.likes, c.comments, c.engagement_rate,
+            func.count().over(partition_by=(c.video_id, c.bucket)).label("samples"),
+        )
+        .distinct(c.video_id, c.bucket)
+        .order_by(c.video_id, c.bucket, c.captured_at.desc(), c.id.desc())
+    )
+
+
+def _upsert_rollups(db: Session, resolution: str, source) -> None:
+    columns = ["video_id", "bucket", "views", "likes", "comments", "engagement_rate", "samples"]
+    src = source.subquery()
+    stmt = pg_insert(MetricRollup).from_select(
+        ["resolution", *columns],
+        select(text(f"'{resolution}'"), *(src.c[col] for col in columns)),
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["video_id", "resolution", "bucket"],
+        set_={col: stmt.excluded[col] for col in columns[2:]},
+    ))
+
+
+def rollup_metric_snapshots(db: Session) -> Optional[datetime]:
+    """
+    Fold snapshots captured since the last run into hourly and daily rollups
+    and advance the high-water mark. Returns the new mark, or None when another
+    run holds the lock. Also keeps future monthly partitions in place. Does not commit.
+    """
+    if not db.scalar(select(func.pg_try_advisory_xact_lock(_ROLLUP_LOCK_KEY))):
+        return None
+    ensure_snapshot_partitions(db)
+
+    end = db.scalar(select(func.now()))
+    mark = db.scalar(select(MetricRollupState.rolled_up_to).where(MetricRollupState.resolution == "hour"))
+    hour_start = _floor(mark - ROLLUP_LAG, "hour") if mark else None
+
+    where = [MetricSnapshot.captured_at < end]
+    if hour_start is not None:
+        where.append(MetricSnapshot.captured_at >= hour_start)
+    _upsert_rollups(db, "hour", _latest_per_bucket("hour", *where))
+
+    # Days are rebuilt from their hours: the last hour's value and the summed sample counts.
+    h = MetricRollup
+    hours = select(
+        h.video_id, func.date_trunc("day", h.bucket, "UTC").label("day"), h.bucket,
+        h.views, h.likes, h.comments, h.engagement_rate, h.samples,
+    ).where(h.resolution == "hour")
+    if hour_start is not None:
+        hours = hours.where(h.bucket >= _floor(hour_start, "day"))
+    c = hours.subquery().c
+    days = (
+        select(
+            c.video_id, c.day.label("bucket"), c.views, c.likes, c.comments, c.engagement_rate,
+            func.sum(c.samples).over(partition_by=(c.video_id, c.day)).label("samples"),
+        )
+        .distinct(c.video_id, c.day)
+        .order_by(c.video_id, c.day, c.bucket.desc())
+    )
+    _upsert_rollups(db, "day", days)
+
+    for resolution in RESOLUTIONS:
+        stmt = pg_insert(MetricRollupState).values(resolution=resolution, rolled_up_to=end)
+        db.execute(stmt.on_conflict_do_update(index_elements=["resolution"], set_={"rolled_up_to": end}))
+    return end
+
+
+def rollup_in_background() -> None:
+    """Best-effort rollup with its own session (e.g. after a job completes)."""
+    db = SessionLocal()
+    try:
+        rollup_metric_snapshots(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.warning("Rolling up metric snapshots failed", exc_info=True)
+    finally:
+        db.close()
+
+
+def resolve_series_range(start: Optional[datetime], end: Optional[datetime],
+                         resolution: Optional[str]) -> Tuple[datetime, datetime, str]:
+    """Defaults: end = now, hourly for ranges up to 7 days (default start: 30 days back, daily)."""
+    end = end or datetime.now(timezone.utc)
+    if start is None:
+        start = end - (timedelta(days=7) if resolution == "hour" else timedelta(days=30))
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    if start >= end:
+        raise InvalidSeriesRange("start must be before end")
+    resolution = resolution or ("hour" if end - start <= timedelta(days=7) else "day")
+    if resolution not in RESOLUTIONS:
+        raise InvalidSeriesRange(f"Unsupported resolution: {resolution}. Allowed: {', '.join(RESOLUTIONS)}")
+    if (end - start) / RESOLUTIONS[resolution] > MAX_SERIES_POINTS:
+        raise InvalidSeriesRange(f"Range too long for resolution={resolution} (max {MAX_SERIES_POINTS} points)")
+    return start, end, resolution
+
+
+def _bucket_rows(db: Session, video_ids: Sequence[str], start: datetime, end: datetime,
+                 resolution: str) -> List[Any]:
+    """(video_id, bucket, views, likes, comments, engagement_rate) rows, rollups then the raw tail."""
+    mark = db.scalar(select(MetricRollupState.rolled_up_to).where(MetricRollupState.resolution == resolution))
+    tail_start = _floor(mark, resolution) if mark else start
+    tail_start = max(min(tail_start, end), start)
+
+    r = MetricRollup
+    rolled = db.execute(
+        select(r.video_id, r.bucket, r.views, r.likes, r.comments, r.engagement_rate)
+        .where(r.video_id.in_(video_ids), r.resolution == resolution, r.bucket >= start, r.bucket < tail_start)
+        .order_by(r.bucket, r.video_id)
+    ).all()
+    s = MetricSnapshot
+    raw = db.execute(
+        _latest_per_bucket(resolution, s.video_id.in_(video_ids), s.captured_at >= tail_start, s.captured_at < end)
+    ).all()
+    return [*rolled, *sorted(raw, key=lambda row: (row.bucket, row.video_id))]
+
+
+def _point(bucket: datetime, views: Any, likes: Any, comments: Any, rate: Any, **extra: Any) -> Dict[str, Any]:
+    return {"bucket": bucket.isoformat(), "views": views, "likes": likes, "comments": comments,
+            "engagement_rate": rate, **extra}
+
+
+def get_video_series(db: Session, video_id: str, *, start: Optional[datetime] = None,
+                     end: Optional[datetime] = None, resolution: Optional[str] = None) -> Dict[str, Any]:
+    """One video's metrics per bucket (the last value seen in each)."""
+    start, end, resolution = resolve_series_range(start, end, resolution)
+    rows = _bucket_rows(db, [video_id], start, end, resolution)
+    return {
+        "video_id": video_id,
+        "resolution": resolution,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "points": [_point(r.bucket, r.views, r.likes, r.comments, r.engagement_rate) for r in rows],
+    }
+
+
+def _seed_values(db: Session, video_ids: Sequence[str], start: datetime, resolution: str) -> Dict[str, Any]:
+    """Each video's last known value before `start`, so campaign totals do not dip at the left edge."""
+    r = MetricRollup
+    seeds = {
+        row.video_id: row for row in db.execute(
+            select(r.video_id, r.views, r.likes, r.comments)
+            .distinct(r.video_id)
+            .where(r.video_id.in_(video_ids), r.resolution == resolution, r.bucket < start)
+            .order_by(r.video_id, r.bucket.desc())
+        )
+    }
+    mark = db.scalar(select(MetricRollupState.rolled_up_to).where(MetricRollupState.resolution == resolution))
+    if mark is not None and _floor(mark, resolution) < start: # points between the mark and start are still raw
+        s = MetricSnapshot
+        seeds.update({
+            row.video_id: row for row in db.execute(
+                select(s.video_id, s.views, s.likes, s.comments)
+                .distinct(s.video_id)
+                .where(s.video_id.in_(video_ids), s.captured_at >= _floor(mark, resolution), s.captured_at < start)
+                .order_by(s.video_id, s.captured_at.desc(), s.id.desc())
+            )
+        })
+    return seeds
+
+
+def _sum(values: Iterable[Optional[int]]) -> int:
+    return sum(v or 0 for v in values)
+
+
+def get_campaign_series(db: Session, video_ids: Sequence[str], *, start: Optional[datetime] = None,
+                        end: Optional[datetime] = None, resolution: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Campaign series for a set of videos: per bucket, the sum over videos of each
+    one's latest value so far (carried forward across buckets without a fetch).
+    """
+    start, end, resolution = resolve_series_range(start, end, resolution)
+    latest: Dict[str, Any] = _seed_values(db, video_ids, start, resolution) if video_ids else {}
+    points: List[Dict[str, Any]] = []
+    rows = _bucket_rows(db, video_ids, start, end, resolution) if video_ids else []
+    i = 0
+    while i < len(rows):
+        bucket = rows[i].bucket
+        while i < len(rows) and rows[i].bucket == bucket:
+            latest[rows[i].video_id] = rows[i]
+            i += 1
+        views = _sum(v.views for v in latest.values())
+        likes = _sum(v.likes for v in latest.values())
+        comments = _sum(v.comments for v in latest.values())
+        points.append(_point(bucket, views, likes, comments, engagement_rate(views, likes, comments),
+                             videos=len(latest)))
+    return {
+        "video_count": len(video_ids),
+        "resolution": resolution,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "points": points,
+    }
+
+
+def get_job_series(db: Session, job_id: UUID, *, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None, resolution: Optional[str] = None) -> Dict[str, Any]:
+    """get_campaign_series over the job's videos."""
+    links = db.execute(select(Result.platform, Result.url).where(Result.job_id == job_id).distinct()).all()
+    video_ids = sorted({canonical_video_id(p, u) for p, u in links})
+    return {"job_id": str(job_id),
+            **get_campaign_series(db, video_ids, start=start, end=end, resolution=resolution)}
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Float, case, cast, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models import JobStats, Result
+from app.services.fetchers import FetchResult
+
+
+def engagement_rate(views: Optional[int], likes: Optional[int], comments: Optional[int]) -> Optional[float]:
+    """(likes + comments) / views, or None when views is missing or zero."""
+    if not views or views <= 0:
+        return None
+    return ((likes or 0) + (comments or 0)) / views
+
+
+def record_result(db: Session, job_id: UUID, fetch_result: FetchResult) -> None:
+    """
+    Fold one processed row into the job's rollup with a single upsert.
+
+    Runs inside the caller's transaction so the rollup commits together with
+    the Result row it describes.
+    """
+    ok = bool(fetch_result["ok"])
+    views = (fetch_result.get("views") or 0) if ok else 0
+    likes = (fetch_result.get("likes") or 0) if ok else 0
+    comments = (fetch_result.get("comments") or 0) if ok else 0
+    rate = engagement_rate(fetch_result.get("views"), likes, comments) if ok else None
+
+    values = {
+        "job_id": job_id,
+        "success_rows": 1 if ok else 0,
+        "failed_rows": 0 if ok else 1,
+        "total_views": views,
+        "total_likes": likes,
+        "total_comments": comments,
+        "engagement_sum": rate or 0.0,
+        "engagement_count": 1 if rate is not None else 0,
+    }
+    stmt = pg_insert(JobStats).values(**values)
+    t = JobStats.__table__.c
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[t.job_id],
+            set_={
+                **{k: t[k] + stmt.excluded[k] for k in values if k != "job_id"},
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+def rebuild_job_stats(db: Session, job_id: Optional[UUID] = None) -> int:
+    """
+    Recompute rollups from `results` with one set-based INSERT ... SELECT ... GROUP BY.
+
+    Rebuilds a single job when `job_id` is given, otherwise every job that has
+    results. Does not commit. Returns the number of rollup rows written.
+    """
+    success = Result.status == "success"
+    has_views = success & (Result.views > 0)
+    rate = (func.coalesce(Result.likes, 0) + func.coalesce(Result.comments, 0)) / cast(Result.views, Float)
+
+    agg = (
+        select(
+            Result.job_id,
+            func.count().filter(success).label("success_rows"),
+            func.count().filter(Result.status == "failed").label("failed_rows"),
+            func.coalesce(func.sum(case((success, Result.views), else_=0)), 0).label("total_views"),
+            func.coalesce(func.sum(case((success, Result.likes), else_=0)), 0).label("total_likes"),
+            func.coalesce(func.sum(case((success, Result.comments), else_=0)), 0).label("total_comments"),
+            func.coalesce(func.sum(case((has_views, rate), else_=None)), 0.0).label("engagement_sum"),
+            func.count().filter(has_views).label("engagement_count"),
+        )
+        .group_by(Result.job_id)
+    )
+    if job_id is not None:
+        agg = agg.where(Result.job_id == job_id)
+
+    columns = ["job_id", "success_rows", "failed_rows", "total_views", "total_likes",
+               "total_comments", "engagement_sum", "engagement_count"]
+    stmt = pg_insert(JobStats).from_select(columns, agg)
+    result = db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[JobStats.__table__.c.job_id],
+            set_={**{c: stmt.excluded[c] for c in columns if c != "job_id"}, "updated_at": func.now()},
+        )
+    )
+    return result.rowcount or 0
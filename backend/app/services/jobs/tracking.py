@@ -0,0 +1,356 @@
+"""
+Tracked link sets and the built-in refresh scheduler.
+
+A tracked link is stale once its last fetch is older than its staleness
+window: the set's refresh interval, shortened for recently published videos
+(their counts move fastest). Each link stores when it next falls due
+(next_due_at), so a scheduler tick reads only the due end of one index and
+its cost follows what has gone stale, not how much is tracked.
+
+Every tick takes an even share of the work: the budget is the refresh rate
+(each link once per staleness window, so recent videos count up to 4x) times
+the time since the last tick, with headroom for backlog. A large new set or a restart
+therefore drains over the period instead of in one burst. Claimed links are
+fetched straight into the metric history, without a job, by the one process
+holding the scheduler lock.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Connection, Float, case, cast, delete, func, select, type_coerce
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import get_refresh_scheduler_tick_seconds
+from app.db.models import TrackedLink, TrackedSet
+from app.db.session import SessionLocal, engine
+from app.services.fetchers import canonical_video_id, fetch_cache, get_fetcher
+from app.services.jobs.ingest import INVALID_PREVIEW_LIMIT, LINK_BATCH_SIZE
+from app.services.jobs.snapshots import get_campaign_series, record_snapshot, rollup_in_background
+from app.services.upload.readers.ndjson_reader import link_item_to_row
+from app.services.upload.utils import normalise_cell
+from app.services.upload.validators import validate_row
+
+logger = logging.getLogger(__name__)
+
+MIN_REFRESH_INTERVAL_SECONDS = 300
+# (video age, fraction of the interval): refreshed 4x as often in the first two days, 2x in the first week.
+RECENCY_WINDOWS = ((timedelta(days=2), 0.25), (timedelta(days=7), 0.5))
+# Ticks may claim this many times their even share, to absorb backlog (e.g. a restart).
+BUDGET_HEADROOM = 2.0
+# Only the process holding this session-level advisory lock runs the scheduler.
+_SCHEDULER_LOCK_KEY = 0x6D6D6C02
+
+
+def staleness_window(interval_seconds: int, published_at: Optional[datetime], now: datetime) -> timedelta:
+    """How long a fetch of this video stays fresh."""
+    interval = timedelta(seconds=interval_seconds)
+    if published_at is not None:
+        for age, fraction in RECENCY_WINDOWS:
+            if now - published_at < age:
+                return interval * fraction
+    return interval
+
+
+def _set_to_dict(tracked_set: TrackedSet) -> Dict[str, Any]:
+    return {
+        "set_id": str(tracked_set.id),
+        "name": tracked_set.name,
+        "refresh_interval_seconds": tracked_set.refresh_interval_seconds,
+        "link_count": tracked_set.link_count,
+        "created_at": tracked_set.created_at.isoformat() if tracked_set.created_at else None,
+    }
+
+
+def add_tracked_links(db: Session, tracked_set: TrackedSet, items: Iterable[Any]) -> Dict[str, Any]:
+    """
+    Validate {platform, url} items like job links and add the ones the set does
+    not track yet (matched by canonical video id). New links are due at once
+    and are picked up by the next ticks at the set's share of the budget. Commits.
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    invalid_preview: List[Dict[str, Any]] = []
+    total = valid = 0
+    for total, item in enumerate(items, start=1):
+        row = link_item_to_row(item)
+        platform, url, errors = validate_row(normalise_cell(row["platform"]), normalise_cell(row["url"]))
+        if errors:
+            if len(invalid_preview) < INVALID_PREVIEW_LIMIT:
+                invalid_preview.append({"row_index": total, "error_messages": errors})
+            continue
+        valid += 1
+        video_id = canonical_video_id(platform, url)
+        rows.setdefault(video_id, {"set_id": tracked_set.id, "platform": platform, "url": url, "video_id": video_id})
+
+    added = 0
+    values = list(rows.values())
+    for i in range(0, len(values), LINK_BATCH_SIZE):
+        stmt = pg_insert(TrackedLink).values(values[i:i + LINK_BATCH_SIZE]).on_conflict_do_nothing(
+            index_elements=["set_id", "video_id"],
+        )
+        added += len(db.execute(stmt.returning(TrackedLink.id)).all())
+    tracked_set.link_count = TrackedSet.link_count + added
+    db.commit()
+    db.refresh(tracked_set)
+    return {
+        **_set_to_dict(tracked_set),
+        "total_rows": total,
+        "added_links": added,
+        "invalid_rows": total - valid,
+        "invalid_preview": invalid_preview,
+    }
+
+
+def create_tracked_set(db: Session, *, name: str, refresh_interval_seconds: int, links: Iterable[Any]) -> Dict[str, Any]:
+    tracked_set = TrackedSet(name=name, refresh_interval_seconds=refresh_interval_seconds, link_count=0)
+    db.add(tracked_set)
+    db.flush()
+    return add_tracked_links(db, tracked_set, links)
+
+
+def list_tracked_sets(db: Session) -> Dict[str, Any]:
+    sets = db.scalars(select(TrackedSet).order_by(TrackedSet.created_at.desc(), TrackedSet.id.desc())).all()
+    return {"items": [_set_to_dict(s) for s in sets]}
+
+
+def get_tracked_set(db: Session, set_id: UUID) -> Optional[Dict[str, Any]]:
+    """The set with its refresh state: stale and never-fetched links, last and next refresh."""
+    tracked_set = db.get(TrackedSet, set_id)
+    if tracked_set is None:
+        return None
+    link = TrackedLink
+    stale, never_fetched, last_fetched, next_due = db.execute(
+        select(
+            func.count().filter(link.next_due_at <= func.now()),
+            func.count().filter(link.last_fetched_at.is_(None)),
+            func.max(link.last_fetched_at),
+            func.min(link.next_due_at),
+        ).where(link.set_id == set_id)
+    ).one()
+    return {
+        **_set_to_dict(tracked_set),
+        "stale_links": stale,
+        "never_fetched_links": never_fetched,
+        "last_fetched_at": last_fetched.isoformat() if last_fetched else None,
+        "next_due_at": next_due.isoformat() if next_due else None,
+    }
+
+
+def delete_tracked_set(db: Session, set_id: UUID) -> bool:
+    deleted = db.execute(delete(TrackedSet).where(TrackedSet.id == set_id)).rowcount
+    db.commit()
+    return bool(deleted)
+
+
+def get_tracked_set_series(db: Session, set_id: UUID, **kwargs: Any) -> Optional[Dict[str, Any]]:
+    """get_campaign_series over the set's videos (start/end/resolution as there)."""
+    if db.get(TrackedSet, set_id) is None:
+        return None
+    video_ids = db.scalars(select(TrackedLink.video_id).where(TrackedLink.set_id == set_id)).all()
+    return {"set_id": str(set_id), **get_campaign_series(db, video_ids, **kwargs)}
+
+
+def refresh_rate(db: Session, now: datetime) -> float:
+    """
+    Links per second the tracked sets need: each link once per staleness window.
+    The per-set base rate (link_count / interval) needs no scan of the links; the
+    extra for recent videos reads only links published within the longest recency
+    window (ix_tracked_links_published_at).
+    """
+    base = db.scalar(select(
+        func.sum(cast(TrackedSet.link_count, Float) / type_coerce(TrackedSet.refresh_interval_seconds, Float))
+    ))
+    # A video refreshed every fraction of the interval needs 1/fraction - 1 extra refreshes per interval.
+    extra_per_interval = case(
+        *((TrackedLink.published_at > now - age, 1.0 / fraction - 1.0) for age, fraction in RECENCY_WINDOWS),
+        else_=0.0,
+    )
+    recent = db.scalar(
+        select(func.sum(extra_per_interval / type_coerce(TrackedSet.refresh_interval_seconds, Float)))
+        .select_from(TrackedLink)
+        .join(TrackedSet, TrackedSet.id == TrackedLink.set_id)
+        .where(TrackedLink.published_at > now - RECENCY_WINDOWS[-1][0])
+    )
+    return float(base or 0.0) + float(recent or 0.0)
+
+
+def _tick_budget(db: Session, now: datetime, elapsed_seconds: float) -> int:
+    """Links to claim this tick: the refresh rate over the elapsed time, with headroom for backlog."""
+    return max(1, math.ceil(refresh_rate(db, now) * elapsed_seconds * BUDGET_HEADROOM))
+
+
+def claim_stale_links(db: Session, *, elapsed_seconds: float) -> List[Tuple[int, str, str]]:
+    """
+    Claim up to one tick's budget of due links (never fetched first, then the
+    most recently published). Claimed links are pushed out by their staleness
+    window at once, so a failed fetch waits a full window and no link is claimed
+    twice. Returns (link id, platform, url) per link. Commits.
+    """
+    now = db.scalar(select(func.now()))
+    claimed = db.execute(
+        select(TrackedLink, TrackedSet.refresh_interval_seconds)
+        .join(TrackedSet, TrackedSet.id == TrackedLink.set_id)
+        .where(TrackedLink.next_due_at <= now)
+        .order_by(
+            TrackedLink.last_fetched_at.is_not(None),
+            TrackedLink.published_at.desc().nulls_last(),
+            TrackedLink.next_due_at,
+        )
+        .limit(_tick_budget(db, now, elapsed_seconds))
+    ).all()
+    for link, interval in claimed:
+        link.next_due_at = now + staleness_window(interval, link.published_at, now)
+    links = [(link.id, link.platform, link.url) for link, _ in claimed]
+    db.commit()
+    return links
+
+
+def refresh_link(db: Session, link_id: int, platform: str, url: str) -> bool:
+    """
+    Fetch one claimed link. On success, record a metric snapshot, stamp the
+    link and reschedule it from its (new) publish date. Returns whether the
+    fetch succeeded. Commits.
+    """
+    result = get_fetcher(platform).fetch(url)
+    if not result["ok"]:
+        return False
+    fetch_cache.put(result) # lets GET /fetch answer for this URL without refetching
+    record_snapshot(db, platform=platform, url=url, views=result["views"], likes=result["likes"],
+                    comments=result["comments"])
+    row = db.execute(
+        select(TrackedLink, TrackedSet.refresh_interval_seconds)
+        .join(TrackedSet, TrackedSet.id == TrackedLink.set_id)
+        .where(TrackedLink.id == link_id)
+    ).first()
+    if row is not None: # the set may have been deleted mid-tick; the snapshot still counts
+        link, interval = row
+        now = db.scalar(select(func.now()))
+        link.published_at = result["published_at"] or link.published_at
+        link.last_fetched_at = now
+        link.next_due_at = now + staleness_window(interval, link.published_at, now)
+    db.commit()
+    return True
+
+
+def run_refresh_tick(elapsed_seconds: float) -> int:
+    """
+    One scheduler tick: claim stale links and fetch them straight into the
+    metric history. No job is created, so refreshes stay out of job listings
+    and skip the job completion hooks. Returns how many links were claimed.
+    """
+    db = SessionLocal()
+    try:
+        links = claim_stale_links(db, elapsed_seconds=elapsed_seconds)
+        refreshed = 0
+        for link_id, platform, url in links:
+            try:
+                refreshed += refresh_link(db, link_id, platform, url)
+            except Exception:
+                db.rollback()
+                logger.warning("Refreshing tracked link %s failed", link_id, exc_info=True)
+    finally:
+        db.close()
+
+    if refreshed:
+        rollup_in_background()
+    return len(links)
+
+
+def try_scheduler_lock() -> Optional[Connection]:
+    """
+    A connection holding the scheduler's session-level advisory lock, or None
+    when another process holds it. Only the holder runs ticks, so each tick's
+    budget is claimed once however many workers run. Release with
+    release_scheduler_lock (the connection goes back to the pool).
+    """
+    conn = engine.connect()
+    try:
+        locked = conn.scalar(select(func.pg_try_advisory_lock(_SCHEDULER_LOCK_KEY)))
+        conn.commit()
+    except Exception:
+        conn.close()
+        raise
+    if locked:
+        return conn
+    conn.close()
+    return None
+
+
+def release_scheduler_lock(conn: Connection) -> None:
+    try:
+        conn.execute(select(func.pg_advisory_unlock(_SCHEDULER_LOCK_KEY)))
+        conn.commit()
+    except Exception:
+        conn.invalidate() # a dropped connection has released the lock already
+    finally:
+        conn.close()
+
+
+def _lock_alive(conn: Connection) -> bool:
+    """Whether the lock connection still works; the lock goes with it."""
+    try:
+        conn.execute(select(1))
+        conn.rollback()
+        return True
+    except Exception:
+        conn.invalidate()
+        conn.close()
+        return False
+
+
+class RefreshScheduler:
+    """
+    Daemon thread running run_refresh_tick every REFRESH_SCHEDULER_TICK_SECONDS,
+    in whichever process holds the scheduler lock. The others retry the lock
+    each tick and take over if the holder exits.
+    """
+
+    def __init__(self) -> None:
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        tick = get_refresh_scheduler_tick_seconds()
+        if tick <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(tick,), name="refresh-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self, tick: float) -> None:
+        lock: Optional[Connection] = None
+        last = time.monotonic()
+        try:
+            while not self._stop.wait(tick):
+                started = time.monotonic()
+                try:
+                    if lock is not None and not _lock_alive(lock):
+                        lock = None
+                    if lock is None:
+                        lock = try_scheduler_lock()
+                        last = started - tick # a new holder covers one tick; headroom absorbs the rest
+                    if lock is not None:
+                        # Budget by the real time since the last tick, which includes slow fetches.
+                        run_refresh_tick(started - last)
+                except Exception:
+                    logger.warning("Tracked link refresh tick failed", exc_info=True)
+                last = started
+        finally:
+            if lock is not None:
+                release_scheduler_lock(lock)
+
+
+refresh_scheduler = RefreshScheduler()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+import hashlib
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from app.services.upload.service import parse_upload
+from app.services.upload.utils import (
+    MAX_ARCHIVE_SIZE,
+    MAX_DECOMPRESSED_SIZE,
+    MAX_FILE_SIZE,
+    infer_extension,
+    looks_like_zip,
+)
+
+MAX_BATCH_FILES = 200
+
+# (filename, raw bytes, content_type) — plain tuples so they pickle cheaply to worker processes.
+UploadBlob = Tuple[str, bytes, Optional[str]]
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Lazily create the shared parsing pool (UPLOAD_PARSE_WORKERS, default: CPU count)."""
+    global _pool
+    if _pool is None:
+        raw = os.getenv("UPLOAD_PARSE_WORKERS")
+        workers = int(raw) if raw and raw.isdigit() and int(raw) > 0 else (os.cpu_count() or 1)
+        _pool = ProcessPoolExecutor(max_workers=workers)
+    return _pool
+
+
+def shutdown_parse_pool() -> None:
+    """Stop worker processes; called from the app lifespan on shutdown."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def expand_uploads(files: List[UploadFile]) -> List[UploadBlob]:
+    """
+    Turn the request's files into (filename, bytes, content_type) blobs.
+
+    Notes:
+    - A ZIP archive contributes one blob per member file; directories,
+      dotfiles and macOS resource forks are skipped.
+    - A file is an archive by its .zip extension; the content type is only
+      consulted when the name has no extension (an .xlsx is a ZIP too, and
+      some clients send it as application/zip).
+    - Archives are capped at MAX_ARCHIVE_SIZE as sent; member and total
+      uncompressed sizes are capped before any member is extracted.
+    """
+    blobs: List[UploadBlob] = []
+    for f in files:
+        filename = (f.filename or "").strip()
+        f.file.seek(0)
+        data = f.file.read()
+        ext = infer_extension(filename)
+        is_zip = ext == ".zip" or (not ext and looks_like_zip(f.content_type))
+        limit = MAX_ARCHIVE_SIZE if is_zip else MAX_FILE_SIZE
+        if len(data) > limit:
+            raise HTTPException(status_code=413, detail=f"File '{filename}' exceeds {limit} bytes.")
+        if is_zip:
+            blobs.extend(_expand_zip(filename, data))
+        else:
+            blobs.append((filename, data, f.content_type))
+
+    if not blobs:
+        raise HTTPException(status_code=400, detail="No files found in upload.")
+    if len(blobs) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=413, detail=f"Too many files in batch (max {MAX_BATCH_FILES}).")
+    return blobs
+
+
+def _expand_zip(archive_name: str, data: bytes) -> List[UploadBlob]:
+    try:
+        zf = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail=f"Invalid ZIP archive: '{archive_name}'.")
+
+    with zf:
+        members = [
+            info for info in zf.infolist()
+            if not info.is_dir()
+            and not os.path.basename(info.filename).startswith(".")
+            and not info.filename.startswith("__MACOSX/")
+        ]
+        if sum(info.file_size for info in members) > MAX_DECOMPRESSED_SIZE:
+            raise HTTPException(status_code=413, detail=f"ZIP archive '{archive_name}' is too large when extracted.")
+        for info in members:
+            if info.file_size > MAX_FILE_SIZE:
+                raise HTTPException(status_code=413, detail=f"'{info.filename}' exceeds {MAX_FILE_SIZE} bytes.")
+        return [(info.filename, zf.read(info), None) for info in members]
+
+
+def parse_blob(blob: UploadBlob) -> Dict[str, Any]:
+    """
+    Parse one blob with the regular parse_upload pipeline (runs inside a worker process).
+
+    Returns {"filename", "content_hash", "parsed"} on success or
+    {"filename", "content_hash", "error", "status_code"} on failure; exceptions are
+    flattened to plain data because not all of them survive pickling.
+    """
+    filename, data, content_type = blob
+    content_hash = hashlib.sha256(data).hexdigest()
+    headers = Headers({"content-type": content_type}) if content_type else None
+    upload = UploadFile(file=io.BytesIO(data), filename=os.path.basename(filename), headers=headers)
+    try:
+        return {"filename": filename, "content_hash": content_hash, "parsed": parse_upload(upload)}
+    except HTTPException as e:
+        return {"filename": filename, "content_hash": content_hash, "error": str(e.detail), "status_code": e.status_code}
+    except Exception as e:
+        return {"filename": filename, "content_hash": content_hash, "error": str(e), "status_code": 400}
+
+
+def parse_blobs_parallel(blobs: List[UploadBlob]) -> List[Dict[str, Any]]:
+    """Parse blobs across the process pool, preserving input order. A single blob is parsed inline."""
+    if len(blobs) == 1:
+        return [parse_blob(blobs[0])]
+    return list(_get_pool().map(parse_blob, blobs))
@@ -0,0 +1,73 @@
+from __future__ import annotations
+import gzip
+import io
+from typing import Any, BinaryIO, Dict, List
+from fastapi import HTTPException, UploadFile
+
+from app.services.upload.readers.csv_reader import read_csv_text_rows
+from app.services.upload.utils import MAX_DECOMPRESSED_SIZE
+
+try:
+    import zstandard
+    _DECOMPRESS_ERRORS: tuple = (OSError, EOFError, zstandard.ZstdError)
+except Exception: # zstandard is optional; .csv.zst uploads are rejected without it
+    zstandard = None
+    _DECOMPRESS_ERRORS = (OSError, EOFError)
+
+
+class _BoundedReader(io.RawIOBase):
+    """Binary stream wrapper that fails once more than `limit` bytes have been read."""
+
+    def __init__(self, raw: BinaryIO, limit: int) -> None:
+        self._raw = raw
+        self._limit = limit
+        self._read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        chunk = self._raw.read(len(b))
+        self._read += len(chunk)
+        if self._read > self._limit:
+            raise ValueError(f"Decompressed size exceeds maximum limit of {self._limit} bytes.")
+        b[: len(chunk)] = chunk
+        return len(chunk)
+
+
+def read_compressed_csv_rows(file: UploadFile, codec: str) -> List[Dict[str, Any]]:
+    """
+    Read a gzip- or zstd-compressed CSV UploadFile and extract raw
+    platform/url rows.
+
+    Input:
+    - file: UploadFile pointing to a '.csv.gz' or '.csv.zst' file.
+    - codec: "gzip" or "zstd".
+
+    Output:
+    - Same shape as read_csv_rows.
+
+    Notes:
+    - This function performs NO validation.
+    - Decompression and UTF-8 decoding happen on the fly; neither the
+      compressed nor the decompressed file is held in memory as a whole.
+    - Decompressed output is capped at MAX_DECOMPRESSED_SIZE.
+    """
+
+    file.file.seek(0)
+    if codec == "gzip":
+        decompressed: BinaryIO = gzip.GzipFile(fileobj=file.file, mode="rb")
+    elif codec == "zstd":
+        if zstandard is None:
+            raise HTTPException(status_code=415, detail="zstd-compressed uploads are not supported on this server.")
+        decompressed = zstandard.ZstdDecompressor().stream_reader(file.file)
+    else:
+        raise ValueError(f"Unknown compression codec: {codec}")
+
+    bounded = io.BufferedReader(_BoundedReader(decompressed, MAX_DECOMPRESSED_SIZE))
+    # utf-8-sig strips a BOM; errors="replace" matches the plain CSV reader's fallback.
+    text = io.TextIOWrapper(bounded, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        return read_csv_text_rows(text)
+    except _DECOMPRESS_ERRORS as e:
+        raise ValueError(f"Could not decompress {codec} upload: {e}") from e
@@ -1,7 +1,7 @@
 from __future__ import annotations
 import csv
 import io
-from typing import List, Optional, Any, Dict
+from typing import Iterable, List, Optional, Any, Dict
 from fastapi import UploadFile
 
 from app.services.upload.utils import build_header_map
@@ -27,19 +27,31 @@ def read_csv_rows(file: UploadFile) -> List[Dict[str, Any]]:
     - Encoding is best-effort UTF-8 with BOM handling.
     - Row order is preserved.
     """
-    
+
     file.file.seek(0) # ensure at the start
     raw_bytes = file.file.read()
-    
+
     try:
         text = raw_bytes.decode("utf-8-sig") # handle potential BOM
     except UnicodeDecodeError:
         text = raw_bytes.decode("utf-8", errors="replace") # fallback with replacement
-        
-    reader = csv.DictReader(io.StringIO(text)) # DictReader handles header row and maps to dicts
+
+    return read_csv_text_rows(io.StringIO(text))
+
+
+def read_csv_text_rows(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Extract platform/url rows from an already-decoded CSV text stream.
+
+    Notes:
+    - Shared by the plain and compressed CSV readers.
+    - `lines` is consumed lazily, so a streaming decoder never has to
+      materialise the whole file as one string.
+    """
+    reader = csv.DictReader(lines) # DictReader handles header row and maps to dicts
     if not reader.fieldnames:
         return [] # empty file or no header
-    
+
     key_map = build_header_map(reader.fieldnames) # get actual header names for "platform" and "url"
     rows: List[Dict[str, Any]] = []
     for row in reader:
@@ -47,4 +59,4 @@ def read_csv_rows(file: UploadFile) -> List[Dict[str, Any]]:
             "platform": row.get(key_map["platform"]),
             "url": row.get(key_map["url"])
             })
-    return rows
\ No newline at end of file
+    return rows
@@ -0,0 +1,53 @@
+from __future__ import annotations
+import io
+import json
+from typing import List, Any, Dict, Optional
+from fastapi import UploadFile
+
+def read_ndjson_rows(file: UploadFile) -> List[Dict[str, Any]]:
+    """
+    Read an NDJSON (JSON Lines) UploadFile and extract raw rows containing
+    only the required logical fields: platform and url.
+
+    Input:
+    - file: UploadFile with one JSON object per line.
+
+    Output:
+    - Same shape as read_csv_rows.
+
+    Notes:
+    - This function performs NO validation.
+    - Keys are matched case-insensitively per object.
+    - Blank lines are skipped; a line that is not a JSON object yields
+      an empty row so validation reports it at the right row index.
+    - The file is decoded line by line and never loaded whole.
+    """
+
+    file.file.seek(0)
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", errors="replace")
+    try:
+        rows: List[Dict[str, Any]] = []
+        for line in text:
+            if not line.strip():
+                continue
+            rows.append(ndjson_item_to_row(line))
+        return rows
+    finally:
+        text.detach() # leave the underlying upload stream open
+
+
+def ndjson_item_to_row(line: str) -> Dict[str, Any]:
+    """Decode one NDJSON line into a {"platform", "url"} row (values None if undecodable)."""
+    try:
+        obj: Optional[Any] = json.loads(line)
+    except ValueError:
+        obj = None
+    return link_item_to_row(obj)
+
+
+def link_item_to_row(obj: Any) -> Dict[str, Any]:
+    """Map a decoded JSON value to a {"platform", "url"} row, matching keys case-insensitively."""
+    if not isinstance(obj, dict):
+        return {"platform": None, "url": None}
+    lowered = {str(k).strip().lower(): v for k, v in obj.items()}
+    return {"platform": lowered.get("platform"), "url": lowered.get("url")}
@@ -0,0 +1,45 @@
+from __future__ import annotations
+from typing import List, Any, Dict
+from fastapi import HTTPException, UploadFile
+
+from app.services.upload.utils import build_header_map
+
+try:
+    import pyarrow.parquet as pq
+except Exception: # pyarrow is optional; Parquet uploads are rejected without it
+    pq = None
+
+PARQUET_BATCH_SIZE = 10_000
+
+def read_parquet_rows(file: UploadFile) -> List[Dict[str, Any]]:
+    """
+    Read a Parquet UploadFile and extract raw rows containing only
+    the required logical fields: platform and url.
+
+    Input:
+    - file: UploadFile pointing to a Parquet file.
+
+    Output:
+    - Same shape as read_csv_rows.
+
+    Notes:
+    - This function performs NO validation.
+    - Column names are matched case-insensitively.
+    - Only the platform/url column chunks are read from disk, in
+      record batches of PARQUET_BATCH_SIZE rows.
+    """
+
+    if pq is None:
+        raise HTTPException(status_code=415, detail="Parquet uploads are not supported on this server.")
+
+    file.file.seek(0)
+    pf = pq.ParquetFile(file.file)
+    key_map = build_header_map(pf.schema_arrow.names)
+    columns = [key_map["platform"], key_map["url"]]
+
+    rows: List[Dict[str, Any]] = []
+    for batch in pf.iter_batches(batch_size=PARQUET_BATCH_SIZE, columns=columns):
+        platforms = batch.column(0).to_pylist()
+        urls = batch.column(1).to_pylist()
+        rows.extend({"platform": p, "url": u} for p, u in zip(platforms, urls))
+    return rows
@@ -1,16 +1,64 @@
 from __future__ import annotations
-from typing import List, Optional, Any, Dict
+from typing import Callable, List, Optional, Any, Dict
 from fastapi import UploadFile, HTTPException
 
-from app.services.upload.utils import infer_extension, looks_like_csv, looks_like_xlsx, normalise_cell, build_header_map, guard_file
+from app.services.upload.utils import (
+    infer_extension,
+    looks_like_csv,
+    looks_like_xlsx,
+    looks_like_ndjson,
+    looks_like_parquet,
+    looks_like_gzip,
+    looks_like_zstd,
+    normalise_cell,
+    build_header_map,
+    guard_file,
+)
 from app.services.upload.types import ParsedRow
 from app.services.upload.readers.csv_reader import read_csv_rows
 from app.services.upload.readers.xlsx_reader import read_xlsx_rows
+from app.services.upload.readers.ndjson_reader import read_ndjson_rows
+from app.services.upload.readers.parquet_reader import read_parquet_rows
+from app.services.upload.readers.compressed_reader import read_compressed_csv_rows
 from app.services.upload.validators import validate_row
 
+RowReader = Callable[[UploadFile], List[Dict[str, Any]]]
+
+# Extension -> reader. Compressed CSVs keep their inner extension (see infer_extension).
+READERS_BY_EXTENSION: Dict[str, RowReader] = {
+    ".csv": read_csv_rows,
+    ".xlsx": read_xlsx_rows,
+    ".ndjson": read_ndjson_rows,
+    ".jsonl": read_ndjson_rows,
+    ".parquet": read_parquet_rows,
+    ".csv.gz": lambda f: read_compressed_csv_rows(f, "gzip"),
+    ".csv.zst": lambda f: read_compressed_csv_rows(f, "zstd"),
+}
+
+SUPPORTED_TYPES_HINT = "CSV, XLSX, NDJSON, Parquet, or gzip/zstd-compressed CSV"
+
+
+def _reader_for_content_type(content_type: Optional[str]) -> Optional[RowReader]:
+    """Fallback content-type sniffing when the filename has no extension."""
+    # Check compressed/columnar types first: their MIME types can contain "csv" too.
+    if looks_like_gzip(content_type):
+        return READERS_BY_EXTENSION[".csv.gz"]
+    if looks_like_zstd(content_type):
+        return READERS_BY_EXTENSION[".csv.zst"]
+    if looks_like_parquet(content_type):
+        return read_parquet_rows
+    if looks_like_ndjson(content_type):
+        return read_ndjson_rows
+    if looks_like_csv(content_type):
+        return read_csv_rows
+    if looks_like_xlsx(content_type):
+        return read_xlsx_rows
+    return None
+
+
 def parse_upload(file: UploadFile) -> Dict[str, Any]:
     """
-    Parse the uploaded CSV/XLSX file and validate rows into a normalised internal format.
+    Parse the uploaded file (see READERS_BY_EXTENSION) and validate rows into a normalised internal format.
 
     Returns:
     {
@@ -40,32 +88,24 @@ def parse_upload(file: UploadFile) -> Dict[str, Any]:
     filename = (file.filename or "").strip()
     ext = infer_extension(filename)
     
-    if ext and ext not in {".csv", ".xlsx"}: # known but unsupported extension
+    if ext and ext not in READERS_BY_EXTENSION: # known but unsupported extension
         raise HTTPException(
             status_code=415,
             detail=(
-                "Unsupported file type. Please upload CSV or XLSX. "
+                f"Unsupported file type. Please upload {SUPPORTED_TYPES_HINT}. "
                 f"Got filename='{filename}', content_type='{file.content_type}'."
             ),
         )
-    if ext == ".csv":
-        raw_rows = read_csv_rows(file)
-    elif ext == ".xlsx":
-        raw_rows = read_xlsx_rows(file)
-    else:
-        # fallback: content-type sniffing
-        if looks_like_csv(file.content_type):
-            raw_rows = read_csv_rows(file)
-        elif looks_like_xlsx(file.content_type):
-            raw_rows = read_xlsx_rows(file)
-        else: # unable to determine file type
-            raise HTTPException( 
-                status_code=415,
-                detail=(
-                    "Unsupported file type. Please upload CSV or XLSX. "
-                    f"Got filename='{filename}', content_type='{file.content_type}'."
-                ),
-            )
+    reader = READERS_BY_EXTENSION.get(ext) if ext else _reader_for_content_type(file.content_type)
+    if reader is None: # unable to determine file type
+        raise HTTPException(
+            status_code=415,
+            detail=(
+                f"Unsupported file type. Please upload {SUPPORTED_TYPES_HINT}. "
+                f"Got filename='{filename}', content_type='{file.content_type}'."
+            ),
+        )
+    raw_rows = reader(file)
             
     parsed: List[ParsedRow] = []
     for i, row in enumerate(raw_rows, start=1):
@@ -1,10 +1,15 @@
 from __future__ import annotations
 from typing import List, Optional, Any, Dict
+import hashlib
 import os
 from fastapi import UploadFile
 
 SUPPORTED_PLATFORMS = {"youtube","tiktok","instagram"}
 MAX_FILE_SIZE = 10 * 1024 * 1024 # 10MB
+MAX_DECOMPRESSED_SIZE = 200 * 1024 * 1024 # 200MB, guards against decompression bombs
+MAX_ARCHIVE_SIZE = 50 * 1024 * 1024 # 50MB, a ZIP batch upload as sent (compressed)
+HASH_CHUNK_SIZE = 1024 * 1024 # 1MB
+COMPRESSION_EXTENSIONS = {".gz", ".zst"}
 
 def infer_extension(filename: str) -> str:
     """
@@ -13,8 +18,12 @@ def infer_extension(filename: str) -> str:
     Returns:
     - Lowercased extension including leading dot (e.g. '.csv'),
       or empty string if none.
+    - Compressed files keep their inner extension (e.g. '.csv.gz', '.csv.zst').
     """
-    _, ext = os.path.splitext((filename or "").lower()) #handles None or empty string
+    stem, ext = os.path.splitext((filename or "").lower()) #handles None or empty string
+    if ext in COMPRESSION_EXTENSIONS:
+        _, inner = os.path.splitext(stem)
+        return inner + ext
     return ext
 
 
@@ -34,6 +43,33 @@ def looks_like_xlsx(content_type: Optional[str]) -> bool:
         or (ct == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
         )# common MIME type for XLSX files
 
+def looks_like_ndjson(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    ct = content_type.lower()
+    return ("ndjson" in ct) or ("jsonl" in ct) or ("json-seq" in ct)
+
+def looks_like_parquet(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    return "parquet" in content_type.lower()
+
+def looks_like_gzip(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    return "gzip" in content_type.lower() # application/gzip, application/x-gzip
+
+def looks_like_zstd(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    return "zstd" in content_type.lower()
+
+def looks_like_zip(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    ct = content_type.lower()
+    return ("zip" in ct) and ("gzip" not in ct) # application/zip, application/x-zip-compressed
+
 def normalise_cell(value: Any) -> Optional[str]:
     """
     Convert a raw cell value into a clean string or None.
@@ -97,6 +133,21 @@ def guard_file(file: UploadFile) -> None:
             raise ValueError(f"File size exceeds maximum limit of {MAX_FILE_SIZE} bytes.")
     except Exception:
          # best-effort; ignore if not seekable
-        return 
-   
-        
\ No newline at end of file
+        return
+
+
+def hash_upload(file: UploadFile) -> str:
+    """
+    Compute the SHA-256 hex digest of an uploaded file's raw bytes.
+
+    Notes:
+    - Reads in HASH_CHUNK_SIZE chunks so large uploads are never fully in memory.
+    - Rewinds the stream afterwards so readers can start from the beginning.
+    """
+    digest = hashlib.sha256()
+    f = file.file
+    f.seek(0)
+    for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    f.seek(0)
+    return digest.hexdigest()
@@ -0,0 +1,144 @@
+"""
+Benchmark: CSV export body generation, per-row writer vs. chunked batch writer.
+
+    python -m bench.export_csv
+
+Legacy path: one csv.writerow + getvalue/seek/truncate + str chunk per row,
+engagement computed per row. Current path: app.services.jobs.export._iter_csv
+over EXPORT_BATCH_SIZE batches, written in slices that fill ~64KB chunks.
+
+Both bodies are driven through a real StreamingResponse into a no-op ASGI
+send, so the per-chunk cost (threadpool hop for each next() of a sync
+iterator, str encoding, one send per chunk) is included, as in production.
+
+No database is queried; rows are synthetic but shaped like real results.
+Importing the export module still creates the (unconnected) engine, so
+DATABASE_URL must be set, to any Postgres URL.
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import random
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+
+from fastapi.responses import StreamingResponse
+
+from app.services.jobs.export import (
+    EXPORT_BATCH_SIZE,
+    EXPORT_COLUMNS,
+    _export_source_names,
+    _iter_csv,
+)
+
+ROW_COUNTS = (10_000, 100_000)
+REPEATS = 3
+
+
+def _legacy_engagement_rate(views: Optional[int], likes: int, comments: int) -> str:
+    if not views or views <= 0:
+        return ""
+    return f"{((likes or 0) + (comments or 0)) / views:.6f}"
+
+
+def _legacy_iter_csv(rows) -> Iterator[str]:
+    yield "\ufeff"
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buf.getvalue()
+    buf.seek(0)
+    buf.truncate(0)
+    for r in rows:
+        writer.writerow([
+            r.platform, r.url, r.title, r.views, r.likes, r.comments,
+            r.published_at.isoformat() if r.published_at else "",
+            _legacy_engagement_rate(r.views, r.likes, r.comments),
+            r.status, r.error_message or "",
+        ])
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate(0)
+
+
+def _make_rows(n: int, names):
+    rng = random.Random(n)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    Row = namedtuple("Row", names)
+    rows = []
+    for i in range(n):
+        failed = rng.random() < 0.05
+        views = None if failed else rng.randint(100, 5_000_000)
+        values = {
+            "platform": "youtube",
+            "url": f"https://www.youtube.com/watch?v=v{i:010d}",
+            "title": None if failed else f"Video title number {i}, with a comma and \"quotes\"",
+            "views": views,
+            "likes": None if failed else views // 40,
+            "comments": None if failed else views // 400,
+            "published_at": None if failed else base + timedelta(minutes=i),
+            "engagement_rate": None if failed else (views // 40 + views // 400) / views,
+            "status": "failed" if failed else "success",
+            "error_message": "HTTP 404" if failed else None,
+        }
+        rows.append(Row(*(values[n] for n in names)))
+    return rows
+
+
+def _drive(body) -> int:
+    """Run a StreamingResponse over `body` to completion; returns the number of body messages."""
+    messages = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal messages
+        messages += message["type"] == "http.response.body"
+
+    response = StreamingResponse(body, media_type="text/csv; charset=utf-8")
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+    asyncio.run(response(scope, receive, send))
+    return messages
+
+
+def _best_of(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    names = _export_source_names(EXPORT_COLUMNS)
+    print(f"{'rows':>8} {'legacy ms':>10} {'chunked ms':>11} {'speedup':>8} {'legacy sends':>13} {'sends':>6}")
+    for n in ROW_COUNTS:
+        rows = _make_rows(n, names)
+        batches = [rows[i:i + EXPORT_BATCH_SIZE] for i in range(0, n, EXPORT_BATCH_SIZE)]
+
+        old_bytes = "".join(_legacy_iter_csv(rows)).encode("utf-8")
+        assert old_bytes == b"".join(_iter_csv(batches, names, EXPORT_COLUMNS)), "outputs differ"
+
+        old_sends = new_sends = 0
+
+        def legacy():
+            nonlocal old_sends
+            old_sends = _drive(_legacy_iter_csv(rows))
+
+        def chunked():
+            nonlocal new_sends
+            new_sends = _drive(_iter_csv(batches, names, EXPORT_COLUMNS))
+
+        old_s, new_s = _best_of(legacy), _best_of(chunked)
+        print(f"{n:>8,} {old_s * 1000:>10.1f} {new_s * 1000:>11.1f} {old_s / new_s:>7.1f}x "
+              f"{old_sends:>13,} {new_sends:>6,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: serialising a results page, old path vs. fast path, and bytes on the wire.
+
+    python -m bench.results_json
+
+Old path: ORM Result objects -> _result_to_dict (isoformat per row) ->
+FastAPI jsonable_encoder -> JSONResponse (stdlib json).
+Fast path: Core row tuples -> dict(zip(...)) -> app.core.fast_json.dumps.
+
+No database is needed; rows are synthetic but shaped like real results.
+"""
+from __future__ import annotations
+
+import gzip
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core import compression
+from app.core.fast_json import dumps, orjson
+from app.db.models import Result
+from app.services.jobs.queries import RESULT_COLUMNS, _result_rows_to_dicts, _result_to_dict
+
+PAGE_SIZES = (200, 10_000)
+REPEATS = 5
+
+
+def _make_rows(n: int):
+    rng = random.Random(n)
+    job_id = uuid.uuid4()
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(n):
+        views = rng.randint(100, 5_000_000)
+        likes, comments = views // rng.randint(20, 80), views // rng.randint(200, 900)
+        rows.append((
+            i + 1, job_id, "youtube", f"https://www.youtube.com/watch?v={uuid.uuid4().hex[:11]}",
+            f"Channel {rng.randint(1, 500)}", "success", None,
+            f"Video title number {i} with a few more words to look realistic",
+            views, likes, comments, base + timedelta(minutes=i), (likes + comments) / views,
+        ))
+    return rows
+
+
+def _best_of(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    keys = list(RESULT_COLUMNS)
+    print(f"orjson: {'yes' if orjson is not None else 'no (stdlib json fallback)'}; "
+          f"brotli: {'yes' if compression.brotli is not None else 'no'}")
+    print(f"{'rows':>7} {'old ms':>8} {'fast ms':>8} {'speedup':>8} {'identity':>10} {'gzip':>9} {'br':>9}")
+    for n in PAGE_SIZES:
+        rows = _make_rows(n)
+        orm_rows = [Result(**dict(zip(keys, r))) for r in rows]
+
+        def old() -> bytes:
+            payload = {"items": [_result_to_dict(r) for r in orm_rows]}
+            return JSONResponse(jsonable_encoder(payload)).body
+
+        def fast() -> bytes:
+            return dumps({"items": _result_rows_to_dicts(rows)})
+
+        old_s, fast_s = _best_of(old), _best_of(fast)
+        body = fast()
+        gz = len(gzip.compress(body, compression.GZIP_LEVEL))
+        br = (
+            f"{len(compression.brotli.compress(body, quality=compression.BROTLI_QUALITY)):>9,}"
+            if compression.brotli is not None else f"{'-':>9}"
+        )
+        print(f"{n:>7,} {old_s * 1000:>8.1f} {fast_s * 1000:>8.1f} {old_s / fast_s:>7.1f}x "
+              f"{len(body):>10,} {gz:>9,} {br}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,518 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import uuid
+import zipfile
+from datetime import timedelta
+from typing import Any, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, update
+
+from app.db.models import TrackedLink
+from app.db.session import SessionLocal
+from app.main import app
+from app.services.jobs.export_cache import evict_export_cache
+from app.services.jobs.tracking import refresh_rate, run_refresh_tick
+
+client = TestClient(app)
+
+# Register a test user once and obtain a token for authenticated requests.
+_register_resp = client.post(
+    "/auth/register",
+    json={"username": "ci_jobs_api_user", "password": "ci_test_pass"},
+)
+# 201 on first run, 409 if the DB already has this user (re-runs) — both fine.
+if _register_resp.status_code == 409:
+    _login_resp = client.post(
+        "/auth/login",
+        json={"username": "ci_jobs_api_user", "password": "ci_test_pass"},
+    )
+    _TOKEN = _login_resp.json()["access_token"]
+else:
+    _TOKEN = _register_resp.json()["access_token"]
+
+_AUTH_HEADERS = {"Authorization": f"Bearer {_TOKEN}"}
+
+LINKS = [
+    {"platform": "youtube", "url": "https://youtube.com/watch?v=abc"},
+    {"platform": "TT", "url": "https://tiktok.com/@xx/video/1"},
+    {"platform": "myspace", "url": "https://myspace.com/x"},
+]
+
+
+def _create_job(items: list[dict[str, Any]] = LINKS) -> dict[str, Any]:
+    resp = client.post("/jobs", json=items)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def _get(path: str, **params: Any) -> dict[str, Any]:
+    resp = client.get(path, params=params, headers=_AUTH_HEADERS)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_create_job_from_json_array() -> None:
+    payload = _create_job()
+    assert payload["total_rows"] == 3
+    assert payload["valid_rows"] == 2
+    assert payload["invalid_rows"] == 1
+    assert payload["invalid_preview"][0]["row_index"] == 3
+
+    results = _get(f"/jobs/{payload['job_id']}/results")
+    assert [r["platform"] for r in results["items"]] == ["youtube", "tiktok"]
+
+
+def test_create_job_from_ndjson_stream() -> None:
+    body = "\n".join(json.dumps(item) for item in LINKS) + "\n\nnot-json\n"
+    resp = client.post(
+        "/jobs?filename=links.ndjson",
+        content=body.encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200, resp.text
+    payload = resp.json()
+    assert payload["filename"] == "links.ndjson"
+    assert payload["total_rows"] == 4
+    assert payload["valid_rows"] == 2
+
+    job = _get(f"/jobs/{payload['job_id']}")
+    assert job["total_rows"] == 2
+
+
+def test_create_job_rejects_non_array_json() -> None:
+    resp = client.post("/jobs", json={"platform": "youtube", "url": "x"})
+    assert resp.status_code == 400, resp.text
+
+
+def test_single_fetch_serves_repeat_lookups_from_cache() -> None:
+    url = f"https://www.youtube.com/watch?v=single-{uuid.uuid4().hex[:8]}"
+    first = client.get("/fetch", params={"url": url})
+    assert first.status_code == 200, first.text
+    assert first.json()["platform"] == "youtube"
+    assert first.json()["source"] == "live"
+
+    second = client.post("/fetch", params={"url": url})
+    assert second.status_code == 200, second.text
+    assert second.json()["source"] == "cache"
+    assert second.json()["views"] == first.json()["views"]
+
+    # The background one-row job is internal: it never shows up in the job list.
+    listed = _get("/jobs", limit=100)["items"]
+    assert all(j.get("filename") != "single-fetch" for j in listed)
+
+
+def test_single_fetch_rejects_unknown_platform() -> None:
+    resp = client.get("/fetch", params={"url": "https://example.com/video/1"})
+    assert resp.status_code == 400, resp.text
+
+
+def test_results_keyset_pages_match_offset_pages() -> None:
+    links = [{"platform": "youtube", "url": f"https://youtube.com/watch?v=k{i}"} for i in range(5)]
+    job_id = _create_job(links)["job_id"]
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        params: dict[str, Any] = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = _get(f"/jobs/{job_id}/results", **params)
+        seen.extend(r["id"] for r in page["items"])
+        cursor = page["next_cursor"]
+        assert page["has_more"] == (cursor is not None)
+        if not cursor:
+            break
+
+    by_offset = _get(f"/jobs/{job_id}/results", limit=200)
+    assert seen == [r["id"] for r in by_offset["items"]]
+
+
+def test_jobs_keyset_pages_do_not_overlap() -> None:
+    for _ in range(3):
+        _create_job()
+    first = _get("/jobs", limit=2)
+    assert first["next_cursor"]
+    second = _get("/jobs", limit=2, cursor=first["next_cursor"])
+    assert not {j["id"] for j in first["items"]} & {j["id"] for j in second["items"]}
+
+
+def test_invalid_cursor_is_rejected() -> None:
+    resp = client.get("/jobs", params={"cursor": "not-a-cursor"}, headers=_AUTH_HEADERS)
+    assert resp.status_code == 400, resp.text
+
+
+def test_jobs_list_count_modes() -> None:
+    _create_job()
+    exact = _get("/jobs", limit=1, count="exact")
+    assert exact["total"] >= 1
+    assert exact["total_is_estimate"] is False
+
+    skipped = _get("/jobs", limit=1, count="none")
+    assert skipped["total"] is None
+    assert skipped["has_more"] == (exact["total"] > 1)
+
+
+def _run_job(job_id: str) -> None:
+    # TestClient executes background tasks before returning, so the job is finished afterwards.
+    resp = client.post(f"/jobs/{job_id}/run")
+    assert resp.status_code == 202, resp.text
+
+
+def test_results_since_returns_only_changed_rows() -> None:
+    job_id = _create_job()["job_id"]
+    initial = _get(f"/jobs/{job_id}/results", since="")
+    assert len(initial["items"]) == 2
+    since = initial["next_since"]
+
+    unchanged = _get(f"/jobs/{job_id}/results", since=since)
+    assert unchanged["items"] == []
+    assert unchanged["next_since"] == since
+
+    _run_job(job_id)
+    changed = _get(f"/jobs/{job_id}/results", since=since)
+    assert {r["id"] for r in changed["items"]} == {r["id"] for r in initial["items"]}
+    assert all(r["status"] != "queued" for r in changed["items"])
+    assert _get(f"/jobs/{job_id}/results", since=changed["next_since"])["items"] == []
+
+
+def test_results_and_export_sparse_fieldsets() -> None:
+    job_id = _create_job()["job_id"]
+    page = _get(f"/jobs/{job_id}/results", fields="status,views", limit=1)
+    assert [set(r) for r in page["items"]] == [{"status", "views"}]
+    assert page["next_cursor"]
+
+    resp = client.get(f"/jobs/{job_id}/results", params={"fields": "status,secret"}, headers=_AUTH_HEADERS)
+    assert resp.status_code == 400, resp.text
+
+    _run_job(job_id)
+    export = client.get(f"/jobs/{job_id}/export.csv", params={"fields": "url,engagement_rate"}, headers=_AUTH_HEADERS)
+    assert export.status_code == 200, export.text
+    assert export.text.lstrip("\ufeff").splitlines()[0] == "url,engagement_rate"
+
+
+def test_export_streams_every_row_in_id_order() -> None:
+    links = [{"platform": "youtube", "url": f"https://youtube.com/watch?v=e{i}"} for i in range(5)]
+    job_id = _create_job(links)["job_id"]
+    _run_job(job_id)
+
+    export = client.get(f"/jobs/{job_id}/export.csv", headers=_AUTH_HEADERS)
+    assert export.status_code == 200, export.text
+    lines = export.text.lstrip("\ufeff").splitlines()
+    assert lines[0].split(",") == ["platform", "url", "title", "views", "likes", "comments",
+                                   "published_at", "engagement_rate", "status", "error_message"]
+    assert [line.split(",")[1] for line in lines[1:]] == [link["url"] for link in links]
+
+
+def test_completed_export_is_served_pre_rendered_with_ranges() -> None:
+    job_id = _create_job()["job_id"]
+    _run_job(job_id)
+    url = f"/jobs/{job_id}/export.csv"
+
+    full = client.get(url, headers={**_AUTH_HEADERS, "Accept-Encoding": "gzip"})
+    assert full.status_code == 200, full.text
+    assert full.headers["content-encoding"] == "gzip"
+    assert full.headers["accept-ranges"] == "bytes"
+    size = int(full.headers["content-length"])
+
+    partial = client.get(url, headers={**_AUTH_HEADERS, "Accept-Encoding": "gzip", "Range": "bytes=0-9"})
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == f"bytes 0-9/{size}"
+
+    again = client.get(url, headers={**_AUTH_HEADERS, "Accept-Encoding": "gzip", "If-None-Match": full.headers["etag"]})
+    assert again.status_code == 304
+
+    plain = client.get(url, headers={**_AUTH_HEADERS, "Accept-Encoding": "identity"})
+    assert plain.text == full.text
+    assert int(plain.headers["content-length"]) == len(plain.content)
+
+    # Identity clients resume too, guarded by If-Range.
+    resume = client.get(url, headers={**_AUTH_HEADERS, "Accept-Encoding": "identity", "Range": "bytes=3-",
+                                      "If-Range": plain.headers["etag"]})
+    assert resume.status_code == 206
+    assert resume.content == plain.content[3:]
+    stale = client.get(url, headers={**_AUTH_HEADERS, "Accept-Encoding": "identity", "Range": "bytes=3-",
+                                     "If-Range": '"stale"'})
+    assert stale.status_code == 200
+
+
+def test_export_cache_evicts_least_recently_used(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("EXPORT_CACHE_MAX_BYTES", "250")
+    paths = [tmp_path / f"job{i}-v.csv.gz" for i in range(4)]
+    for i, path in enumerate(paths):
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + i, 1000 + i))
+    os.utime(paths[0]) # served just now
+
+    evict_export_cache(tmp_path, keep=paths[1])
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["job0-v.csv.gz", "job1-v.csv.gz"]
+
+
+def test_export_ndjson_xlsx_parquet() -> None:
+    job_id = _create_job()["job_id"]
+    _run_job(job_id)
+
+    ndjson = client.get(f"/jobs/{job_id}/export.ndjson", params={"fields": "url,views"}, headers=_AUTH_HEADERS)
+    assert ndjson.status_code == 200, ndjson.text
+    rows = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert len(rows) == 2 and set(rows[0]) == {"url", "views"}
+
+    xlsx = client.get(f"/jobs/{job_id}/export.xlsx", headers=_AUTH_HEADERS)
+    assert xlsx.status_code == 200 and xlsx.content[:2] == b"PK"
+    parquet = client.get(f"/jobs/{job_id}/export.parquet", headers=_AUTH_HEADERS)
+    assert parquet.status_code == 501 or parquet.content[:4] == parquet.content[-4:] == b"PAR1"
+    assert client.get(f"/jobs/{job_id}/export.pdf", headers=_AUTH_HEADERS).status_code == 422
+
+
+def test_multi_job_export_zip_and_merged() -> None:
+    job_ids = [_create_job()["job_id"] for _ in range(2)]
+    for job_id in job_ids:
+        _run_job(job_id)
+
+    resp = client.post("/exports", json={"job_ids": job_ids}, headers=_AUTH_HEADERS)
+    assert resp.status_code == 200, resp.text
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+        assert zf.namelist() == [f"job_{job_id}_results.csv" for job_id in job_ids]
+
+    merged = client.post(
+        "/exports",
+        json={"job_ids": job_ids, "format": "ndjson", "archive": "merged", "filters": {"status": "success"}},
+        headers=_AUTH_HEADERS,
+    )
+    assert merged.status_code == 200, merged.text
+    rows = [json.loads(line) for line in merged.text.splitlines()]
+    assert [r["job_id"] for r in rows] == job_ids
+    assert {r["status"] for r in rows} == {"success"}
+
+    missing = client.post("/exports", json={"job_ids": [str(uuid.uuid4())]}, headers=_AUTH_HEADERS)
+    assert missing.status_code == 404
+
+
+def test_job_analytics() -> None:
+    job_id = _create_job()["job_id"]
+    _run_job(job_id)
+
+    resp = client.get(f"/jobs/{job_id}/analytics", headers=_AUTH_HEADERS)
+    if resp.status_code == 501: # numpy (the `analytics` extra) is not installed
+        return
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert data["rows"] == 1 # only the successful YouTube row
+    assert data["metrics"]["views"]["count"] == 1
+    assert [g["key"] for g in data["groups"]["items"]] == ["youtube"]
+
+    again = client.get(f"/jobs/{job_id}/analytics", headers={**_AUTH_HEADERS, "If-None-Match": resp.headers["etag"]})
+    assert again.status_code == 304
+
+
+def test_refresh_rate_counts_recent_videos_at_their_window() -> None:
+    links = [{"platform": "youtube", "url": f"https://youtu.be/{uuid.uuid4().hex[:11]}"} for _ in range(4)]
+    resp = client.post("/tracked-sets", json={"name": "launch week", "refresh_interval_seconds": 3600, "links": links},
+                       headers=_AUTH_HEADERS)
+    set_id = resp.json()["set_id"]
+
+    def rate_with_published(age: Optional[timedelta]) -> float:
+        with SessionLocal() as db:
+            now = db.scalar(select(func.now()))
+            db.execute(update(TrackedLink).where(TrackedLink.set_id == uuid.UUID(set_id))
+                       .values(published_at=now - age if age is not None else None))
+            rate = refresh_rate(db, now)
+            db.commit()
+        return rate
+
+    base = rate_with_published(None)
+    # Under two days old: every quarter interval, i.e. 3 extra refreshes per interval and link.
+    assert rate_with_published(timedelta(hours=1)) == pytest.approx(base + 4 * 3 / 3600)
+    assert rate_with_published(timedelta(days=3)) == pytest.approx(base + 4 * 1 / 3600)
+    assert rate_with_published(timedelta(days=30)) == pytest.approx(base)
+    assert client.delete(f"/tracked-sets/{set_id}", headers=_AUTH_HEADERS).status_code == 204
+
+
+def test_analytics_histogram_keeps_the_maximum() -> None:
+    np = pytest.importorskip("numpy")
+    from app.services.jobs.analytics import _distribution
+
+    for top in (7.0, 999_999_999.0, 1e10): # expm1(log1p(7)) rounds to 6.999999999999998
+        data = _distribution(np.array([0.0, 1.0, 3.0, top]), bins=20, log_bins=True)
+        assert sum(data["histogram"]["counts"]) == data["count"]
+        assert data["histogram"]["edges"][-1] == top
+
+
+def test_channel_leaderboard(monkeypatch) -> None:
+    monkeypatch.setenv("CHANNEL_STATS_REFRESH_DELAY_SECONDS", "0") # refresh as soon as the job completes
+    handle = f"@lb{uuid.uuid4().hex[:12]}"
+    links = [{"platform": "youtube", "url": f"https://www.youtube.com/{handle}/shorts/v{i}"} for i in range(2)]
+    # The same video again under another URL: counted once (by canonical video id).
+    links.append({"platform": "youtube", "url": f"https://www.youtube.com/{handle}/shorts/v0?feature=share"})
+    job_id = _create_job(links)["job_id"]
+    _run_job(job_id)
+
+    found, cursor = None, None
+    for _ in range(50):
+        page = _get("/channels", platform="youtube", limit=200, **({"cursor": cursor} if cursor else {}))
+        found = next((c for c in page["items"] if c["channel"] == handle), None)
+        if found or not page["has_more"]:
+            break
+        cursor = page["next_cursor"]
+    assert found is not None
+    assert found["video_count"] == 2
+    assert found["total_views"] == 2 * found["median_views"]
+
+    resp = client.get("/channels", params={"sort": "title"}, headers=_AUTH_HEADERS)
+    assert resp.status_code == 422
+
+
+def test_metric_series() -> None:
+    video = uuid.uuid4().hex[:11]
+    links = [{"platform": "youtube", "url": f"https://www.youtube.com/watch?v={video}"}]
+    for _ in range(2): # two fetches of the same video land in one hourly bucket
+        job_id = _create_job(links)["job_id"]
+        _run_job(job_id)
+
+    by_url = _get("/videos/series", url=f"https://youtu.be/{video}")
+    assert by_url["video_id"] == f"youtube:{video}"
+    assert by_url["resolution"] == "day" # default range is 30 days
+    assert [p["views"] for p in by_url["points"]] == [123456]
+    assert _get("/videos/series", video_id=f"youtube:{video}", resolution="hour")["points"] == \
+        _get("/videos/series", url=f"https://www.youtube.com/shorts/{video}", resolution="hour")["points"]
+
+    campaign = _get(f"/jobs/{job_id}/series", resolution="hour")
+    assert campaign["video_count"] == 1
+    assert campaign["points"][-1]["views"] == 123456
+    assert campaign["points"][-1]["videos"] == 1
+
+    resp = client.get("/videos/series", params={"video_id": f"youtube:{video}", "resolution": "hour",
+                                               "start": "2020-01-01T00:00:00Z"}, headers=_AUTH_HEADERS)
+    assert resp.status_code == 400
+
+
+def test_tracked_set_refresh() -> None:
+    video = uuid.uuid4().hex[:11]
+    resp = client.post("/tracked-sets", json={
+        "name": "daily campaign",
+        "refresh_interval_seconds": 3600,
+        "links": [
+            {"platform": "youtube", "url": f"https://www.youtube.com/watch?v={video}"},
+            {"platform": "YT", "url": f"https://youtu.be/{video}"}, # same video
+            {"platform": "myspace", "url": "https://myspace.com/x"},
+        ],
+    }, headers=_AUTH_HEADERS)
+    assert resp.status_code == 200, resp.text
+    created = resp.json()
+    assert (created["link_count"], created["added_links"], created["invalid_rows"]) == (1, 1, 1)
+    set_id = created["set_id"]
+    assert _get(f"/tracked-sets/{set_id}")["never_fetched_links"] == 1
+
+    assert run_refresh_tick(60) >= 1
+    for _ in range(20): # links left due by other tests' sets are claimed too
+        if not run_refresh_tick(60):
+            break
+    state = _get(f"/tracked-sets/{set_id}")
+    assert (state["stale_links"], state["never_fetched_links"]) == (0, 0)
+    assert state["next_due_at"] > state["last_fetched_at"]
+    assert _get(f"/tracked-sets/{set_id}/series")["points"][-1]["views"] == 123456
+
+    resp = client.post("/tracked-sets", json={"name": "x", "refresh_interval_seconds": 1}, headers=_AUTH_HEADERS)
+    assert resp.status_code == 422
+    assert client.delete(f"/tracked-sets/{set_id}", headers=_AUTH_HEADERS).status_code == 204
+    assert client.get(f"/tracked-sets/{set_id}", headers=_AUTH_HEADERS).status_code == 404
+
+
+def test_results_filter_and_sort() -> None:
+    job_id = _create_job()["job_id"]
+    _run_job(job_id)
+
+    failed = _get(f"/jobs/{job_id}/results", status="failed")
+    assert [r["platform"] for r in failed["items"]] == ["tiktok"]
+    assert _get(f"/jobs/{job_id}/results", platform="YT")["items"][0]["platform"] == "youtube"
+
+    # Keyset pages in views order: the failed row (no views) comes last.
+    first = _get(f"/jobs/{job_id}/results", sort="-views", limit=1)
+    assert first["items"][0]["status"] == "success"
+    second = _get(f"/jobs/{job_id}/results", sort="-views", limit=1, cursor=first["next_cursor"])
+    assert second["items"][0]["status"] == "failed"
+    assert second["has_more"] is False
+    # Ascending too (read backwards from the same index): rows without views still come last.
+    asc = _get(f"/jobs/{job_id}/results", sort="views", limit=1)
+    assert asc["items"][0]["status"] == "success"
+    asc_next = _get(f"/jobs/{job_id}/results", sort="views", limit=1, cursor=asc["next_cursor"])
+    assert asc_next["items"][0]["status"] == "failed"
+    assert asc_next["has_more"] is False
+    assert [r["status"] for r in _get(f"/jobs/{job_id}/results", sort="views", limit=1, offset=1)["items"]] == ["failed"]
+
+    # engagement_rate is stored at fetch time, so it filters and sorts like any column.
+    engaging = _get(f"/jobs/{job_id}/results", min_engagement=0, sort="-engagement_rate")["items"]
+    assert [r["platform"] for r in engaging] == ["youtube"]
+    assert engaging[0]["engagement_rate"] > 0
+
+    resp = client.get(f"/jobs/{job_id}/results", params={"sort": "title"}, headers=_AUTH_HEADERS)
+    assert resp.status_code == 400, resp.text
+
+
+def test_results_search_by_title() -> None:
+    job_id = _create_job()["job_id"]
+    _run_job(job_id)
+
+    # Stub YouTube fetcher titles every video "Example YouTube Video".
+    words = _get("/results/search", q="example video", job_id=job_id)
+    assert [r["platform"] for r in words["items"]] == ["youtube"]
+    substring = _get("/results/search", q="ample YouT", job_id=job_id)
+    assert [r["id"] for r in substring["items"]] == [r["id"] for r in words["items"]]
+
+    assert _get("/results/search", q="example", job_id=job_id, platform="tiktok")["items"] == []
+    resp = client.get("/results/search", params={"q": "  "}, headers=_AUTH_HEADERS)
+    assert resp.status_code == 400, resp.text
+
+
+def test_job_summary_reflects_processed_rows() -> None:
+    job_id = _create_job()["job_id"]
+    before = _get(f"/jobs/{job_id}/summary")
+    assert before["stats"]["pending_rows"] == 2
+    assert before["stats"]["mean_engagement_rate"] is None
+
+    _run_job(job_id)
+    stats = _get(f"/jobs/{job_id}/summary")["stats"]
+    # Stub fetchers: YouTube succeeds, TikTok fails.
+    assert stats["success_rows"] == 1
+    assert stats["failed_rows"] == 1
+    assert stats["pending_rows"] == 0
+    assert stats["total_views"] > 0
+    assert stats["mean_engagement_rate"] is not None
+
+
+def test_job_events_stream_ends_with_snapshot_for_finished_job() -> None:
+    job_id = _create_job()["job_id"]
+    _run_job(job_id)
+
+    with client.stream("GET", f"/jobs/{job_id}/events", headers=_AUTH_HEADERS) as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        body = "".join(resp.iter_text())
+
+    event, data = body.strip().split("\n", 1)
+    assert event == "event: snapshot"
+    assert json.loads(data.removeprefix("data: "))["status"] == "completed"
+
+
+def test_job_detail_and_results_support_conditional_get() -> None:
+    job_id = _create_job()["job_id"]
+    etags: dict[str, str] = {}
+    for path in (f"/jobs/{job_id}", f"/jobs/{job_id}/results?limit=5"):
+        first = client.get(path, headers=_AUTH_HEADERS)
+        assert first.status_code == 200, first.text
+        etags[path] = first.headers["ETag"]
+
+        again = client.get(path, headers={**_AUTH_HEADERS, "If-None-Match": etags[path]})
+        assert again.status_code == 304
+        assert again.headers["ETag"] == etags[path]
+
+    # Processing bumps the job version, so the old ETag no longer matches.
+    _run_job(job_id)
+    detail_etag = etags[f"/jobs/{job_id}"]
+    changed = client.get(f"/jobs/{job_id}", headers={**_AUTH_HEADERS, "If-None-Match": detail_etag})
+    assert changed.status_code == 200
+    assert changed.headers["Cache-Control"] == "private, max-age=60" # short-lived, then revalidated
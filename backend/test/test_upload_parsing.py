@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import importlib.util
+import io
+import uuid
+import zipfile
 from pathlib import Path
 from typing import Any
 
@@ -30,6 +34,11 @@ else:
 _AUTH_HEADERS = {"Authorization": f"Bearer {_TOKEN}"}
 
 
+def _needs(module: str) -> pytest.MarkDecorator:
+    """Skip a case whose format needs an optional extra (e.g. `formats`) that is not installed."""
+    return pytest.mark.skipif(importlib.util.find_spec(module) is None, reason=f"{module} is not installed")
+
+
 def _post_file(path: Path) -> dict[str, Any]:
     assert path.exists(), f"Fixture not found: {path}"
     with path.open("rb") as f:
@@ -77,7 +86,14 @@ def _assert_common_shape(payload: dict[str, Any]) -> None:
 
 @pytest.mark.parametrize(
     "filename",
-    ["valid_csv.csv", "valid_xlsx.xlsx"],
+    [
+        "valid_csv.csv",
+        "valid_xlsx.xlsx",
+        "valid_ndjson.ndjson",
+        pytest.param("valid_parquet.parquet", marks=_needs("pyarrow")),
+        "valid_csv_gz.csv.gz",
+        pytest.param("valid_csv_zst.csv.zst", marks=_needs("zstandard")),
+    ],
 )
 def test_upload_valid_files_returns_all_valid(filename: str) -> None:
     payload = _post_file(FIXTURES_DIR / filename)
@@ -118,7 +134,14 @@ def test_upload_invalid_files_reports_errors(filename: str) -> None:
 
 @pytest.mark.parametrize(
     "filename",
-    ["mixed_csv.csv", "mixed_xlsx.xlsx"],
+    [
+        "mixed_csv.csv",
+        "mixed_xlsx.xlsx",
+        "mixed_ndjson.ndjson",
+        pytest.param("mixed_parquet.parquet", marks=_needs("pyarrow")),
+        "mixed_csv_gz.csv.gz",
+        pytest.param("mixed_csv_zst.csv.zst", marks=_needs("zstandard")),
+    ],
 )
 def test_upload_mixed_files_splits_valid_and_invalid(filename: str) -> None:
     payload = _post_file(FIXTURES_DIR / filename)
@@ -150,3 +173,84 @@ def test_upload_rejects_non_csv_xlsx() -> None:
         assert resp.status_code in (400, 415, 422), resp.text
     finally:
         dummy.unlink(missing_ok=True)
+
+
+def test_upload_with_same_idempotency_key_returns_existing_job() -> None:
+    path = FIXTURES_DIR / "valid_csv.csv"
+    headers = {"Idempotency-Key": f"test-{uuid.uuid4()}"}
+
+    payloads = []
+    for _ in range(2):
+        with path.open("rb") as f:
+            files = {"file": (path.name, f, "application/octet-stream")}
+            resp = client.post("/jobs/upload", files=files, headers=headers)
+        assert resp.status_code == 200, resp.text
+        payloads.append(resp.json())
+
+    first, second = payloads
+    _assert_common_shape(second)
+    assert second["job_id"] == first["job_id"]
+    assert second["duplicate_of"] == first["job_id"]
+    assert second["valid_rows"] == first["valid_rows"]
+
+
+def test_upload_duplicate_can_be_forced_to_new_job() -> None:
+    path = FIXTURES_DIR / "mixed_csv.csv"
+    first = _post_file(path)
+    with path.open("rb") as f:
+        files = {"file": (path.name, f, "application/octet-stream")}
+        resp = client.post("/jobs/upload?on_duplicate=new", files=files)
+    assert resp.status_code == 200, resp.text
+    second = resp.json()
+    assert second["job_id"] != first["job_id"]
+    assert "duplicate_of" not in second
+
+
+def test_batch_upload_creates_one_job_per_file() -> None:
+    names = ["valid_csv.csv", "mixed_xlsx.xlsx"]
+    handles = [(FIXTURES_DIR / n).open("rb") for n in names]
+    try:
+        files = [("files", (n, h, "application/octet-stream")) for n, h in zip(names, handles)]
+        resp = client.post("/jobs/upload/batch", files=files)
+    finally:
+        for h in handles:
+            h.close()
+    assert resp.status_code == 200, resp.text
+    payload = resp.json()
+
+    assert payload["merged"] is False
+    assert payload["failed_files"] == 0
+    assert len(payload["job_ids"]) == len(names)
+    assert [f["filename"] for f in payload["files"]] == names
+    for summary in payload["files"]:
+        assert summary["total_rows"] == summary["valid_rows"] + summary["invalid_rows"]
+        assert _get_job(summary["job_id"])["filename"] == summary["filename"]
+
+
+def test_batch_upload_zip_merged_into_single_job() -> None:
+    names = ["valid_csv.csv", "valid_ndjson.ndjson", "mixed_csv.csv"]
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for n in names:
+            zf.write(FIXTURES_DIR / n, arcname=n)
+
+    files = {"files": ("links.zip", buf.getvalue(), "application/zip")}
+    resp = client.post("/jobs/upload/batch?merge=true", files=files)
+    assert resp.status_code == 200, resp.text
+    payload = resp.json()
+
+    assert payload["merged"] is True
+    assert payload["file_count"] == len(names)
+    job = _get_job(payload["job_id"])
+    assert job["total_rows"] == sum(f["valid_rows"] for f in payload["files"])
+
+
+def test_batch_upload_xlsx_sent_as_zip_is_not_expanded() -> None:
+    # XLSX files are ZIP containers; the extension wins over a zip content type.
+    data = (FIXTURES_DIR / "valid_xlsx.xlsx").read_bytes()
+    files = {"files": ("valid_xlsx.xlsx", data, "application/zip")}
+    resp = client.post("/jobs/upload/batch", files=files)
+    assert resp.status_code == 200, resp.text
+    payload = resp.json()
+    assert [f["filename"] for f in payload["files"]] == ["valid_xlsx.xlsx"]
+    assert payload["failed_files"] == 0